@@ -0,0 +1,94 @@
+"""Módulo das abas do navegador, que carrega as páginas dos próximos carros enquanto o carro atual é lido."""
+from selenium.common.exceptions import WebDriverException
+from Ferramentas.Navegador import reaplicar_bloqueios
+
+
+class Abas:
+    """Classe que mantém a listagem aberta em uma aba e carrega os próximos carros em abas em segundo plano.
+
+    Enquanto as opções do carro atual são percorridas, as páginas dos próximos carros já estão carregando, assim a
+    espera pela rede de um carro acontece junto com a leitura do anterior, sem abrir outro navegador. As abas são
+    abertas pelo DevTools em segundo plano, em branco, recebem os bloqueios do navegador e só então começam a
+    carregar o carro, sem esperar a página. A aba de cada carro é fechada quando o próximo é aberto.
+
+    Apenas carros identificados pelo link podem ser carregados antes, os acessados clicando na listagem continuam
+    na aba em uso.
+    """
+
+    def __init__(self, navegador, quantidade=3):
+        """Inicializador da classe Abas.
+
+        Args:
+            navegador (WebDriver): Navegador Chrome, a aba em uso fica sendo a da listagem.
+            quantidade (int, opcional): Quantidade de abas de carros, a do carro atual e as carregadas antes. Padrão é 3.
+        """
+        self.navegador = navegador
+        self.quantidade = quantidade
+        self.listagem = navegador.current_window_handle
+        self.carregando = {}  # Aba aberta em segundo plano para o link de cada carro.
+
+
+    def _fechar(self, aba):
+        """Fecha uma aba sem mudar a aba em uso."""
+        try:
+            self.navegador.execute_cdp_cmd('Target.closeTarget', {'targetId': aba})
+        except WebDriverException:
+            pass
+
+
+    def preparar(self, links):
+        """Carrega em segundo plano as páginas dos próximos carros, fechando as abas que não serão mais usadas.
+
+        Args:
+            links (list): Links dos próximos carros, na ordem em que serão abertos.
+        """
+        links = links[:self.quantidade - 1]
+        for link in list(self.carregando):
+            if link not in links:
+                self._fechar(self.carregando.pop(link))
+
+        novos = [link for link in links if link not in self.carregando]
+        if not novos:
+            return
+        atual = self.navegador.current_window_handle
+        for link in novos:
+            alvo = self.navegador.execute_cdp_cmd('Target.createTarget', {'url': 'about:blank', 'background': True})
+            aba = alvo['targetId']  # O id do alvo é o mesmo identificador da aba no Selenium.
+            self.navegador.switch_to.window(aba)
+            reaplicar_bloqueios(self.navegador)  # Os bloqueios do DevTools valem apenas para a aba em que foram aplicados.
+            self.navegador.execute_script('window.location.href = arguments[0]', link)  # Sem esperar o carregamento.
+            self.carregando[link] = aba
+        self.navegador.switch_to.window(atual)
+
+
+    def abrir(self, link):
+        """Mostra a página do carro, trocando para a aba dela se ela já foi carregada.
+
+        A aba do carro anterior é fechada, e a listagem nunca é usada para abrir um carro, assim ela continua aberta.
+
+        Args:
+            link (str): Link do carro.
+
+        Returns:
+            bool: True se a página já estava carregando em segundo plano.
+        """
+        atual = self.navegador.current_window_handle
+        aba = self.carregando.pop(link, None)
+        if aba is None:
+            if atual == self.listagem:
+                self.navegador.switch_to.new_window('tab')
+                reaplicar_bloqueios(self.navegador)
+            self.navegador.get(link)
+            return False
+
+        if atual != self.listagem:
+            self.navegador.close()
+        self.navegador.switch_to.window(aba)
+        return True
+
+
+    def voltar(self):
+        """Volta para a aba da listagem, fechando a aba do carro atual."""
+        if self.navegador.current_window_handle != self.listagem:
+            self.navegador.close()
+            self.navegador.switch_to.window(self.listagem)
@@ -0,0 +1,253 @@
+"""Módulo do agendador, que roda a coleta continuamente, cada site na sua cadência e com o navegador sempre aberto.
+
+Uso:
+    python -m Ferramentas.Agendador [--cadencia movida=1 flua=24] [--porta 8765] [--idade-maxima 24] [--http]
+
+O estado de cada site pode ser consultado em http://127.0.0.1:<porta>/, em JSON.
+"""
+import os
+import json
+import shutil
+import argparse
+from time import time
+from datetime import datetime
+from threading import Thread, Event, Lock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from Ferramentas.Historico import Historico
+from Ferramentas.Juntar import juntar
+from Ferramentas.Comparar import comparar_arquivo
+from Ferramentas.Vigia import Vigia
+from Ferramentas.Servidor import trocar_base
+from Sites.Unidas import Unidas
+from Sites.Porto import Porto
+from Sites.Movida import Movida
+from Sites.Flua import Flua
+
+
+SITES = {'unidas': Unidas, 'porto': Porto, 'movida': Movida, 'flua': Flua}
+
+# Intervalo padrão, em horas, entre o início de duas coletas de cada site.
+CADENCIAS = {'unidas': 6, 'porto': 6, 'movida': 1, 'flua': 24}
+
+FORMATO_DATA = '%d/%m/%Y %H:%M:%S'
+
+
+def ultima_completa(arquivo):
+    """Cópia do .csv de um site com a última coleta terminada, como dados_unidas.completo.csv."""
+    return os.path.splitext(arquivo)[0] + '.completo.csv'
+
+
+class _Status(BaseHTTPRequestHandler):
+    """Tratador de requisições que responde o estado do agendador em JSON, sem imprimir cada acesso."""
+
+    def do_GET(self):
+        corpo = json.dumps(self.server.agendador.status(), ensure_ascii=False, indent=1).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+class Agendador:
+    """Classe que coleta os sites continuamente, cada um em uma thread com o seu navegador e a sua cadência.
+
+    Os navegadores ficam abertos entre as coletas, assim cada coleta não paga a abertura do navegador, e são abertos
+    de novo se pararem de responder ou, pelo Vigia de cada site, depois de muitos carros ou acima do limite de memória. Com idade_maxima, os carros sem mudanças têm os preços reaproveitados,
+    e os carros novos, com o cartão mudado ou de coleta mais antiga são coletados primeiro.
+
+    Ao fim de cada coleta, o .csv do site é copiado para uma cópia da última coleta terminada, as linhas dele são
+    adicionadas ao histórico e o .csv com todos os dados é refeito com as cópias de todos os sites, assim os sites
+    que ainda estão coletando entram com a coleta anterior, e não com o .csv pela metade.
+    """
+
+    def __init__(self, cadencias=None, idade_maxima=24, headless=True, http=False, base=None, porta=8765,
+                 historico='historico', destino='dados.csv'):
+        """Inicializador da classe Agendador.
+
+        Args:
+            cadencias (dict, opcional): Intervalo, em horas, entre as coletas de cada site, como {'movida': 1, 'flua': 24}.
+                Apenas os sites informados são coletados. Padrão é CADENCIAS, com todos os sites.
+            idade_maxima (float, opcional): Idade máxima, em horas, dos preços reaproveitados de carros sem mudanças.
+                Padrão é 24, None sempre coleta todos os carros.
+            headless (bool, opcional): Condição para abrir os navegadores sem janela. Padrão é True.
+            http (bool, opcional): Condição para coletar por HTTP, sem navegador, nos sites que suportam. Padrão é False.
+            base (str, opcional): Protocolo e domínio usados no lugar dos sites reais. Padrão é None, que usa os sites reais.
+            porta (int, opcional): Porta do endereço de estado, None não o abre. Padrão é 8765.
+            historico (str, opcional): Pasta do histórico de preços, None não guarda o histórico. Padrão é 'historico'.
+            destino (str, opcional): Caminho do .csv com os dados de todos os sites. Padrão é 'dados.csv'.
+        """
+        self.cadencias = dict(cadencias or CADENCIAS)
+        self.idade_maxima = idade_maxima
+        self.headless = headless
+        self.http = http
+        self.base = base
+        self.porta = porta
+        self.historico = Historico(historico) if historico else None
+        self.destino = destino
+
+        self.parar = Event()
+        self.trava = Lock()  # O histórico e o .csv de todos os sites são gravados por uma coleta de cada vez.
+        self.vigias = {}
+        self.estado = {nome: {'estado': 'aguardando', 'cadencia': cadencia, 'execucoes': 0, 'inicio': None, 'fim': None,
+                              'proxima': time(), 'linhas': None, 'contadores': {}, 'erro': None}
+                       for nome, cadencia in self.cadencias.items()}
+
+
+    def status(self):
+        """Estado de cada site, com as datas formatadas.
+
+        Returns:
+            dict: Estado atual, cadência, quantidade de coletas, início e fim da última, próxima coleta, linhas
+                exportadas, contadores de falhas, último erro e uso de recursos dos navegadores de cada site.
+        """
+        status = {}
+        for nome, estado in self.estado.items():
+            status[nome] = {chave: datetime.fromtimestamp(valor).strftime(FORMATO_DATA)
+                            if chave in ('inicio', 'fim', 'proxima') and valor is not None else valor
+                            for chave, valor in estado.items()}
+            if nome in self.vigias:
+                status[nome]['navegadores'] = self.vigias[nome].relatorio()
+        return status
+
+
+    def vigia(self, nome):
+        """Vigia do navegador do site, que é aberto de novo se não estiver respondendo.
+
+        Args:
+            nome (str): Nome do site.
+
+        Returns:
+            Vigia: Vigia com o navegador aberto, que também o recicla entre os carros.
+        """
+        site = SITES[nome]
+        vigia = self.vigias.get(nome)
+        if vigia is None:
+            vigia = self.vigias[nome] = Vigia(self.headless, site.paginas_por_navegador, site.memoria_navegador)
+        elif not vigia.ativo():
+            vigia.reciclar('falha')
+        return vigia
+
+
+    def coletar(self, nome):
+        """Realiza uma coleta do site e publica as linhas dela.
+
+        Args:
+            nome (str): Nome do site.
+        """
+        site, estado = SITES[nome], self.estado[nome]
+        estado.update(estado='coletando', inicio=time(), erro=None)
+        try:
+            argumentos = {'url': trocar_base(site.url, self.base)} if self.base else {}
+            if self.http and site.suporta_http():
+                instancia = site(http=True, **argumentos)
+            else:
+                instancia = site(vigia=self.vigia(nome), idade_maxima=self.idade_maxima, **argumentos)
+            instancia.run()
+            self.publicar(site)
+            estado.update(estado='aguardando', linhas=instancia.gravador.total, contadores=instancia.metricas.contadores)
+        except Exception as e:
+            print(f'Falha na coleta de {site.__name__}: {e}')
+            estado.update(estado='erro', erro=repr(e))
+        estado['fim'] = time()
+        estado['execucoes'] += 1
+
+
+    def publicar(self, site):
+        """Guarda a coleta terminada do site, adiciona as linhas dela ao histórico e refaz o .csv e a comparação.
+
+        O .csv do site é copiado com outro nome e renomeado, e o .csv com todos os dados é refeito apenas com essas
+        cópias, já que os .csv dos outros sites podem estar sendo gravados pelas coletas deles.
+
+        Args:
+            site (class): Classe do site coletado.
+        """
+        with self.trava:
+            completa = ultima_completa(site.arquivo)
+            shutil.copyfile(site.arquivo, completa + '.tmp')
+            os.replace(completa + '.tmp', completa)
+
+            if self.historico is not None:
+                juntar([completa], None, self.historico, apagar=False)
+            arquivos = [ultima_completa(SITES[nome].arquivo) for nome in self.cadencias
+                        if os.path.exists(ultima_completa(SITES[nome].arquivo))]
+            total, _ = juntar(arquivos, self.destino, apagar=False)
+            if total:
+                comparar_arquivo(self.destino, os.path.join(os.path.dirname(self.destino), 'comparacao.csv'))
+
+
+    def ciclo(self, nome):
+        """Coleta o site sempre que chega a hora da próxima coleta, até o agendador ser parado.
+
+        Args:
+            nome (str): Nome do site.
+        """
+        estado = self.estado[nome]
+        while not self.parar.is_set():
+            if self.parar.wait(max(0, estado['proxima'] - time())):
+                break
+            estado['proxima'] = time() + self.cadencias[nome]*3600
+            self.coletar(nome)
+
+
+    def run(self):
+        """Roda o agendador até ser interrompido com Ctrl+C, fechando os navegadores ao final."""
+        servidor = None
+        if self.porta is not None:
+            servidor = ThreadingHTTPServer(('127.0.0.1', self.porta), _Status)
+            servidor.agendador = self
+            Thread(target=servidor.serve_forever, daemon=True).start()
+            print(f'Estado da coleta em http://127.0.0.1:{servidor.server_address[1]}/')
+
+        threads = [Thread(target=self.ciclo, args=(nome,), daemon=True) for nome in self.cadencias]
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(1)
+        except KeyboardInterrupt:
+            print('Encerrando o agendador...')
+        finally:
+            self.parar.set()
+            if servidor is not None:
+                servidor.shutdown()
+                servidor.server_close()
+            for vigia in self.vigias.values():
+                vigia.fechar()
+
+
+def ler_cadencias(textos):
+    """Converte textos como 'movida=1' no dicionário de cadências.
+
+    Args:
+        textos (list): Textos no formato site=horas.
+
+    Returns:
+        dict: Cadência, em horas, de cada site.
+    """
+    cadencias = {}
+    for texto in textos:
+        nome, horas = texto.split('=')
+        if nome not in SITES:
+            raise argparse.ArgumentTypeError(f'Site desconhecido: {nome}')
+        cadencias[nome] = float(horas)
+    return cadencias
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Coleta contínua dos sites, cada um na sua cadência.')
+    parser.add_argument('--cadencia', nargs='+', default=[f'{nome}={horas}' for nome, horas in CADENCIAS.items()],
+                        help='Sites coletados e intervalo, em horas, entre as coletas, como movida=1 flua=24.')
+    parser.add_argument('--porta', type=int, default=8765, help='Porta do endereço de estado.')
+    parser.add_argument('--idade-maxima', type=float, default=24, help='Idade máxima, em horas, dos preços reaproveitados.')
+    parser.add_argument('--http', action='store_true', help='Coleta por HTTP nos sites que suportam.')
+    parser.add_argument('--janela', action='store_true', help='Abre os navegadores com janela.')
+    parser.add_argument('--base', help='Protocolo e domínio usados no lugar dos sites reais.')
+    argumentos = parser.parse_args()
+
+    Agendador(ler_cadencias(argumentos.cadencia), argumentos.idade_maxima, not argumentos.janela, argumentos.http,
+              argumentos.base, argumentos.porta).run()
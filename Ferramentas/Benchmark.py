@@ -0,0 +1,149 @@
+"""Módulo de benchmark da coleta, que roda os sites contra páginas gravadas servidas localmente.
+
+Uso:
+    python -m Ferramentas.Benchmark <pasta> [--sites unidas porto movida flua] [--http] [--repeticoes N]
+
+A pasta deve ter as páginas gravadas com Ferramentas.Servidor.gravar, no mesmo caminho dos sites reais,
+como <pasta>/carros/index.html para https://livre.unidas.com.br/carros.
+"""
+import os
+import json
+import argparse
+import tempfile
+import tracemalloc
+import pandas as pd
+from time import perf_counter
+from queue import Empty
+from datetime import datetime
+from multiprocessing import Process, Queue
+from Ferramentas.Servidor import Servidor, trocar_base
+from Sites.Unidas import Unidas
+from Sites.Porto import Porto
+from Sites.Movida import Movida
+from Sites.Flua import Flua
+
+try:
+    import resource
+except ImportError:  # O módulo não existe no Windows, onde o pico é medido pelo tracemalloc.
+    resource = None
+
+
+SITES = {'unidas': Unidas, 'porto': Porto, 'movida': Movida, 'flua': Flua}
+
+
+def _medir(site, url, http, headless, pasta, resultados):
+    """Processo que roda a coleta de um site e devolve o tempo, as linhas coletadas e o pico de memória.
+
+    Args:
+        site (class): Classe de web scraping do site.
+        url (str | list): Endereço das páginas gravadas.
+        http (bool): Condição para coletar por HTTP.
+        headless (bool): Condição para abrir o navegador sem janela.
+        pasta (str): Pasta temporária em que os dados coletados são gravados.
+        resultados (Queue): Fila em que o resultado é devolvido.
+    """
+    # Gravando os dados em uma pasta temporária, para não sobrescrever os dados da última coleta real.
+    site.arquivo = os.path.join(pasta, os.path.basename(site.arquivo))
+    argumentos = {'url': url, 'http': True} if http else {'url': url, 'headless': headless}
+
+    if resource is None:
+        tracemalloc.start()
+    inicio = perf_counter()
+    instancia = None
+    try:
+        instancia = site(**argumentos)
+        instancia.run()
+        linhas, erro = instancia.gravador.total, None
+    except Exception as e:
+        linhas, erro = 0, repr(e)
+    tempo = perf_counter() - inicio
+
+    if resource is None:
+        pico = tracemalloc.get_traced_memory()[1]
+    else:
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss*1024  # No Linux o valor é em KB.
+
+    # Pico de memória do navegador, com todos os processos do Chrome, medido pelo Vigia.
+    navegadores = instancia.metricas.navegadores if instancia is not None else []
+    resultados.put({'Site': site.__name__, 'Linhas': linhas, 'Tempo (s)': round(tempo, 2),
+                    'Linhas/s': round(linhas/tempo, 2) if tempo else 0., 'Memória (MB)': round(pico/2**20, 1),
+                    'Navegador (MB)': max((navegador['pico'] for navegador in navegadores), default=None), 'Erro': erro})
+
+
+def medir(site, base, http=False, headless=True):
+    """Roda a coleta de um site em um processo separado, para o pico de memória ser apenas dele.
+
+    Args:
+        site (class): Classe de web scraping do site.
+        base (str): Protocolo e domínio do servidor com as páginas gravadas.
+        http (bool, opcional): Condição para coletar por HTTP, nos sites que suportam. Padrão é False.
+        headless (bool, opcional): Condição para abrir o navegador sem janela. Padrão é True.
+
+    Returns:
+        dict: Site, linhas coletadas, tempo total, linhas por segundo, pico de memória do processo e do navegador e
+            erro, se houver. Se o processo encerrar sem devolver o resultado, como ao ser encerrado pelo sistema por
+            falta de memória, o erro tem o código de saída dele.
+    """
+    resultados = Queue()
+    with tempfile.TemporaryDirectory() as pasta:
+        p = Process(target=_medir, args=(site, trocar_base(site.url, base), http, headless, pasta, resultados))
+        inicio = perf_counter()
+        p.start()
+        resultado = None
+        while resultado is None:
+            try:
+                resultado = resultados.get(timeout=1)
+            except Empty:
+                if p.is_alive():
+                    continue
+                try:  # O resultado pode ter sido enviado logo antes de o processo encerrar.
+                    resultado = resultados.get(timeout=1)
+                except Empty:
+                    resultado = {'Site': site.__name__, 'Linhas': 0, 'Tempo (s)': round(perf_counter() - inicio, 2),
+                                 'Linhas/s': 0., 'Memória (MB)': None, 'Navegador (MB)': None,
+                                 'Erro': f'o processo encerrou sem resultado, com o código {p.exitcode}'}
+        p.join()
+    return resultado
+
+
+def executar(pasta, sites=None, http=False, headless=True, repeticoes=1, historico='benchmark.jsonl'):
+    """Serve as páginas gravadas e mede a coleta de cada site, um de cada vez.
+
+    Args:
+        pasta (str): Pasta com as páginas gravadas.
+        sites (list, opcional): Classes dos sites medidos. Padrão é todos.
+        http (bool, opcional): Condição para coletar por HTTP, nos sites que suportam. Padrão é False.
+        headless (bool, opcional): Condição para abrir os navegadores sem janela. Padrão é True.
+        repeticoes (int, opcional): Quantidade de vezes que cada site é medido. Padrão é 1.
+        historico (str, opcional): Arquivo em que cada execução é adicionada, para comparar execuções. Padrão é
+            'benchmark.jsonl', None não salva.
+
+    Returns:
+        pd.DataFrame: Tabela com uma linha por medição.
+    """
+    medicoes = []
+    with Servidor(pasta) as servidor:
+        for site in sites or SITES.values():
+            for repeticao in range(repeticoes):
+                resultado = medir(site, servidor.url, http and site.suporta_http(), headless)
+                medicoes.append(dict(resultado, Repeticao=repeticao + 1))
+
+    if historico:
+        with open(historico, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'data': datetime.now().strftime('%d/%m/%Y %H:%M'), 'http': http, 'medicoes': medicoes}) + '\n')
+
+    return pd.DataFrame(medicoes)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark da coleta contra páginas gravadas.')
+    parser.add_argument('pasta', help='Pasta com as páginas gravadas.')
+    parser.add_argument('--sites', nargs='+', choices=list(SITES), default=list(SITES), help='Sites medidos.')
+    parser.add_argument('--http', action='store_true', help='Coleta por HTTP nos sites que suportam.')
+    parser.add_argument('--janela', action='store_true', help='Abre os navegadores com janela.')
+    parser.add_argument('--repeticoes', type=int, default=1, help='Quantidade de medições de cada site.')
+    argumentos = parser.parse_args()
+
+    tabela = executar(argumentos.pasta, [SITES[nome] for nome in argumentos.sites], argumentos.http,
+                      not argumentos.janela, argumentos.repeticoes)
+    print(tabela.to_string(index=False))
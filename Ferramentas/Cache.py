@@ -0,0 +1,170 @@
+"""Módulo do cache em disco das páginas e respostas dos sites, usado para não buscar de novo o que não mudou."""
+import os
+import gzip
+import json
+import sqlite3
+from time import time
+from hashlib import sha1
+from contextlib import closing
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+class Cache:
+    """Classe que guarda o conteúdo das páginas em disco, indexado pelo endereço normalizado.
+
+    Cada entrada vale pelo tempo de validade (TTL) informado, depois dele ela ainda pode ser revalidada com o ETag e o
+    Last-Modified guardados, e uma resposta 304 renova a entrada sem baixar a página de novo. O tamanho total é
+    limitado, e as entradas acessadas há mais tempo são descartadas primeiro.
+
+    O conteúdo fica comprimido em <pasta>/<chave>.gz e o índice em <pasta>/indice.sqlite, que pode ser usado por
+    vários processos ao mesmo tempo, como os navegadores do PoolNavegadores.
+    """
+
+    def __init__(self, pasta='cache', ttl=12*3600, tamanho_maximo=500*2**20):
+        """Inicializador da classe Cache.
+
+        Args:
+            pasta (str, opcional): Pasta do cache. Padrão é 'cache'.
+            ttl (float, opcional): Tempo, em segundos, em que uma entrada é usada sem revalidação. Padrão é 12 horas.
+            tamanho_maximo (int, opcional): Tamanho máximo, em bytes, do conteúdo comprimido. Padrão é 500 MB.
+        """
+        self.pasta = pasta
+        self.ttl = ttl
+        self.tamanho_maximo = tamanho_maximo
+        os.makedirs(pasta, exist_ok=True)
+        with self._conectar() as banco:
+            banco.execute('CREATE TABLE IF NOT EXISTS entradas (chave TEXT PRIMARY KEY, url TEXT, tamanho INTEGER, '
+                          'gravado REAL, acessado REAL, etag TEXT, modificado TEXT, dados TEXT)')
+
+
+    def _conectar(self):
+        """Abre uma conexão com o índice, uma por operação para poder ser usado por várias threads e processos."""
+        return closing(sqlite3.connect(os.path.join(self.pasta, 'indice.sqlite'), timeout=30, isolation_level=None))
+
+
+    @staticmethod
+    def normalizar(url):
+        """Normaliza o endereço, com protocolo e domínio em minúsculas, parâmetros ordenados e sem fragmento e barra final.
+
+        Returns:
+            str: Endereço normalizado.
+        """
+        partes = urlsplit(url)
+        caminho = partes.path.rstrip('/') or '/'
+        parametros = urlencode(sorted(parse_qsl(partes.query, keep_blank_values=True)))
+        return urlunsplit((partes.scheme.lower(), partes.netloc.lower(), caminho, parametros, ''))
+
+
+    def chave(self, url):
+        """Chave da entrada do endereço."""
+        return sha1(self.normalizar(url).encode('utf-8')).hexdigest()
+
+
+    def _entrada(self, url):
+        """Linha do índice do endereço, ou None se não houver."""
+        with self._conectar() as banco:
+            return banco.execute('SELECT chave, gravado, etag, modificado, dados FROM entradas WHERE chave = ?',
+                                 (self.chave(url),)).fetchone()
+
+
+    def ler(self, url, ttl=None, vencido=False):
+        """Lê o conteúdo guardado do endereço.
+
+        Args:
+            url (str): Endereço da página.
+            ttl (float, opcional): Validade, em segundos, usada no lugar da validade do cache.
+            vencido (bool, opcional): Condição para ler mesmo depois da validade, usado após uma revalidação. Padrão é False.
+
+        Returns:
+            str: Conteúdo guardado, ou None se não houver ou se estiver vencido.
+        """
+        entrada = self._entrada(url)
+        if entrada is None:
+            return None
+        chave, gravado = entrada[:2]
+        if not vencido and time() - gravado > (self.ttl if ttl is None else ttl):
+            return None
+
+        try:
+            with gzip.open(os.path.join(self.pasta, chave + '.gz'), 'rt', encoding='utf-8') as f:
+                conteudo = f.read()
+        except (OSError, EOFError):  # Arquivo apagado ou gravado pela metade.
+            return None
+        with self._conectar() as banco:
+            banco.execute('UPDATE entradas SET acessado = ? WHERE chave = ?', (time(), chave))
+        return conteudo
+
+
+    def dados(self, url):
+        """Informações extras guardadas junto com o conteúdo do endereço, como o nome do carro.
+
+        Returns:
+            dict: Informações guardadas, vazio se não houver.
+        """
+        entrada = self._entrada(url)
+        return json.loads(entrada[4]) if entrada is not None and entrada[4] else {}
+
+
+    def cabecalhos(self, url):
+        """Cabeçalhos de requisição condicional para revalidar a entrada do endereço.
+
+        Returns:
+            dict: If-None-Match e If-Modified-Since, vazio se não houver entrada ou validadores.
+        """
+        entrada = self._entrada(url)
+        cabecalhos = {}
+        if entrada is not None and entrada[2]:
+            cabecalhos['If-None-Match'] = entrada[2]
+        if entrada is not None and entrada[3]:
+            cabecalhos['If-Modified-Since'] = entrada[3]
+        return cabecalhos
+
+
+    def renovar(self, url):
+        """Renova a validade da entrada, usado quando o site responde que a página não mudou (304)."""
+        with self._conectar() as banco:
+            banco.execute('UPDATE entradas SET gravado = ?, acessado = ? WHERE chave = ?', (time(), time(), self.chave(url)))
+
+
+    def gravar(self, url, conteudo, etag=None, modificado=None, dados=None):
+        """Guarda o conteúdo do endereço, descartando as entradas mais antigas se passar do tamanho máximo.
+
+        Args:
+            url (str): Endereço da página.
+            conteudo (str): Conteúdo da página.
+            etag (str, opcional): Cabeçalho ETag da resposta.
+            modificado (str, opcional): Cabeçalho Last-Modified da resposta.
+            dados (dict, opcional): Informações extras guardadas junto com o conteúdo.
+        """
+        chave = self.chave(url)
+        arquivo = os.path.join(self.pasta, chave + '.gz')
+
+        # Gravando em um arquivo temporário e trocando depois, para outro processo nunca ler um arquivo pela metade.
+        temporario = f'{arquivo}.{os.getpid()}.tmp'
+        with gzip.open(temporario, 'wt', encoding='utf-8') as f:
+            f.write(conteudo)
+        os.replace(temporario, arquivo)
+
+        with self._conectar() as banco:
+            banco.execute('INSERT OR REPLACE INTO entradas VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                          (chave, self.normalizar(url), os.path.getsize(arquivo), time(), time(), etag, modificado,
+                           json.dumps(dados) if dados else None))
+        self.limpar()
+
+
+    def limpar(self):
+        """Descarta as entradas acessadas há mais tempo até o cache ficar dentro do tamanho máximo."""
+        with self._conectar() as banco:
+            total = banco.execute('SELECT COALESCE(SUM(tamanho), 0) FROM entradas').fetchone()[0]
+            if total <= self.tamanho_maximo:
+                return
+
+            for chave, tamanho in banco.execute('SELECT chave, tamanho FROM entradas ORDER BY acessado').fetchall():
+                banco.execute('DELETE FROM entradas WHERE chave = ?', (chave,))
+                try:
+                    os.remove(os.path.join(self.pasta, chave + '.gz'))
+                except FileNotFoundError:
+                    pass
+                total -= tamanho
+                if total <= self.tamanho_maximo:
+                    break
@@ -0,0 +1,84 @@
+"""Módulo de salvamento do progresso da coleta, usado para retomar coletas interrompidas."""
+import os
+import json
+
+
+class Checkpoint:
+    """Classe que guarda quais carros e quais combinações de Km e período de cada site já foram coletados.
+
+    O progresso é salvo em um .json ao lado do .csv do site sempre que o Gravador grava um lote, assim o
+    que está marcado no arquivo sempre já está no .csv, e uma nova coleta com continuar=True pula o que já foi feito.
+    """
+
+    def __init__(self, arquivo, continuar=False):
+        """Inicializador da classe Checkpoint.
+
+        Args:
+            arquivo (str): Caminho do .csv do site, o progresso é salvo em <nome>.checkpoint.json.
+            continuar (bool, opcional): Condição para carregar o progresso salvo em vez de começar do zero. Padrão é False.
+        """
+        self.arquivo = os.path.splitext(arquivo)[0] + '.checkpoint.json'
+        self.concluidos = set()
+        self.combinacoes = {}
+
+        if continuar and os.path.exists(self.arquivo):
+            with open(self.arquivo, encoding='utf-8') as f:
+                progresso = json.load(f)
+            self.concluidos = set(progresso['concluidos'])
+            self.combinacoes = {carro: {tuple(c) for c in feitas} for carro, feitas in progresso['combinacoes'].items()}
+            print(f'Retomando coleta com {len(self.concluidos)} carros já coletados')
+        elif os.path.exists(self.arquivo):
+            os.remove(self.arquivo)
+
+
+    @staticmethod
+    def chave(carro):
+        """Converte o identificador do carro, que pode ser um link, uma posição ou uma tupla, em texto."""
+        return json.dumps(carro)
+
+
+    def concluido(self, carro):
+        """Verifica se todas as combinações do carro já foram coletadas.
+
+        Returns:
+            bool: True se o carro já foi coletado.
+        """
+        return self.chave(carro) in self.concluidos
+
+
+    def feitos(self, carro):
+        """Combinações de Km e período do carro que já foram coletadas.
+
+        Returns:
+            set: Conjunto de tuplas (Km, Meses).
+        """
+        return set(self.combinacoes.get(self.chave(carro), ()))
+
+
+    def marcar(self, carro, linha):
+        """Marca a combinação de Km e período de uma linha como coletada.
+
+        Args:
+            carro (object): Identificador do carro.
+            linha (dict): Dados coletados.
+        """
+        self.combinacoes.setdefault(self.chave(carro), set()).add((linha['Km'], linha['Meses']))
+
+
+    def concluir(self, carro):
+        """Marca o carro como totalmente coletado."""
+        chave = self.chave(carro)
+        self.concluidos.add(chave)
+        self.combinacoes.pop(chave, None)  # As combinações de carros concluídos não são mais necessárias.
+
+
+    def salvar(self):
+        """Salva o progresso em disco."""
+        progresso = {'concluidos': sorted(self.concluidos),
+                     'combinacoes': {carro: sorted(feitas, key=str) for carro, feitas in self.combinacoes.items()}}
+
+        # Salvando em um arquivo temporário e trocando depois, para uma falha na escrita não corromper o progresso.
+        temporario = self.arquivo + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(progresso, f)
+        os.replace(temporario, self.arquivo)
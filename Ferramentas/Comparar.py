@@ -0,0 +1,208 @@
+"""Módulo de comparação dos preços do mesmo carro entre as locadoras.
+
+Cada locadora escreve o nome dos carros de um jeito, como 'Jeep Compass Longitude 1.3 T270 Flex Aut.' e
+'COMPASS LONGITUDE T270 1.3 TURBO AUTOMÁTICO'. Os nomes são quebrados em palavras normalizadas, separando marca,
+modelo e versão, e os nomes parecidos de outras locadoras são procurados por um índice invertido do modelo,
+assim cada nome é comparado apenas com as versões do mesmo modelo, e não com todos os nomes.
+
+Uso:
+    python -m Ferramentas.Comparar [dados.csv] [--destino comparacao.csv] [--limiar 0.5]
+"""
+import re
+import math
+import argparse
+import unicodedata
+import pandas as pd
+from collections import Counter, defaultdict
+
+
+MARCAS = {'audi', 'bmw', 'byd', 'caoa', 'chery', 'chevrolet', 'citroen', 'fiat', 'ford', 'gwm', 'honda', 'hyundai',
+          'jac', 'jeep', 'kia', 'lexus', 'mercedes', 'mini', 'mitsubishi', 'nissan', 'peugeot', 'porsche', 'ram',
+          'renault', 'subaru', 'suzuki', 'toyota', 'volkswagen', 'volvo'}
+
+# Palavras escritas de formas diferentes pelas locadoras, trocadas pela mesma forma.
+SINONIMOS = {'vw': 'volkswagen', 'gm': 'chevrolet', 'benz': 'mercedes', 'automatico': 'aut', 'automatica': 'aut',
+             'automatic': 'aut', 'at': 'aut', 'cvt': 'aut', 'mecanico': 'manual', 'mec': 'manual', 'mt': 'manual',
+             'turbo': 't', 'tb': 't', 'hibrido': 'hybrid', 'eletrico': 'ev', 'cab': 'cabine', 'dup': 'dupla'}
+
+# Palavras que não ajudam a diferenciar os carros.
+IGNORADAS = {'ou', 'similar', 'de', 'da', 'do', 'com', 'e', 'novo', 'nova', 'zero', 'km', 'carro', 'flex', 'portas',
+             'p', 'gasolina'}
+
+# Palavras da versão que descrevem o motor ou o câmbio, e não o acabamento, como 'Longitude' ou 'Limited'.
+TECNICAS = {'aut', 'manual', 't', 'hybrid', 'ev', 'diesel', 'cabine', 'dupla', 'simples', 'tsi', 'tfsi', 'gdi', 'mpi',
+            'vvt', 'hp', 'cv', 'v', 'x', 'awd', 'turbodiesel'}
+
+
+def palavras(nome):
+    """Quebra o nome do carro em palavras normalizadas, sem acentos, em minúsculas e com os sinônimos trocados.
+
+    Números decimais são mantidos juntos, como '1.3' e '2,0', que viram '1.3' e '2.0'.
+
+    Returns:
+        list: Palavras do nome, na ordem em que aparecem.
+    """
+    texto = unicodedata.normalize('NFKD', str(nome)).encode('ascii', 'ignore').decode().lower()
+    resultado = []
+    for palavra in re.findall(r'\d+(?:[.,]\d+)?|[a-z]+', texto):
+        palavra = SINONIMOS.get(palavra, palavra.replace(',', '.'))
+        if palavra not in IGNORADAS:
+            resultado.append(palavra)
+    return resultado
+
+
+def separar(nome):
+    """Separa o nome do carro em marca, modelo e versão.
+
+    Returns:
+        tuple: Marca, ou None se o nome não tiver, modelo, a primeira palavra que não é marca nem número, ou None,
+            e o conjunto de palavras da versão.
+    """
+    restantes = palavras(nome)
+    marca = restantes.pop(0) if restantes and restantes[0] in MARCAS else None
+    modelo = next((palavra for palavra in restantes if not palavra[0].isdigit()), None)
+    return marca, modelo, frozenset(palavra for palavra in restantes if palavra != modelo)
+
+
+def acabamento(versao):
+    """Palavras do acabamento da versão, sem números e sem as palavras de motor e câmbio."""
+    return {palavra for palavra in versao if palavra.isalpha() and palavra not in TECNICAS}
+
+
+class Comparador:
+    """Classe que agrupa os nomes do mesmo carro nas diferentes locadoras.
+
+    Os nomes únicos de cada locadora são indexados pelo modelo. Para cada nome, os candidatos são os nomes de
+    outras locadoras com o mesmo modelo, a mesma marca, quando as duas locadoras a informam, e algum acabamento em
+    comum, quando os dois informam. A semelhança é o Jaccard das palavras ponderado pela raridade de cada uma, assim
+    palavras presentes em muitos nomes, como 'aut' ou '1.0', pesam pouco. O nome fica no grupo do candidato mais
+    parecido de cada locadora, se a semelhança passar do limiar.
+    """
+
+    def __init__(self, limiar=.5):
+        """Inicializador da classe Comparador.
+
+        Args:
+            limiar (float, opcional): Semelhança mínima, entre 0 e 1, para dois nomes serem do mesmo carro. Padrão é 0.5.
+        """
+        self.limiar = limiar
+        self.pesos = {}
+
+
+    def semelhanca(self, a, b):
+        """Jaccard ponderado entre dois conjuntos de palavras, com o peso de cada palavra dado pela raridade dela."""
+        uniao = a | b
+        if not uniao:
+            return 0.
+        return sum(self.pesos[palavra] for palavra in a & b)/sum(self.pesos[palavra] for palavra in uniao)
+
+
+    def agrupar(self, nomes):
+        """Agrupa os nomes do mesmo carro.
+
+        Args:
+            nomes (pd.DataFrame): Nomes únicos, com as colunas Nome e Locadora.
+
+        Returns:
+            pd.Series: Nome do grupo de cada linha, com o mesmo índice de nomes.
+        """
+        nomes = nomes.reset_index(drop=True)
+        separados = [separar(nome) for nome in nomes['Nome']]
+        conjuntos = [versao | {modelo} if modelo else versao for _, modelo, versao in separados]
+        acabamentos = [acabamento(versao) for _, _, versao in separados]
+
+        # Palavras raras pesam mais na semelhança, como o idf de uma busca de textos.
+        frequencias = Counter(palavra for conjunto in conjuntos for palavra in conjunto)
+        self.pesos = {palavra: math.log(1 + len(conjuntos)/quantidade) for palavra, quantidade in frequencias.items()}
+
+        indice = defaultdict(list)
+        for i, (_, modelo, _) in enumerate(separados):
+            indice[modelo].append(i)
+
+        grupos = list(range(len(nomes)))
+
+        def raiz(i):
+            while grupos[i] != i:
+                grupos[i] = grupos[grupos[i]]
+                i = grupos[i]
+            return i
+
+        locadoras = nomes['Locadora'].tolist()
+        for i, (marca, modelo, _) in enumerate(separados):
+            if modelo is None:
+                continue
+            melhores = {}  # Candidato mais parecido de cada locadora.
+            for j in indice[modelo]:
+                outra_marca = separados[j][0]
+                if locadoras[j] == locadoras[i] or (marca and outra_marca and marca != outra_marca):
+                    continue
+                if acabamentos[i] and acabamentos[j] and not acabamentos[i] & acabamentos[j]:
+                    continue  # Versões diferentes do mesmo modelo, como Longitude e Limited.
+                nota = self.semelhanca(conjuntos[i], conjuntos[j])
+                if nota >= self.limiar and nota > melhores.get(locadoras[j], (0, None))[0]:
+                    melhores[locadoras[j]] = (nota, j)
+            for _, j in melhores.values():
+                grupos[raiz(j)] = raiz(i)
+
+        # O grupo recebe o nome mais curto dele, que costuma ser o mais genérico.
+        raizes = pd.Series([raiz(i) for i in range(len(nomes))])
+        curtos = nomes['Nome'].astype(str).groupby(raizes).agg(lambda grupo: min(grupo, key=len))
+        return raizes.map(curtos)
+
+
+    def comparar(self, dados):
+        """Cria a tabela de comparação dos preços do mesmo carro, com os mesmos Km e período, entre as locadoras.
+
+        Args:
+            dados (pd.DataFrame): Dados no formato dos .csv, com Nome, Locadora, Km, Meses e Valor.
+
+        Returns:
+            pd.DataFrame: Uma linha por carro, Km e período presentes em mais de uma locadora, com o menor preço de
+                cada locadora, o menor preço entre elas, a locadora dele e a diferença para o maior preço, em %.
+        """
+        dados = dados.dropna(subset=['Nome', 'Valor']).copy()
+        dados['Km'] = pd.to_numeric(dados['Km'], errors='coerce').round()  # Km da Porto é dividido pelos meses.
+        dados['Meses'] = pd.to_numeric(dados['Meses'], errors='coerce')
+
+        nomes = dados[['Nome', 'Locadora']].drop_duplicates()
+        nomes['Modelo'] = self.agrupar(nomes).values
+        dados = dados.merge(nomes, on=['Nome', 'Locadora'])
+
+        tabela = dados.pivot_table(index=['Modelo', 'Km', 'Meses'], columns='Locadora', values='Valor', aggfunc='min')
+        tabela = tabela[tabela.notna().sum(axis=1) > 1]
+        if tabela.empty:
+            return tabela.reset_index()
+        tabela.columns.name = None
+        precos = tabela.copy()
+        tabela['Menor valor'] = precos.min(axis=1)
+        tabela['Mais barata'] = precos.idxmin(axis=1)
+        tabela['Diferenca (%)'] = ((precos.max(axis=1)/tabela['Menor valor'] - 1)*100).round(1)
+        return tabela.reset_index()
+
+
+def comparar_arquivo(arquivo='dados.csv', destino='comparacao.csv', limiar=.5):
+    """Cria a tabela de comparação a partir do .csv com os dados de todos os sites.
+
+    Args:
+        arquivo (str, opcional): Caminho do .csv com os dados. Padrão é 'dados.csv'.
+        destino (str, opcional): Caminho do .csv da comparação. Padrão é 'comparacao.csv'.
+        limiar (float, opcional): Semelhança mínima para dois nomes serem do mesmo carro. Padrão é 0.5.
+
+    Returns:
+        int: Quantidade de linhas da comparação.
+    """
+    dados = pd.read_csv(arquivo, usecols=['Nome', 'Locadora', 'Km', 'Meses', 'Valor'])
+    tabela = Comparador(limiar).comparar(dados)
+    tabela.to_csv(destino, index=False)
+    return len(tabela)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compara os preços do mesmo carro entre as locadoras.')
+    parser.add_argument('arquivo', nargs='?', default='dados.csv', help='Caminho do .csv com os dados de todos os sites.')
+    parser.add_argument('--destino', default='comparacao.csv', help='Caminho do .csv da comparação.')
+    parser.add_argument('--limiar', type=float, default=.5, help='Semelhança mínima para dois nomes serem do mesmo carro.')
+    argumentos = parser.parse_args()
+
+    total = comparar_arquivo(argumentos.arquivo, argumentos.destino, argumentos.limiar)
+    print(f'Foram comparadas {total} combinações de carro, Km e período em {argumentos.destino}')
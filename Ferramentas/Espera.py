@@ -0,0 +1,195 @@
+"""Módulo de espera por condições explícitas, compartilhado por todos os sites."""
+from time import monotonic
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from Ferramentas.Extrator import extrair, campo
+from Ferramentas.Metricas import Metricas
+
+
+# Script que conta as requisições XHR/fetch em andamento na página, é instalado uma única vez por documento.
+MONITOR_REDE = """
+if (window.__pendentes === undefined) {
+    window.__pendentes = 0;
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        window.__pendentes++;
+        this.addEventListener('loadend', () => window.__pendentes--);
+        return send.apply(this, arguments);
+    };
+    const fetch = window.fetch;
+    window.fetch = function () {
+        window.__pendentes++;
+        return fetch.apply(this, arguments).finally(() => window.__pendentes--);
+    };
+}
+"""
+
+# Script que retorna a quantidade de requisições em andamento e a quantidade de recursos já baixados.
+ESTADO_REDE = 'return [window.__pendentes || 0, performance.getEntriesByType("resource").length];'
+
+
+class Espera:
+    """Classe de espera por condições explícitas na página.
+
+    Substitui os sleep() fixos por esperas que terminam assim que a condição acontece, como um elemento
+    aparecer, o texto de um preço mudar ou a rede ficar ociosa, respeitando o tempo limite e o intervalo
+    de verificação definidos por cada site.
+    """
+
+    def __init__(self, navegador, timeout=20, intervalo=.25, ociosidade=.75, metricas=None):
+        """Inicializador da classe Espera.
+
+        Args:
+            navegador (WebDriver): Navegador em que as condições serão verificadas.
+            timeout (float, opcional): Tempo limite, em segundos, de cada espera. Padrão é 20.
+            intervalo (float, opcional): Intervalo, em segundos, entre as verificações. Padrão é .25.
+            ociosidade (float, opcional): Tempo, em segundos, sem atividade de rede para considerá-la ociosa. Padrão é .75.
+            metricas (Metricas, opcional): Métricas do site, em que são medidas as seleções e as esperas pelos preços.
+        """
+        self.navegador = navegador
+        self.timeout = timeout
+        self.intervalo = intervalo
+        self.ociosidade = ociosidade
+        self.metricas = metricas or Metricas()
+
+
+    def aguardar(self, condicao, timeout=None):
+        """Espera até que a condição retorne um valor verdadeiro.
+
+        Args:
+            condicao (callable): Função que recebe o navegador e retorna o valor esperado ou False.
+            timeout (float, opcional): Tempo limite desta espera. Padrão é o timeout do site.
+
+        Returns:
+            object: Valor retornado pela condição.
+        """
+        espera = WebDriverWait(self.navegador, timeout or self.timeout, poll_frequency=self.intervalo,
+                               ignored_exceptions=(NoSuchElementException, StaleElementReferenceException))
+        return espera.until(condicao)
+
+
+    def elemento(self, by, seletor, timeout=None):
+        """Espera um elemento estar presente na página.
+
+        Returns:
+            WebElement: Elemento encontrado.
+        """
+        return self.aguardar(lambda navegador: navegador.find_element(by, seletor), timeout)
+
+
+    def elementos(self, by, seletor, timeout=None):
+        """Espera ao menos um elemento estar presente na página.
+
+        Returns:
+            list: Lista com todos os elementos encontrados.
+        """
+        return self.aguardar(lambda navegador: navegador.find_elements(by, seletor) or False, timeout)
+
+
+    def clicavel(self, by, seletor=None, timeout=None):
+        """Espera um elemento estar visivel e habilitado para receber o clique.
+
+        Args:
+            by (str | WebElement): Estratégia de busca do elemento ou o próprio elemento.
+            seletor (str, opcional): Seletor do elemento, quando by for uma estratégia de busca.
+
+        Returns:
+            WebElement: Elemento pronto para o clique.
+        """
+        def condicao(navegador):
+            elemento = by if isinstance(by, WebElement) else navegador.find_element(by, seletor)
+            return elemento if elemento.is_displayed() and elemento.is_enabled() else False
+
+        return self.aguardar(condicao, timeout)
+
+
+    def quantidade_mudou(self, by, seletor, anterior, timeout=None):
+        """Espera a quantidade de elementos encontrados ser diferente da anterior.
+
+        Returns:
+            bool: True se a quantidade mudou dentro do tempo limite.
+        """
+        try:
+            self.aguardar(lambda navegador: len(navegador.find_elements(by, seletor)) != anterior, timeout)
+            return True
+        except TimeoutException:
+            return False
+
+
+    def pagina_carregada(self, timeout=None):
+        """Espera o documento terminar de carregar."""
+        self.aguardar(lambda navegador: navegador.execute_script('return document.readyState') == 'complete', timeout)
+
+
+    def _condicao_ociosa(self):
+        """Cria uma condição que fica verdadeira quando a rede passa o tempo de ociosidade sem atividade."""
+        ultimo = {'estado': None, 'desde': monotonic()}
+
+        def ociosa(navegador):
+            estado = navegador.execute_script(ESTADO_REDE)
+            if estado != ultimo['estado'] or estado[0] > 0:
+                ultimo['estado'] = estado
+                ultimo['desde'] = monotonic()
+                return False
+            return monotonic() - ultimo['desde'] >= self.ociosidade
+
+        return ociosa
+
+
+    def rede_ociosa(self, timeout=None):
+        """Espera a página ficar sem requisições em andamento durante o tempo de ociosidade."""
+        self.navegador.execute_script(MONITOR_REDE)
+        try:
+            self.aguardar(self._condicao_ociosa(), timeout)
+        except TimeoutException:  # Páginas com requisições periódicas nunca ficam ociosas, então seguimos em frente.
+            self.metricas.contar('esperas_esgotadas')
+
+
+    def texto(self, by, seletor):
+        """Lê o texto de um elemento sem esperar por ele.
+
+        Returns:
+            str: Texto do elemento ou None caso ele não exista.
+        """
+        # Por XPath o texto é lido em uma única chamada ao navegador, em vez de buscar o elemento e depois o texto.
+        if by == By.XPATH:
+            return extrair(self.navegador, texto=campo(seletor))['texto']
+        try:
+            return self.navegador.find_element(by, seletor).text
+        except (NoSuchElementException, StaleElementReferenceException):
+            return None
+
+
+    def texto_apos(self, acao, by, seletor, timeout=None):
+        """Executa uma ação e espera o texto do elemento mudar.
+
+        Como nem toda troca de opção altera o texto (dois planos podem ter o mesmo preço), a espera
+        também termina quando a rede fica ociosa após a ação.
+
+        Args:
+            acao (callable): Ação que provoca a mudança, como selecionar uma opção.
+            by (str): Estratégia de busca do elemento observado.
+            seletor (str): Seletor do elemento observado.
+            timeout (float, opcional): Tempo limite desta espera. Padrão é o timeout do site.
+
+        Returns:
+            str: Texto do elemento após a ação, ou None caso ele não exista.
+        """
+        self.navegador.execute_script(MONITOR_REDE)
+        anterior = self.texto(by, seletor)
+        ociosa = self._condicao_ociosa()
+        with self.metricas.fase('selecao'):
+            acao()
+
+        def condicao(navegador):
+            atual = self.texto(by, seletor)
+            return (atual is not None and atual != anterior) or ociosa(navegador)
+
+        with self.metricas.fase('preco'):
+            try:
+                self.aguardar(condicao, timeout)
+            except TimeoutException:
+                self.metricas.contar('esperas_esgotadas')
+            return self.texto(by, seletor)
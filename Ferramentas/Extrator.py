@@ -0,0 +1,105 @@
+"""Módulo de extração em lote, que lê vários campos da página com uma única chamada ao navegador."""
+
+
+# Script que busca cada campo por XPath e lê os atributos pedidos de todos os elementos encontrados.
+# 'texto' é o texto visível, 'elemento' é o próprio elemento, que o Selenium converte em WebElement,
+# atributos começando com '.' ou '(', como '(./a | .//a)/@href', são XPaths relativos ao elemento, dos quais é lido o texto,
+# e os demais são lidos como propriedade do elemento (href já vem como endereço completo) ou atributo HTML.
+EXTRAIR = """
+const buscar = (xpath, contexto) => {
+    const resultado = document.evaluate(xpath, contexto, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const nos = [];
+    for (let i = 0; i < resultado.snapshotLength; i++) nos.push(resultado.snapshotItem(i));
+    return nos;
+};
+const texto = (no) => (no.innerText === undefined ? no.textContent : no.innerText).trim();
+const ler = (no, atributo) => {
+    if (atributo === 'texto') return texto(no);
+    if (atributo === 'elemento') return no;
+    if (atributo.startsWith('.') || atributo.startsWith('(')) {
+        const relativo = buscar(atributo, no)[0];
+        return relativo ? texto(relativo) : null;
+    }
+    return atributo in no ? no[atributo] : no.getAttribute(atributo);
+};
+const dados = {};
+for (const [nome, campo] of Object.entries(arguments[0])) {
+    const valores = buscar(campo.xpath, document).map((no) => {
+        if (campo.atributos.length === 1) return ler(no, campo.atributos[0]);
+        const valor = {};
+        for (const atributo of campo.atributos) valor[atributo] = ler(no, atributo);
+        return valor;
+    });
+    dados[nome] = campo.todos ? valores : (valores.length ? valores[0] : null);
+}
+return dados;
+"""
+
+
+def campo(xpath, *atributos, todos=False):
+    """Define um campo a ser extraído da página.
+
+    Args:
+        xpath (str): XPath dos elementos do campo.
+        *atributos (str): Atributos lidos de cada elemento, 'texto', 'elemento', um XPath relativo, começando com '.'
+            ou '(', ou o nome de um atributo HTML. Padrão é apenas o texto.
+        todos (bool, opcional): Condição para ler todos os elementos encontrados em vez de apenas o primeiro. Padrão é False.
+
+    Returns:
+        dict: Definição do campo.
+    """
+    return {'xpath': xpath, 'atributos': list(atributos or ['texto']), 'todos': todos}
+
+
+def extrair(navegador, **campos):
+    """Extrai todos os campos da página em uma única chamada ao navegador.
+
+    Exemplo:
+        extrair(navegador, preco=campo('//h1'), links=campo('//a', 'href', 'texto', todos=True))
+        retorna {'preco': 'R$ 1.000,00', 'links': [{'href': 'https://...', 'texto': '...'}, ...]}
+
+    Args:
+        navegador (WebDriver): Navegador com a página aberta.
+        **campos (dict): Campos criados com campo(), indexados pelo nome usado no retorno.
+
+    Returns:
+        dict: Para cada campo, o valor do primeiro elemento (None se não houver) ou a lista de valores de todos.
+            Com um único atributo o valor é ele mesmo, com vários é um dicionário com cada um.
+    """
+    return navegador.execute_script(EXTRAIR, campos)
+
+
+def classe(nome):
+    """XPath dos elementos que possuem a classe, equivalente ao By.CLASS_NAME.
+
+    Returns:
+        str: XPath dos elementos.
+    """
+    return f'//*[contains(concat(" ", normalize-space(@class), " "), " {nome} ")]'
+
+
+# Script assíncrono que busca de novo, de dentro da página e com os mesmos cookies, as respostas JSON das
+# requisições XHR e fetch já feitas pela página, que normalmente vêm do cache do navegador.
+RESPOSTAS = """
+const [trecho, concluir] = [arguments[0], arguments[arguments.length - 1]];
+const enderecos = [...new Set(performance.getEntriesByType('resource')
+    .filter((e) => ['xmlhttprequest', 'fetch'].includes(e.initiatorType) && e.name.includes(trecho))
+    .map((e) => e.name))];
+Promise.all(enderecos.map((endereco) => fetch(endereco, {credentials: 'include'})
+    .then((r) => ((r.headers.get('content-type') || '').includes('json') ? r.text() : null))
+    .catch(() => null)))
+    .then((textos) => concluir(textos.filter((texto) => texto)));
+"""
+
+
+def respostas(navegador, trecho=''):
+    """Lê as respostas JSON das requisições que a página fez, como a da tabela de preços de um carro.
+
+    Args:
+        navegador (WebDriver): Navegador com a página aberta.
+        trecho (str, opcional): Trecho que os endereços das requisições devem conter. Padrão é todas.
+
+    Returns:
+        list: Texto de cada resposta.
+    """
+    return navegador.execute_async_script(RESPOSTAS, trecho)
@@ -0,0 +1,229 @@
+"""Módulo de tratamento de falhas da coleta, com novas tentativas, disjuntor por site e lista de carros que falharam."""
+import os
+import json
+import random
+from time import time
+from collections import deque
+from datetime import datetime
+from requests.exceptions import HTTPError, ConnectionError as ErroConexao
+from selenium.common.exceptions import (StaleElementReferenceException, TimeoutException, NoSuchElementException,
+                                        ElementClickInterceptedException, ElementNotInteractableException,
+                                        WebDriverException)
+from Ferramentas.Checkpoint import Checkpoint
+
+
+# Textos nas mensagens de erro que indicam que o acesso foi negado pelo site.
+TEXTOS_BLOQUEIO = ('403', '429', 'forbidden', 'too many requests', 'access denied', 'acesso negado', 'captcha')
+
+# Tipos de falha que podem passar em uma nova tentativa. Seletores ausentes se repetem a cada tentativa,
+# e bloqueios só pioram com mais acessos, então ficam para o disjuntor e para a lista de falhas.
+REPETIVEIS = ('obsoleto', 'tempo', 'interacao', 'navegador', 'outro')
+
+# Exceções de elementos que não apareceram ou saíram da página, as únicas tratadas dentro dos sites, para avisos
+# opcionais e listas alternativas. As demais chegam a coletar_tentativas, que decide se há nova tentativa.
+ERROS_PAGINA = (TimeoutException, NoSuchElementException, StaleElementReferenceException)
+
+
+def classificar(erro):
+    """Classifica uma falha pelo tipo da exceção.
+
+    Args:
+        erro (Exception): Exceção da falha.
+
+    Returns:
+        str: 'obsoleto' (elemento que saiu da página), 'tempo' (espera esgotada), 'seletor' (elemento não encontrado),
+            'interacao' (elemento coberto ou não clicável), 'bloqueio' (acesso negado pelo site), 'navegador'
+            (navegador ou conexão sem resposta) ou 'outro'.
+    """
+    if isinstance(erro, StaleElementReferenceException):
+        return 'obsoleto'
+    if isinstance(erro, TimeoutException):
+        return 'tempo'
+    if isinstance(erro, (NoSuchElementException, IndexError)):  # IndexError vem de find_elements(...)[i] sem elementos.
+        return 'seletor'
+    if isinstance(erro, (ElementClickInterceptedException, ElementNotInteractableException)):
+        return 'interacao'
+    if isinstance(erro, HTTPError) and erro.response is not None and erro.response.status_code in (403, 429):
+        return 'bloqueio'
+    if isinstance(erro, (WebDriverException, HTTPError)) and any(texto in str(erro).lower() for texto in TEXTOS_BLOQUEIO):
+        return 'bloqueio'
+    if isinstance(erro, (WebDriverException, ErroConexao)):
+        return 'navegador'
+    return 'outro'
+
+
+class Politica:
+    """Classe que decide se uma falha tem nova tentativa e quanto esperar antes dela.
+
+    A espera cresce exponencialmente a cada tentativa até o máximo, e é sorteada entre zero e esse valor, para
+    navegadores que falharam juntos não tentarem de novo ao mesmo tempo.
+    """
+
+    def __init__(self, tentativas=2, inicial=1., maximo=30., fator=2., repetiveis=REPETIVEIS):
+        """Inicializador da classe Politica.
+
+        Args:
+            tentativas (int, opcional): Quantidade máxima de tentativas de cada carro, contando a primeira. Padrão é 2.
+            inicial (float, opcional): Espera máxima, em segundos, antes da primeira nova tentativa. Padrão é 1.
+            maximo (float, opcional): Limite da espera, em segundos. Padrão é 30.
+            fator (float, opcional): Multiplicador da espera a cada tentativa. Padrão é 2.
+            repetiveis (tuple, opcional): Tipos de falha que têm nova tentativa. Padrão é REPETIVEIS.
+        """
+        self.tentativas = tentativas
+        self.inicial = inicial
+        self.maximo = maximo
+        self.fator = fator
+        self.repetiveis = repetiveis
+
+
+    def repetir(self, tipo, tentativa):
+        """Verifica se a falha tem nova tentativa.
+
+        Args:
+            tipo (str): Tipo da falha, retornado por classificar.
+            tentativa (int): Número da tentativa que falhou, começando em 0.
+
+        Returns:
+            bool: True se o carro deve ser tentado de novo.
+        """
+        return tentativa + 1 < self.tentativas and tipo in self.repetiveis
+
+
+    def espera(self, tentativa):
+        """Tempo de espera, em segundos, antes da nova tentativa.
+
+        Args:
+            tentativa (int): Número da tentativa que falhou, começando em 0.
+        """
+        return random.uniform(0, min(self.maximo, self.inicial*self.fator**tentativa))
+
+
+class Disjuntor:
+    """Classe que interrompe a coleta de um site quando a maioria das últimas tentativas falhou.
+
+    Com o disjuntor aberto, os carros restantes vão direto para a lista de falhas em vez de insistir em um site fora
+    do ar ou que bloqueou o acesso. Depois da pausa, uma tentativa é liberada, se ela funcionar o disjuntor fecha,
+    caso contrário volta a abrir.
+
+    As últimas tentativas são as do navegador que usa o disjuntor. No PoolNavegadores, cada navegador tem o seu, mas
+    o momento em que o disjuntor foi aberto é compartilhado pelos navegadores do mesmo site, assim o primeiro que
+    abrir pausa o site em todos eles, e depois da pausa cada navegador libera a sua tentativa.
+    """
+
+    def __init__(self, limite=.6, janela=10, minimo=5, pausa=120, compartilhado=None):
+        """Inicializador da classe Disjuntor.
+
+        Args:
+            limite (float, opcional): Proporção de falhas nas últimas tentativas que abre o disjuntor. Padrão é 0.6.
+            janela (int, opcional): Quantidade de últimas tentativas consideradas. Padrão é 10.
+            minimo (int, opcional): Quantidade mínima de tentativas antes do disjuntor poder abrir. Padrão é 5.
+            pausa (float, opcional): Tempo, em segundos, com o disjuntor aberto antes de liberar uma tentativa. Padrão é 120.
+            compartilhado (multiprocessing.Value, opcional): Momento em que o disjuntor foi aberto, 0 se estiver fechado,
+                compartilhado com os disjuntores do mesmo site em outros processos. Padrão é None, que não compartilha.
+        """
+        self.limite = limite
+        self.minimo = minimo
+        self.pausa = pausa
+        self.resultados = deque(maxlen=janela)
+        self.compartilhado = compartilhado
+        self._aberto_em = None
+
+
+    @property
+    def aberto_em(self):
+        """Momento em que o disjuntor foi aberto, ou None se estiver fechado."""
+        if self.compartilhado is None:
+            return self._aberto_em
+        return self.compartilhado.value or None
+
+
+    @aberto_em.setter
+    def aberto_em(self, momento):
+        if self.compartilhado is None:
+            self._aberto_em = momento
+        else:
+            self.compartilhado.value = momento or 0.
+
+
+    def liberado(self):
+        """Verifica se uma tentativa pode ser feita, o que só não acontece com o disjuntor aberto dentro da pausa."""
+        aberto_em = self.aberto_em
+        return aberto_em is None or time() - aberto_em >= self.pausa
+
+
+    def registrar(self, sucesso):
+        """Registra o resultado de uma tentativa, abrindo ou fechando o disjuntor.
+
+        Args:
+            sucesso (bool): Se a tentativa funcionou.
+        """
+        if self.aberto_em is not None:
+            # Tentativa liberada depois da pausa, que decide se o disjuntor fecha.
+            if sucesso:
+                self.aberto_em = None
+                self.resultados.clear()
+            else:
+                self.aberto_em = time()
+            return
+
+        self.resultados.append(sucesso)
+        falhas = self.resultados.count(False)
+        if len(self.resultados) >= self.minimo and falhas/len(self.resultados) >= self.limite:
+            print(f'Disjuntor aberto após {falhas} falhas nas últimas {len(self.resultados)} tentativas')
+            self.aberto_em = time()
+
+
+class ListaFalhas:
+    """Classe que guarda os carros que não foram coletados, com o tipo e a mensagem da última falha.
+
+    A lista é salva em um .json ao lado do .csv do site e é usada para coletar de novo apenas esses carros.
+    """
+
+    def __init__(self, arquivo):
+        """Inicializador da classe ListaFalhas.
+
+        Args:
+            arquivo (str): Caminho do .csv do site, a lista é salva em <nome>.falhas.json.
+        """
+        self.arquivo = os.path.splitext(arquivo)[0] + '.falhas.json'
+        self.anteriores = {}  # Falhas da última coleta.
+        self.falhas = {}
+
+        if os.path.exists(self.arquivo):
+            with open(self.arquivo, encoding='utf-8') as f:
+                self.anteriores = json.load(f)
+
+
+    def filtrar(self, carros):
+        """Separa os carros que falharam na última coleta.
+
+        Args:
+            carros (list): Identificadores dos carros listados.
+
+        Returns:
+            list: Identificadores dos carros que estão na lista de falhas da última coleta.
+        """
+        return [carro for carro in carros if Checkpoint.chave(carro) in self.anteriores]
+
+
+    def adicionar(self, carro, tipo, erro=None, tentativas=0):
+        """Adiciona um carro à lista.
+
+        Args:
+            carro (object): Identificador do carro.
+            tipo (str): Tipo da última falha.
+            erro (str, opcional): Mensagem da última falha.
+            tentativas (int, opcional): Quantidade de tentativas feitas.
+        """
+        self.falhas[Checkpoint.chave(carro)] = {'tipo': tipo, 'erro': erro, 'tentativas': tentativas,
+                                                'data': datetime.now().strftime('%d/%m/%Y %H:%M')}
+
+
+    def salvar(self):
+        """Salva a lista em disco, apagando o arquivo se nenhum carro falhou."""
+        if self.falhas:
+            with open(self.arquivo, 'w', encoding='utf-8') as f:
+                json.dump(self.falhas, f, indent=1)
+            print(f'{len(self.falhas)} carros falharam e foram guardados em {self.arquivo}')
+        elif os.path.exists(self.arquivo):
+            os.remove(self.arquivo)
@@ -0,0 +1,175 @@
+"""Módulo de gravação incremental das linhas coletadas."""
+import os
+import shutil
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from Ferramentas.Normalizar import normalizar
+from Ferramentas.Historico import FORMATO_DATA
+
+
+COLUNAS = ['Nome', 'Data', 'Locadora', 'Km', 'Meses', 'Valor', 'Descricao']
+
+# Tipos das colunas no Parquet e nos lotes em Arrow, fixos para que todas as partes tenham o mesmo esquema.
+# A data é guardada como timestamp e os meses como inteiros, assim quem lê os lotes não precisa converter de novo.
+ESQUEMA = pa.schema([('Nome', pa.string()), ('Data', pa.timestamp('s')), ('Locadora', pa.string()), ('Km', pa.float64()),
+                     ('Meses', pa.int16()), ('Valor', pa.float64()), ('Descricao', pa.string())])
+
+
+def pasta_arrow(arquivo):
+    """Pasta dos lotes em Arrow IPC do .csv de um site, como dados_unidas.arrow."""
+    return os.path.splitext(arquivo)[0] + '.arrow'
+
+
+class Gravador:
+    """Classe que grava as linhas coletadas em disco em lotes, durante a coleta.
+
+    As linhas ficam guardadas como tuplas até completar um lote, que é adicionado ao final do .csv e dos lotes em
+    Arrow, assim a memória usada não cresce com a coleta e uma falha no meio dela perde no máximo o último lote.
+
+    As linhas chegam com Km, Meses e Valor como o texto lido da página. Cada lote é gravado como veio em
+    <nome>.bruto.csv e convertido de uma vez pelo Normalizar antes de ir para o .csv e o Parquet. Linhas com
+    valores que não puderam ser convertidos são mantidas com NaN, e os textos originais delas vão para
+    <nome>.invalidos.csv.
+
+    O Parquet é uma pasta com o mesmo nome do .csv, com um arquivo por coleta, que pode ser lida com pd.read_parquet.
+    O arquivo é gravado por um único ParquetWriter, em grupos de linhas de tamanho fixo, com outro nome, e só recebe o
+    nome final em fechar(), então o Parquet de uma coleta interrompida não é mantido, apenas o .csv e os lotes.
+    Cada lote também é gravado em formato Arrow IPC na pasta <nome>.arrow, com os tipos já convertidos, que é lida
+    pelo Juntador durante a coleta, mapeando os arquivos na memória em vez de ler o .csv de novo. Os lotes são
+    gravados com outro nome e renomeados ao final, assim um lote nunca é lido pela metade.
+
+    Pode ser usado com with, que grava o último lote ao final.
+    """
+
+    def __init__(self, arquivo, lote=100, parquet=True, continuar=False, ao_descarregar=None, km_por_contrato=False,
+                 arrow=True, grupo_parquet=50000):
+        """Inicializador da classe Gravador.
+
+        Args:
+            arquivo (str): Caminho do .csv.
+            lote (int, opcional): Quantidade de linhas guardadas antes de gravar em disco. Padrão é 100.
+            parquet (bool, opcional): Condição para também gravar os dados em Parquet. Padrão é True.
+            continuar (bool, opcional): Condição para continuar os arquivos existentes em vez de recriá-los. Padrão é False.
+            ao_descarregar (callable, opcional): Função chamada sempre que as linhas guardadas são gravadas em disco,
+                usada para salvar o progresso da coleta junto com os dados.
+            km_por_contrato (bool, opcional): Se o Km do site é o total do contrato e deve ser dividido pelos meses. Padrão é False.
+            arrow (bool, opcional): Condição para também gravar os lotes em Arrow IPC, para o Juntador. Padrão é True.
+            grupo_parquet (int, opcional): Quantidade de linhas guardadas antes de gravar um grupo no Parquet. Padrão é 50000.
+        """
+        self.arquivo = arquivo
+        self.lote = lote
+        self.parquet = os.path.splitext(arquivo)[0] + '.parquet' if parquet else None
+        self.arrow = pasta_arrow(arquivo) if arrow else None
+        self.bruto = os.path.splitext(arquivo)[0] + '.bruto.csv'
+        self.invalidos = os.path.splitext(arquivo)[0] + '.invalidos.csv'
+        self.km_por_contrato = km_por_contrato
+        self.linhas = []
+        self.total = 0
+        self.total_invalidos = 0
+        self.ao_descarregar = ao_descarregar
+        self.grupo_parquet = grupo_parquet
+        self.tabelas = []  # Lotes convertidos ainda não gravados no Parquet.
+        self.escritor = None  # ParquetWriter da coleta, aberto no primeiro grupo.
+
+        pastas = [pasta for pasta in (self.parquet, self.arrow) if pasta]
+        if not continuar or not os.path.exists(arquivo):
+            pd.DataFrame(columns=COLUNAS).to_csv(arquivo, index=False)  # Criando .csv apenas com o cabeçalho.
+            pd.DataFrame(columns=COLUNAS).to_csv(self.bruto, index=False)
+            if os.path.exists(self.invalidos):
+                os.remove(self.invalidos)
+            for pasta in pastas:
+                if os.path.isdir(pasta):
+                    shutil.rmtree(pasta)
+        for pasta in pastas:
+            os.makedirs(pasta, exist_ok=True)
+        # Continuando a numeração das partes, sem contar as anotações e os arquivos gravados pela metade.
+        self.partes = self.contar_partes(self.arrow)
+        if self.parquet:
+            self.caminho_parquet = os.path.join(self.parquet, f'parte-{self.contar_partes(self.parquet):05d}.parquet')
+
+
+    @staticmethod
+    def contar_partes(pasta):
+        """Quantidade de partes completas em uma pasta, 0 se ela não for usada."""
+        if not pasta:
+            return 0
+        return sum(nome.startswith('parte-') and not nome.endswith('.tmp') for nome in os.listdir(pasta))
+
+
+    def adicionar(self, linha):
+        """Adiciona uma linha, gravando o lote em disco quando ele estiver completo.
+
+        Args:
+            linha (dict): Dados de uma combinação de Km e período.
+        """
+        self.linhas.append(tuple(linha[coluna] for coluna in COLUNAS))
+        if len(self.linhas) >= self.lote:
+            self.descarregar()
+
+
+    def descarregar(self):
+        """Grava em disco as linhas guardadas."""
+        if self.linhas:
+            self._gravar()
+        if self.ao_descarregar:
+            self.ao_descarregar()
+
+
+    def _gravar(self):
+        """Adiciona as linhas guardadas ao .csv bruto, converte os valores e adiciona ao .csv e ao Parquet."""
+        brutos = pd.DataFrame.from_records(self.linhas, columns=COLUNAS)
+        brutos.to_csv(self.bruto, mode='a', header=False, index=False)
+
+        dados, invalidos = normalizar(brutos, self.km_por_contrato)
+        dados.to_csv(self.arquivo, mode='a', header=False, index=False)
+        if not invalidos.empty:
+            invalidos.to_csv(self.invalidos, mode='a', header=not os.path.exists(self.invalidos), index=False)
+            self.total_invalidos += len(invalidos)
+
+        datas = pd.to_datetime(dados['Data'], format=FORMATO_DATA, errors='coerce')
+        tabela = pa.Table.from_pandas(dados.assign(Data=datas), schema=ESQUEMA, preserve_index=False)
+        if self.parquet:
+            self.tabelas.append(tabela)
+            if sum(parte.num_rows for parte in self.tabelas) >= self.grupo_parquet:
+                self.gravar_parquet()
+        if self.arrow:
+            caminho = os.path.join(self.arrow, f'parte-{self.partes:05d}.arrow')
+            with pa.OSFile(caminho + '.tmp', 'wb') as saida, pa.ipc.new_file(saida, ESQUEMA) as escritor:
+                escritor.write_table(tabela)
+            os.replace(caminho + '.tmp', caminho)  # O lote só aparece para o Juntador depois de gravado por completo.
+        self.partes += 1
+
+        self.total += len(self.linhas)
+        self.linhas = []
+
+
+    def gravar_parquet(self):
+        """Grava os lotes guardados como um grupo de linhas do Parquet da coleta."""
+        if not self.tabelas:
+            return
+        if self.escritor is None:
+            # O nome começa com _ para o arquivo incompleto não ser lido com a pasta por pd.read_parquet.
+            temporario = os.path.join(self.parquet, '_' + os.path.basename(self.caminho_parquet) + '.tmp')
+            self.escritor = pq.ParquetWriter(temporario, ESQUEMA)
+        self.escritor.write_table(pa.concat_tables(self.tabelas))
+        self.tabelas = []
+
+
+    def fechar(self):
+        """Grava o último lote e fecha o Parquet da coleta, que recebe o nome final."""
+        self.descarregar()
+        if self.parquet:
+            self.gravar_parquet()
+        if self.escritor is not None:
+            self.escritor.close()
+            os.replace(self.escritor.where, self.caminho_parquet)
+            self.escritor = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.fechar()
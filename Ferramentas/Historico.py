@@ -0,0 +1,150 @@
+"""Módulo do histórico de preços, guardado em Parquet particionado por dia e locadora."""
+import os
+import uuid
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+
+# Tipos das colunas no histórico, os textos repetidos são guardados como dicionário e a data como timestamp.
+ESQUEMA = pa.schema([('Nome', pa.dictionary(pa.int32(), pa.string())), ('Data', pa.timestamp('s')),
+                     ('Km', pa.float64()), ('Meses', pa.int16()), ('Valor', pa.float64()),
+                     ('Descricao', pa.dictionary(pa.int32(), pa.string()))])
+PARTICOES = pa.schema([('dia', pa.date32()), ('Locadora', pa.string())])
+COLUNAS = pa.schema(list(ESQUEMA) + list(PARTICOES))
+FORMATO_DATA = '%d/%m/%Y %H:%M'
+
+
+class Historico:
+    """Classe do histórico de preços de todas as coletas.
+
+    Cada coleta é adicionada ao final do histórico, sem apagar as anteriores, em arquivos Parquet comprimidos
+    particionados por dia e locadora (historico/dia=2022-05-01/Locadora=Unidas/...). As consultas por período ou
+    locadora leem apenas as partições necessárias.
+    """
+
+    def __init__(self, pasta='historico'):
+        """Inicializador da classe Historico.
+
+        Args:
+            pasta (str, opcional): Pasta em que o histórico é guardado. Padrão é 'historico'.
+        """
+        self.pasta = pasta
+        self.particionamento = ds.partitioning(PARTICOES, flavor='hive')
+
+
+    def adicionar(self, dados):
+        """Adiciona as linhas de uma coleta ao histórico.
+
+        Args:
+            dados (pd.DataFrame): Dados no formato dos .csv, com a coluna Data como texto dd/mm/aaaa hh:mm.
+        """
+        dados = dados.copy()
+        dados['Data'] = pd.to_datetime(dados['Data'], format=FORMATO_DATA, errors='coerce')
+        dados = dados.dropna(subset=['Data'])
+        if dados.empty:
+            return
+
+        dados['dia'] = dados['Data'].dt.date
+        dados['Meses'] = pd.to_numeric(dados['Meses'], errors='coerce').astype('Int16')
+        for coluna in ('Km', 'Valor'):
+            dados[coluna] = pd.to_numeric(dados[coluna], errors='coerce')
+        for coluna in ('Nome', 'Descricao', 'Locadora'):
+            dados[coluna] = dados[coluna].astype('string')
+
+        self._gravar(pa.Table.from_pandas(dados[COLUNAS.names], schema=COLUNAS, preserve_index=False))
+
+
+    def adicionar_tabela(self, tabela):
+        """Adiciona ao histórico as linhas de uma tabela Arrow já com os tipos convertidos, como os lotes do Gravador.
+
+        Os valores não voltam para o pandas: a data já é um timestamp, o dia é tirado dela e os textos repetidos
+        viram dicionários direto na tabela.
+
+        Args:
+            tabela (pa.Table): Tabela com as colunas do Gravador, com a data como timestamp.
+        """
+        tabela = tabela.filter(pc.is_valid(tabela['Data']))
+        if tabela.num_rows == 0:
+            return
+
+        data = tabela['Data'].cast(pa.timestamp('s'))
+        colunas = {'Nome': tabela['Nome'].dictionary_encode(), 'Data': data, 'Km': tabela['Km'],
+                   'Meses': tabela['Meses'].cast(pa.int16()), 'Valor': tabela['Valor'],
+                   'Descricao': tabela['Descricao'].dictionary_encode(), 'dia': data.cast(pa.date32()),
+                   'Locadora': tabela['Locadora']}
+        self._gravar(pa.Table.from_arrays([colunas[nome].cast(COLUNAS.field(nome).type) for nome in COLUNAS.names],
+                                          schema=COLUNAS))
+
+
+    def _gravar(self, tabela):
+        """Grava uma tabela com o esquema do histórico em arquivos novos, particionados por dia e locadora."""
+        # Cada coleta grava arquivos com um nome novo, assim as anteriores nunca são sobrescritas.
+        ds.write_dataset(tabela, self.pasta, format='parquet', partitioning=self.particionamento,
+                         basename_template=f'{uuid.uuid4().hex}-{{i}}.parquet',
+                         file_options=ds.ParquetFileFormat().make_write_options(compression='zstd'),
+                         existing_data_behavior='overwrite_or_ignore')
+
+
+    def consultar(self, inicio=None, fim=None, locadora=None, filtro=None, colunas=None):
+        """Consulta o histórico.
+
+        Args:
+            inicio (str | datetime, opcional): Data inicial, inclusive.
+            fim (str | datetime, opcional): Data final, inclusive.
+            locadora (str, opcional): Nome da locadora.
+            filtro (pyarrow.dataset.Expression, opcional): Filtro adicional.
+            colunas (list, opcional): Colunas retornadas. Padrão é todas.
+
+        Returns:
+            pd.DataFrame: Linhas encontradas.
+        """
+        expressao = ds.scalar(True)
+        if inicio is not None:
+            inicio = pd.Timestamp(inicio)
+            expressao &= (ds.field('dia') >= inicio.date()) & (ds.field('Data') >= inicio.to_pydatetime())
+        if fim is not None:
+            fim = pd.Timestamp(fim)
+            expressao &= (ds.field('dia') <= fim.date()) & (ds.field('Data') <= fim.to_pydatetime())
+        if locadora is not None:
+            expressao &= ds.field('Locadora') == locadora
+        if filtro is not None:
+            expressao &= filtro
+
+        if not os.path.isdir(self.pasta):
+            return COLUNAS.empty_table().to_pandas() if colunas is None else pd.DataFrame(columns=colunas)
+
+        dataset = ds.dataset(self.pasta, format='parquet', partitioning=self.particionamento, schema=COLUNAS)
+        return dataset.to_table(columns=colunas, filter=expressao).to_pandas()
+
+
+    def historico_modelo(self, nome, inicio=None, fim=None, locadora=None):
+        """Histórico de preços dos carros cujo nome contenha o texto informado, sem diferenciar maiúsculas.
+
+        Returns:
+            pd.DataFrame: Linhas encontradas, ordenadas por data.
+        """
+        dados = self.consultar(inicio, fim, locadora)
+        nomes = dados['Nome'].astype(str)
+        return dados[nomes.str.contains(nome, case=False, regex=False)].sort_values('Data', ignore_index=True)
+
+
+    def ultimo_retrato(self, locadora=None):
+        """Linhas da coleta mais recente de cada locadora.
+
+        Returns:
+            pd.DataFrame: Linhas da última coleta de cada locadora.
+        """
+        # Procurando o último dia de cada locadora lendo apenas as colunas de partição, que não ocupam espaço nos arquivos.
+        dias = self.consultar(locadora=locadora, colunas=['dia', 'Locadora'])
+        if dias.empty:
+            return self.consultar(locadora=locadora)
+
+        # Uma coleta pode levar várias horas, então o retrato é o dia inteiro da última coleta.
+        ultimos = dias.groupby('Locadora')['dia'].max()
+        filtro = None
+        for nome, dia in ultimos.items():
+            condicao = (ds.field('Locadora') == nome) & (ds.field('dia') == dia)
+            filtro = condicao if filtro is None else filtro | condicao
+        return self.consultar(filtro=filtro)
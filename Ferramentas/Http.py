@@ -0,0 +1,272 @@
+"""Módulo de coleta direta por HTTP, sem abrir o navegador.
+
+Busca as páginas dos sites com uma sessão HTTP que reaproveita conexões e lê os dados de preço direto
+do estado que o site embute na página (Next.js ou Angular) ou de respostas JSON, gerando as mesmas linhas
+Nome/Data/Locadora/Km/Meses/Valor/Descricao da coleta pelo navegador.
+"""
+import re
+import json
+import requests
+import numpy as np
+from datetime import datetime
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from Ferramentas.Pipeline import Pipeline
+from Ferramentas.Comparar import palavras, separar
+
+
+# Nomes de chaves usados pelos sites para cada campo das ofertas, comparados sem diferenciar maiúsculas.
+CHAVES_MESES = ('meses', 'months', 'month', 'period', 'periodo', 'prazo', 'term')
+CHAVES_KM = ('km', 'kms', 'franquia', 'franchise', 'mileage', 'bundle', 'quilometragem')
+CHAVES_VALOR = ('valor', 'price', 'preco', 'value', 'monthlyprice', 'amount', 'installment')
+CHAVES_DESCRICAO = ('descricao', 'description', 'observacao', 'observation')
+CHAVES_NOME = ('nome', 'name', 'modelname', 'title', 'titulo')
+
+# Escapes usados pelo TransferState do Angular no script serverApp-state.
+ESCAPES_ANGULAR = {'&q;': '"', '&s;': "'", '&l;': '<', '&g;': '>', '&a;': '&'}
+
+
+def criar_sessao(conexoes=10, tentativas=3):
+    """Cria uma sessão HTTP com pool de conexões e novas tentativas automáticas.
+
+    Args:
+        conexoes (int, opcional): Quantidade de conexões mantidas abertas por host. Padrão é 10.
+        tentativas (int, opcional): Quantidade de novas tentativas em falhas de conexão ou erros 5xx. Padrão é 3.
+
+    Returns:
+        requests.Session: Sessão pronta para uso.
+    """
+    sessao = requests.Session()
+    retry = Retry(total=tentativas, backoff_factor=.5, status_forcelist=(429, 500, 502, 503, 504))
+    adaptador = HTTPAdapter(pool_connections=conexoes, pool_maxsize=conexoes, max_retries=retry)
+    sessao.mount('http://', adaptador)
+    sessao.mount('https://', adaptador)
+    sessao.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                                         '(KHTML, like Gecko) Chrome/100.0 Safari/537.36'})
+    return sessao
+
+
+class _LeitorLinks(HTMLParser):
+    """Leitor de HTML que guarda o href de todos os elementos."""
+
+    def __init__(self):
+        super().__init__()
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        for nome, valor in attrs:
+            if nome == 'href' and valor:
+                self.links.append(valor)
+
+
+def buscar(url, sessao=None, cache=None, timeout=30):
+    """Busca uma página, usando o cache quando ele tem uma cópia válida ou o site responde que ela não mudou.
+
+    Args:
+        url (str): Endereço da página.
+        sessao (requests.Session, opcional): Sessão usada na requisição. Padrão é uma nova sessão.
+        cache (Cache, opcional): Cache em disco das páginas. Padrão é None, que sempre busca a página.
+        timeout (float, opcional): Tempo limite, em segundos, da requisição. Padrão é 30.
+
+    Returns:
+        str: Conteúdo da página.
+    """
+    if cache is not None:
+        texto = cache.ler(url)
+        if texto is not None:
+            return texto
+
+    sessao = sessao or criar_sessao()
+    resposta = sessao.get(url, headers=cache.cabecalhos(url) if cache is not None else None, timeout=timeout)
+    if resposta.status_code == 304 and cache is not None:  # A página não mudou desde a última busca.
+        cache.renovar(url)
+        return cache.ler(url, vencido=True)
+    resposta.raise_for_status()
+
+    if cache is not None:
+        cache.gravar(url, resposta.text, resposta.headers.get('ETag'), resposta.headers.get('Last-Modified'))
+    return resposta.text
+
+
+def extrair_links(html, trecho, base):
+    """Pegando o link de todos os elementos da página que contenham o trecho informado.
+
+    Args:
+        html (str): Conteúdo da página.
+        trecho (str): Trecho que identifica os links de carros, como '/veiculos/'.
+        base (str): Endereço da página, usado para completar links relativos.
+
+    Returns:
+        list: Lista com os links, sem repetição e na ordem da página.
+    """
+    leitor = _LeitorLinks()
+    leitor.feed(html)
+
+    carros = []
+    for link in leitor.links:
+        link = urljoin(base, link)
+        if trecho in link and link not in carros:
+            carros.append(link)
+    return carros
+
+
+def extrair_estado(html):
+    """Lê o estado que o site embute na página.
+
+    Args:
+        html (str): Conteúdo da página.
+
+    Returns:
+        object: Estado da página já convertido de JSON, ou None se não houver.
+    """
+    # Next.js (__NEXT_DATA__), Angular Universal (serverApp-state) ou qualquer script do tipo JSON.
+    for padrao in (r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>',
+                   r'<script[^>]*id="serverApp-state"[^>]*>(.*?)</script>',
+                   r'<script[^>]*type="application/json"[^>]*>(.*?)</script>'):
+        encontrado = re.search(padrao, html, re.S)
+        if encontrado is None:
+            continue
+
+        texto = encontrado.group(1)
+        for escape, caractere in ESCAPES_ANGULAR.items():
+            texto = texto.replace(escape, caractere)
+        try:
+            return json.loads(texto)
+        except ValueError:
+            continue
+    return None
+
+
+def _campo(dicionario, chaves):
+    """Procura no dicionário a primeira chave com um dos nomes informados."""
+    for chave, valor in dicionario.items():
+        if chave.lower() in chaves and not isinstance(valor, (dict, list)):
+            return valor
+    return None
+
+
+def procurar_ofertas(dados):
+    """Procura, em qualquer nível do estado, as ofertas de preço por período e Km e o carro de cada uma.
+
+    Uma oferta é qualquer objeto que tenha, ao mesmo tempo, campos de meses, Km e valor. Os valores são mantidos
+    como estão no estado, textos ou números, e são convertidos pelo Gravador. O nome do carro é o do objeto mais
+    próximo que contém a oferta, como o veículo que guarda a lista de planos, ou o da própria oferta se nenhum
+    deles tiver nome. Nomes de outras partes do estado, como o título da página, nunca são usados.
+
+    Returns:
+        list: Lista de tuplas (meses, km, valor, descricao, nome), com nome None se não for encontrado.
+    """
+    ofertas = []
+    pilha = [(dados, None)]
+    while pilha:
+        item, nome = pilha.pop()
+        if isinstance(item, dict):
+            meses, km, valor = _campo(item, CHAVES_MESES), _campo(item, CHAVES_KM), _campo(item, CHAVES_VALOR)
+            proprio = _campo(item, CHAVES_NOME)
+            if meses is not None and km is not None and valor is not None:
+                descricao = _campo(item, CHAVES_DESCRICAO)
+                ofertas.append((meses, km, valor, np.nan if descricao is None else descricao,
+                                nome if nome is not None else proprio))
+            interno = proprio if proprio is not None else nome  # Nome do carro para os objetos de dentro deste.
+            pilha.extend((valor, interno) for valor in reversed(list(item.values())))
+        elif isinstance(item, list):
+            pilha.extend((valor, nome) for valor in reversed(item))
+    return ofertas
+
+
+def ler_carro(texto, locadora):
+    """Lê os dados de todas as combinações de Km e período da página de um carro.
+
+    Args:
+        texto (str): Conteúdo da página do carro, em HTML ou JSON.
+        locadora (str): Nome da locadora salvo nas linhas.
+
+    Returns:
+        list: Lista de dicionários com os dados de cada combinação de Km e período, com os valores como estão na página.
+    """
+    estado = extrair_estado(texto)
+    if estado is None:
+        try:
+            estado = json.loads(texto)
+        except ValueError:
+            return []
+
+    data = datetime.now().strftime('%d/%m/%Y %H:%M')
+    linhas = []
+    for meses, km, valor, descricao, nome in procurar_ofertas(estado):
+        linhas.append({'Nome':nome, 'Data':data, 'Locadora':locadora, 'Km':km, 'Meses':meses, 'Valor':valor, 'Descricao':descricao})
+    return linhas
+
+
+def filtrar_carro(linhas, nome):
+    """Mantém apenas as ofertas do carro aberto, descartando as de outros carros presentes no mesmo estado.
+
+    O estado de uma página navegada dentro do site, ou a resposta da listagem, pode ter as ofertas de vários
+    carros. As ofertas mantidas são as do objeto com o mesmo modelo e o nome mais parecido com o do carro aberto,
+    e as ofertas sem nome nunca são mantidas.
+
+    Args:
+        linhas (list): Linhas lidas por ler_carro.
+        nome (str): Nome do carro aberto, lido na página.
+
+    Returns:
+        list: Linhas do carro, vazia se nenhum objeto for dele.
+    """
+    _, modelo, _ = separar(nome or '')
+    if modelo is None:
+        return []
+    alvo = set(palavras(nome))
+
+    melhor, nota_melhor = None, 0.
+    for dono in dict.fromkeys(linha['Nome'] for linha in linhas):
+        if dono is None or separar(dono)[1] != modelo:
+            continue
+        conjunto = set(palavras(dono))
+        nota = len(alvo & conjunto)/len(alvo | conjunto)
+        if nota > nota_melhor:
+            melhor, nota_melhor = dono, nota
+    return [linha for linha in linhas if melhor is not None and linha['Nome'] == melhor]
+
+
+def coletar_links(carros, locadora, concorrencia=10, requisicoes_por_segundo=5, cache=None):
+    """Realiza a coleta dos dados de uma lista de páginas de carros, buscando várias ao mesmo tempo.
+
+    Args:
+        carros (list): Lista com o link de todos os carros.
+        locadora (str): Nome da locadora salvo nas linhas.
+        concorrencia (int, opcional): Quantidade máxima de páginas buscadas ao mesmo tempo. Padrão é 10.
+        requisicoes_por_segundo (float, opcional): Limite de requisições por segundo em cada host. Padrão é 5.
+        cache (Cache, opcional): Cache em disco das páginas. Padrão é None, que sempre busca as páginas.
+
+    Returns:
+        list: Lista de dicionários com os dados de cada combinação de Km e período.
+    """
+    pipeline = Pipeline(lambda url, texto: ler_carro(texto, locadora),
+                        concorrencia=concorrencia, requisicoes_por_segundo=requisicoes_por_segundo, cache=cache)
+
+    linhas = []
+    for resultado in pipeline.executar(carros):
+        if resultado is not None:
+            linhas.extend(resultado)
+    return linhas
+
+
+def coletar(url, trecho, locadora, sessao=None, cache=None):
+    """Realiza a coleta dos dados de todos os carros de uma página de listagem.
+
+    Args:
+        url (str): Endereço da página com todos os carros.
+        trecho (str): Trecho que identifica os links de carros.
+        locadora (str): Nome da locadora salvo nas linhas.
+        sessao (requests.Session, opcional): Sessão usada na requisição da listagem. Padrão é uma nova sessão.
+        cache (Cache, opcional): Cache em disco da listagem e das páginas dos carros. Padrão é None, que sempre busca as páginas.
+
+    Returns:
+        list: Lista de dicionários com os dados de cada combinação de Km e período.
+    """
+    carros = extrair_links(buscar(url, sessao, cache), trecho, url)
+    print(f'Foram encontrados {len(carros)} carros em {url}')
+
+    return coletar_links(carros, locadora, cache=cache)
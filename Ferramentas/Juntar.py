@@ -0,0 +1,279 @@
+"""Módulo que junta os dados dos sites em um único arquivo, lendo cada um em partes."""
+import os
+import shutil
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pcsv
+import pyarrow.compute as pc
+from Ferramentas.Gravador import COLUNAS, ESQUEMA, pasta_arrow
+from Ferramentas.Historico import FORMATO_DATA
+
+
+NUMERICAS = ['Km', 'Meses', 'Valor']
+
+
+def validar(parte):
+    """Converte as colunas de uma parte de um .csv para os tipos esperados, descartando as linhas inválidas.
+
+    Args:
+        parte (pd.DataFrame): Parte lida do .csv, com todas as colunas como texto.
+
+    Returns:
+        tuple: Parte com os tipos convertidos e quantidade de linhas descartadas.
+    """
+    invalidas = pd.Series(False, index=parte.index)
+    for coluna in NUMERICAS:
+        valores = pd.to_numeric(parte[coluna], errors='coerce')
+        invalidas |= valores.isna() & parte[coluna].notna()  # Texto que não é número.
+        parte[coluna] = valores
+    invalidas |= pd.to_datetime(parte['Data'], format='%d/%m/%Y %H:%M', errors='coerce').isna()
+    invalidas |= parte['Nome'].isna() | parte['Locadora'].isna()
+    return parte[~invalidas], int(invalidas.sum())
+
+
+def juntar(arquivos, destino='dados.csv', historico=None, tamanho=100000, apagar=True):
+    """Junta os .csv dos sites em um único .csv, sem carregar todos eles na memória.
+
+    Cada arquivo é lido em partes de tamanho fixo, que são validadas e gravadas direto no destino, assim o custo
+    cresce de forma linear com a quantidade de linhas. Arquivos com colunas diferentes das esperadas são ignorados
+    e as linhas com valores inválidos são descartadas, e tudo isso é informado ao final.
+
+    Args:
+        arquivos (list): Caminhos dos .csv dos sites.
+        destino (str, opcional): Caminho do .csv com todos os dados. Padrão é 'dados.csv', None apenas adiciona ao histórico.
+        historico (Historico, opcional): Histórico ao qual as linhas também são adicionadas. Padrão é None.
+        tamanho (int, opcional): Quantidade de linhas lidas por vez. Padrão é 100000.
+        apagar (bool, opcional): Condição para apagar os .csv dos sites que foram juntados. Padrão é True.
+
+    Returns:
+        tuple: Quantidade de linhas juntadas e dicionário com os arquivos ignorados e o motivo.
+    """
+    total, ignorados, descartadas = 0, {}, {}
+    with open(destino or os.devnull, 'w', newline='', encoding='utf-8') as saida:
+        saida.write(','.join(COLUNAS) + '\n')
+
+        for arquivo in arquivos:
+            if not os.path.exists(arquivo):
+                ignorados[arquivo] = 'arquivo não encontrado'
+                continue
+
+            try:
+                colunas = list(pd.read_csv(arquivo, nrows=0).columns)
+            except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+                ignorados[arquivo] = f'não foi possível ler o arquivo ({e})'
+                continue
+            if sorted(colunas) != sorted(COLUNAS):
+                ignorados[arquivo] = f'colunas diferentes das esperadas: {colunas}'
+                continue
+
+            # Lendo tudo como texto para a validação ver os valores originais.
+            juntadas = 0
+            try:
+                for parte in pd.read_csv(arquivo, dtype=str, chunksize=tamanho):
+                    parte, invalidas = validar(parte[COLUNAS].copy())
+                    descartadas[arquivo] = descartadas.get(arquivo, 0) + invalidas
+                    parte.to_csv(saida, header=False, index=False)
+                    if historico is not None and not parte.empty:
+                        historico.adicionar(parte)
+                    juntadas += len(parte)
+            except (pd.errors.ParserError, UnicodeDecodeError) as e:
+                # As partes anteriores à falha já foram gravadas, então o arquivo não é apagado para ser conferido.
+                ignorados[arquivo] = f'falha na leitura após {juntadas} linhas juntadas ({e})'
+                total += juntadas
+                continue
+
+            total += juntadas
+            if apagar:
+                os.remove(arquivo)
+
+    for arquivo, quantidade in descartadas.items():
+        if quantidade:
+            print(f'Foram descartadas {quantidade} linhas com valores inválidos de {arquivo}')
+    for arquivo, motivo in ignorados.items():
+        print(f'O arquivo {arquivo} foi ignorado: {motivo}')
+
+    return total, ignorados
+
+
+class Juntador:
+    """Classe que junta os dados dos sites enquanto eles ainda estão sendo coletados.
+
+    Os sites gravam cada lote também em Arrow IPC, com os tipos já convertidos, em uma pasta ao lado do .csv. O
+    Juntador procura os lotes novos dessas pastas e lê cada um mapeando o arquivo na memória, assim as colunas são
+    usadas como estão no arquivo, sem passar pelo pandas e sem converter os valores de texto de novo. Os lotes
+    ficam em Arrow até o fim: apenas as linhas sem data, nome ou locadora são descartadas, o destino é escrito
+    direto da tabela, formatando só a data, e o histórico recebe as tabelas juntadas. Como os lotes chegam na
+    medida em que os processos dos sites gravam, ao fim da coleta resta juntar apenas os últimos. Lotes que não
+    podem ser lidos ou com colunas diferentes do esquema do Gravador são ignorados e informados ao final.
+
+    O destino é gravado com outro nome e só substitui o anterior ao final, e os lotes e o .csv de cada site são
+    mantidos até a próxima coleta completa, assim o retomar e o refazer continuam os dados anteriores e o destino
+    é refeito com todos eles. O histórico recebe as linhas em blocos de tamanho fixo, para não criar um arquivo
+    Parquet por lote, e os lotes já adicionados a ele ficam anotados na pasta de cada site, para não serem
+    adicionados de novo quando os lotes são juntados outra vez.
+    """
+
+    def __init__(self, arquivos, destino='dados.csv', historico=None, tamanho=100000):
+        """Inicializador da classe Juntador, que já cria o destino temporário apenas com o cabeçalho.
+
+        Args:
+            arquivos (list): Caminhos dos .csv dos sites, os lotes são lidos da pasta .arrow de cada um.
+            destino (str, opcional): Caminho do .csv com todos os dados. Padrão é 'dados.csv', None apenas adiciona ao histórico.
+            historico (Historico, opcional): Histórico ao qual as linhas também são adicionadas. Padrão é None.
+            tamanho (int, opcional): Quantidade de linhas adicionadas por vez ao histórico. Padrão é 100000.
+        """
+        self.arquivos = list(arquivos)
+        self.historico = historico
+        self.tamanho = tamanho
+        self.lidos = {arquivo: set() for arquivo in self.arquivos}  # Lotes já juntados de cada site.
+        self.descartadas = {}
+        self.ignorados = {}  # Lotes que não puderam ser lidos ou com colunas diferentes, com o motivo.
+        self.pendentes = []  # Lotes ainda não adicionados ao histórico, com o site e o nome de cada um.
+        self.publicados = {arquivo: self.ler_publicados(arquivo) for arquivo in self.arquivos}
+        self.total = 0
+
+        self.destino = destino
+        self.saida = open(destino + '.tmp' if destino else os.devnull, 'wb')
+        self.saida.write((','.join(COLUNAS) + '\n').encode('utf-8'))
+
+
+    @staticmethod
+    def anotacao(arquivo):
+        """Arquivo com os nomes dos lotes de um site já adicionados ao histórico."""
+        return os.path.join(pasta_arrow(arquivo), 'historico.txt')
+
+
+    def ler_publicados(self, arquivo):
+        """Lotes de um site já adicionados ao histórico em uma junção anterior."""
+        try:
+            with open(self.anotacao(arquivo), encoding='utf-8') as f:
+                return set(f.read().split())
+        except FileNotFoundError:
+            return set()
+
+
+    def lotes(self, arquivo):
+        """Lotes prontos de um site que ainda não foram juntados, na ordem em que foram gravados."""
+        try:
+            nomes = os.listdir(pasta_arrow(arquivo))
+        except FileNotFoundError:  # O site ainda não começou a gravar.
+            return []
+        return sorted(nome for nome in nomes if nome.endswith('.arrow') and nome not in self.lidos[arquivo])
+
+
+    def receber(self):
+        """Junta os lotes gravados desde a última chamada.
+
+        Returns:
+            int: Quantidade de linhas juntadas.
+        """
+        juntadas = 0
+        for arquivo in self.arquivos:
+            for nome in self.lotes(arquivo):
+                caminho = os.path.join(pasta_arrow(arquivo), nome)
+                try:
+                    # As colunas da tabela apontam para o arquivo mapeado, sem cópia.
+                    with pa.memory_map(caminho) as mapa:
+                        parte = pa.ipc.open_file(mapa).read_all()
+                except FileNotFoundError:  # Pasta recriada pelo site ao começar uma nova coleta.
+                    continue
+                except (pa.ArrowInvalid, OSError) as e:
+                    self.lidos[arquivo].add(nome)
+                    self.ignorados[caminho] = f'não foi possível ler o lote ({e})'
+                    continue
+                self.lidos[arquivo].add(nome)
+                if not parte.schema.equals(ESQUEMA):
+                    # Lotes de uma versão anterior do Gravador, com outros tipos, não podem ir para o mesmo destino.
+                    self.ignorados[caminho] = f'colunas diferentes das esperadas: {parte.schema.names}'
+                    continue
+
+                # Os valores já foram convertidos pelo Gravador, restam apenas as linhas sem data, nome ou locadora.
+                validas = pc.and_(pc.is_valid(parte['Data']),
+                                  pc.and_(pc.is_valid(parte['Nome']), pc.is_valid(parte['Locadora'])))
+                invalidas = parte.num_rows - pc.sum(validas).as_py() if parte.num_rows else 0
+                if invalidas:
+                    parte = parte.filter(validas)
+                self.descartadas[arquivo] = self.descartadas.get(arquivo, 0) + invalidas
+
+                self.escrever(parte)
+                self.guardar(arquivo, nome, parte)
+                juntadas += parte.num_rows
+
+        self.saida.flush()
+        self.total += juntadas
+        return juntadas
+
+
+    def escrever(self, parte):
+        """Adiciona as linhas de um lote ao destino, com a data no formato dos .csv dos sites."""
+        datas = pc.strftime(parte['Data'], format=FORMATO_DATA)
+        parte = parte.select(COLUNAS).set_column(COLUNAS.index('Data'), 'Data', datas)
+        pcsv.write_csv(parte, self.saida, pcsv.WriteOptions(include_header=False))
+
+
+    def guardar(self, arquivo, nome, parte):
+        """Guarda um lote para o histórico, adicionando os lotes guardados quando completam um bloco."""
+        if self.historico is None or nome in self.publicados[arquivo]:
+            return
+        self.pendentes.append((arquivo, nome, parte))
+        if sum(pendente.num_rows for _, _, pendente in self.pendentes) >= self.tamanho:
+            self.publicar()
+
+
+    def publicar(self):
+        """Adiciona os lotes guardados ao histórico e anota os nomes deles na pasta de cada site."""
+        if not self.pendentes:
+            return
+        self.historico.adicionar_tabela(pa.concat_tables([parte for _, _, parte in self.pendentes]))
+        for arquivo, nome, _ in self.pendentes:
+            self.publicados[arquivo].add(nome)
+            with open(self.anotacao(arquivo), 'a', encoding='utf-8') as f:
+                f.write(nome + '\n')
+        self.pendentes = []
+
+
+    def acompanhar(self, parar, intervalo=1.):
+        """Junta os lotes novos periodicamente até ser avisado, usado em uma thread durante a coleta.
+
+        Args:
+            parar (threading.Event): Evento que encerra o acompanhamento.
+            intervalo (float, opcional): Tempo, em segundos, entre as procuras por lotes novos. Padrão é 1.
+        """
+        while not parar.wait(intervalo):
+            self.receber()
+
+
+    def fechar(self, apagar=False):
+        """Junta os últimos lotes, depois do fim da coleta de todos os sites, e troca o destino anterior pelo novo.
+
+        Args:
+            apagar (bool, opcional): Condição para apagar o .csv e os lotes dos sites que foram juntados, que deixam
+                de poder ser continuados pelo retomar e pelo refazer. Padrão é False.
+
+        Returns:
+            tuple: Quantidade de linhas juntadas e dicionário com os arquivos e lotes ignorados e o motivo.
+        """
+        self.receber()
+        self.publicar()
+        self.saida.close()
+        if self.destino:
+            os.replace(self.destino + '.tmp', self.destino)
+
+        ignorados = dict(self.ignorados)
+        for arquivo in self.arquivos:
+            if not self.lidos[arquivo] and not os.path.isdir(pasta_arrow(arquivo)):
+                # Sem a pasta dos lotes, o .csv do site é mantido para ser conferido ou juntado com juntar.
+                ignorados[arquivo] = 'pasta dos lotes em Arrow não encontrada'
+                continue
+            if apagar:
+                shutil.rmtree(pasta_arrow(arquivo), ignore_errors=True)
+                if os.path.exists(arquivo):
+                    os.remove(arquivo)
+
+        for arquivo, quantidade in self.descartadas.items():
+            if quantidade:
+                print(f'Foram descartadas {quantidade} linhas com valores inválidos de {arquivo}')
+        for arquivo, motivo in ignorados.items():
+            print(f'O arquivo {arquivo} foi ignorado: {motivo}')
+
+        return self.total, ignorados
@@ -0,0 +1,167 @@
+"""Módulo de métricas da coleta, com o tempo de cada etapa e a quantidade de falhas e novas tentativas."""
+import os
+import json
+import pandas as pd
+from time import perf_counter, time
+from datetime import datetime
+from contextlib import contextmanager
+
+
+class Metricas:
+    """Classe que mede o tempo das etapas da coleta de um site, no total e por carro, e conta eventos.
+
+    As métricas são salvas em <nome>.metricas.json, ao lado do .csv do site.
+
+    Attributes:
+        fases (dict): Quantidade, tempo total e máximo de cada etapa, como pagina, load_all, listagem, matriz, opcoes,
+            selecao, preco, carro, exportacao e http.
+        carros (dict): Tempo de cada etapa dentro da coleta de cada carro.
+        contadores (dict): Eventos contados, como falhas, falhas_<tipo>, tentativas, contornadas_<tipo>,
+            esperas_esgotadas, matrizes, cache, valores_invalidos, reciclagens_<motivo> e abas_carregadas.
+        navegadores (list): Uso de memória e CPU de cada navegador usado na coleta, medido pelo Vigia.
+    """
+
+    def __init__(self, site=None):
+        """Inicializador da classe Metricas.
+
+        Args:
+            site (str, opcional): Nome do site.
+        """
+        self.site = site
+        self.inicio = time()
+        self.fases = {}
+        self.carros = {}
+        self.contadores = {}
+        self.navegadores = []  # Uso de recursos de cada navegador usado na coleta, medido pelo Vigia.
+        self.carro_atual = None
+
+
+    @contextmanager
+    def fase(self, nome):
+        """Mede o tempo de uma etapa, usado com with."""
+        inicio = perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nome, perf_counter() - inicio)
+
+
+    @contextmanager
+    def carro(self, carro):
+        """Mede o tempo da coleta de um carro, as etapas medidas dentro dela também são guardadas para o carro."""
+        self.carro_atual = json.dumps(carro)
+        try:
+            with self.fase('carro'):
+                yield
+        finally:
+            self.carro_atual = None
+
+
+    def registrar(self, nome, duracao):
+        """Registra a duração de uma etapa.
+
+        Args:
+            nome (str): Nome da etapa.
+            duracao (float): Duração em segundos.
+        """
+        fase = self.fases.setdefault(nome, {'quantidade': 0, 'total': 0., 'maximo': 0.})
+        fase['quantidade'] += 1
+        fase['total'] += duracao
+        fase['maximo'] = max(fase['maximo'], duracao)
+
+        if self.carro_atual is not None:
+            fases = self.carros.setdefault(self.carro_atual, {})
+            fases[nome] = fases.get(nome, 0.) + duracao
+
+
+    def contar(self, nome, quantidade=1):
+        """Soma a quantidade ao contador, como falhas e novas tentativas."""
+        self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+
+    def dados(self):
+        """Métricas em um dicionário que pode ser salvo em .json ou enviado entre processos."""
+        return {'site': self.site, 'inicio': self.inicio, 'duracao': time() - self.inicio, 'fases': self.fases,
+                'carros': self.carros, 'contadores': self.contadores, 'navegadores': self.navegadores}
+
+
+    def juntar(self, dados):
+        """Junta as métricas de outra instância, usado pelo pool que coleta um site em vários processos.
+
+        Args:
+            dados (dict): Métricas retornadas por dados().
+        """
+        for nome, outra in dados['fases'].items():
+            fase = self.fases.setdefault(nome, {'quantidade': 0, 'total': 0., 'maximo': 0.})
+            fase['quantidade'] += outra['quantidade']
+            fase['total'] += outra['total']
+            fase['maximo'] = max(fase['maximo'], outra['maximo'])
+        for carro, fases in dados['carros'].items():
+            atuais = self.carros.setdefault(carro, {})
+            for nome, duracao in fases.items():
+                atuais[nome] = atuais.get(nome, 0.) + duracao
+        for nome, quantidade in dados['contadores'].items():
+            self.contar(nome, quantidade)
+        self.navegadores.extend(dados.get('navegadores', []))
+
+
+    def salvar(self, arquivo):
+        """Salva as métricas em <nome>.metricas.json.
+
+        Args:
+            arquivo (str): Caminho do .csv do site.
+        """
+        with open(caminho(arquivo), 'w', encoding='utf-8') as f:
+            json.dump(self.dados(), f, indent=1)
+
+
+def caminho(arquivo):
+    """Caminho do .json de métricas de um site.
+
+    Args:
+        arquivo (str): Caminho do .csv do site.
+
+    Returns:
+        str: Caminho do .json.
+    """
+    return os.path.splitext(arquivo)[0] + '.metricas.json'
+
+
+def relatorio(arquivos, historico='metricas.jsonl'):
+    """Lê as métricas dos sites, adiciona a execução ao histórico e monta a tabela de resumo.
+
+    O histórico tem uma linha por execução com as métricas de todos os sites, para comparar execuções e
+    encontrar etapas que ficaram mais lentas.
+
+    Args:
+        arquivos (list): Caminhos dos .csv dos sites.
+        historico (str, opcional): Caminho do histórico de execuções. Padrão é 'metricas.jsonl', None não salva.
+
+    Returns:
+        pd.DataFrame: Tabela com quantidade, tempo total, médio e máximo de cada etapa e os contadores de cada site.
+    """
+    execucao = {'data': datetime.now().strftime('%d/%m/%Y %H:%M'), 'sites': {}}
+    linhas = []
+    for arquivo in arquivos:
+        if not os.path.exists(caminho(arquivo)):
+            continue
+        with open(caminho(arquivo), encoding='utf-8') as f:
+            dados = json.load(f)
+        execucao['sites'][dados['site']] = dados
+
+        for nome, fase in dados['fases'].items():
+            linhas.append({'Site': dados['site'], 'Etapa': nome, 'Quantidade': fase['quantidade'],
+                           'Total (s)': round(fase['total'], 1), 'Média (s)': round(fase['total']/fase['quantidade'], 2),
+                           'Máximo (s)': round(fase['maximo'], 2)})
+        for nome, quantidade in dados['contadores'].items():
+            linhas.append({'Site': dados['site'], 'Etapa': nome, 'Quantidade': quantidade})
+        if dados.get('navegadores'):
+            # Maior pico de memória, em MB, entre os navegadores usados pelo site.
+            linhas.append({'Site': dados['site'], 'Etapa': 'pico_memoria_mb',
+                           'Quantidade': round(max(navegador['pico'] for navegador in dados['navegadores']))})
+
+    if historico and execucao['sites']:
+        with open(historico, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(execucao) + '\n')
+
+    return pd.DataFrame(linhas, columns=['Site', 'Etapa', 'Quantidade', 'Total (s)', 'Média (s)', 'Máximo (s)'])
@@ -0,0 +1,118 @@
+"""Módulo de detecção de mudanças, usado para pular carros cujos preços não mudaram desde a última coleta."""
+import os
+import json
+from time import time
+from hashlib import sha1
+from datetime import datetime
+
+
+# Entradas sem uma coleta completa há mais tempo que isso são descartadas, para o arquivo não crescer sem limite.
+DIAS_GUARDADOS = 30
+
+
+class Mudancas:
+    """Classe que guarda a última tabela de preços coletada de cada carro, junto com a impressão do cartão dele.
+
+    A impressão é um hash do texto do cartão do carro na página de listagem, que já mostra nome e preço. Se o cartão
+    não mudou e a última coleta completa do carro é mais nova que a idade máxima, as linhas guardadas são
+    reaproveitadas com a data atual, sem abrir a página do carro e percorrer todas as combinações de Km e período.
+
+    As tabelas são salvas em um .json ao lado do .csv do site.
+    """
+
+    def __init__(self, arquivo, idade_maxima=None):
+        """Inicializador da classe Mudancas.
+
+        Args:
+            arquivo (str): Caminho do .csv do site, as tabelas são salvas em <nome>.precos.json.
+            idade_maxima (float, opcional): Idade máxima, em horas, de uma tabela para ela ser reaproveitada.
+                Padrão é None, que sempre coleta tudo, mas continua guardando as tabelas para as próximas coletas.
+        """
+        self.arquivo = os.path.splitext(arquivo)[0] + '.precos.json'
+        self.idade_maxima = idade_maxima
+        self.precos = {}
+        self.reaproveitados = 0
+
+        if os.path.exists(self.arquivo):
+            with open(self.arquivo, encoding='utf-8') as f:
+                self.precos = json.load(f)
+
+
+    @staticmethod
+    def impressao(texto):
+        """Gera a impressão do texto do cartão de um carro, ignorando diferenças de espaços.
+
+        Returns:
+            str: Hash do texto, ou None se não houver texto.
+        """
+        if not texto:
+            return None
+        return sha1(' '.join(texto.split()).encode('utf-8')).hexdigest()
+
+
+    def reaproveitar(self, texto):
+        """Busca a tabela de preços guardada para o cartão, se ela puder ser reaproveitada.
+
+        Args:
+            texto (str): Texto do cartão do carro na página de listagem.
+
+        Returns:
+            list: Linhas guardadas com a data atual, ou None se o carro precisa ser coletado.
+        """
+        chave = self.impressao(texto)
+        if self.idade_maxima is None or chave not in self.precos:
+            return None
+
+        entrada = self.precos[chave]
+        if time() - entrada['coleta'] > self.idade_maxima*3600:
+            return None
+
+        self.reaproveitados += 1
+        data = datetime.now().strftime('%d/%m/%Y %H:%M')
+        return [dict(linha, Data=data) for linha in entrada['linhas']]
+
+
+    def idade(self, texto):
+        """Idade, em horas, da última coleta completa do carro com o cartão informado.
+
+        Returns:
+            float: Idade em horas, infinita se o carro é novo ou o cartão mudou.
+        """
+        entrada = self.precos.get(self.impressao(texto))
+        return float('inf') if entrada is None else (time() - entrada['coleta'])/3600
+
+
+    def priorizar(self, carros, cartoes):
+        """Ordena os carros para coletar primeiro os novos ou com o cartão mudado, e depois os de coleta mais antiga.
+
+        Args:
+            carros (list): Identificadores dos carros.
+            cartoes (dict): Texto do cartão de cada carro na listagem.
+
+        Returns:
+            list: Carros ordenados.
+        """
+        return sorted(carros, key=lambda carro: self.idade(cartoes.get(carro)), reverse=True)
+
+
+    def atualizar(self, texto, linhas):
+        """Guarda a tabela de preços de uma coleta completa do carro.
+
+        Args:
+            texto (str): Texto do cartão do carro na página de listagem.
+            linhas (list): Linhas coletadas do carro.
+        """
+        chave = self.impressao(texto)
+        if chave and linhas:
+            self.precos[chave] = {'nome': linhas[0]['Nome'], 'coleta': time(), 'linhas': linhas}
+
+
+    def salvar(self):
+        """Salva as tabelas em disco, descartando as muito antigas."""
+        limite = time() - DIAS_GUARDADOS*24*3600
+        self.precos = {chave: entrada for chave, entrada in self.precos.items() if entrada['coleta'] >= limite}
+
+        temporario = self.arquivo + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.precos, f)
+        os.replace(temporario, self.arquivo)
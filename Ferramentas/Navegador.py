@@ -0,0 +1,73 @@
+"""Módulo de criação dos navegadores usados pelos sites."""
+import selenium
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+
+# Tamanho fixo da janela, também usado sem interface gráfica, para os sites sempre mostrarem a versão para computador.
+LARGURA, ALTURA = 1920, 1080
+
+# Arquivos que não são usados na coleta, que só lê textos da página.
+EXTENSOES_BLOQUEADAS = ['png', 'jpg', 'jpeg', 'gif', 'webp', 'svg', 'ico', 'avif',
+                        'woff', 'woff2', 'ttf', 'otf', 'eot', 'mp4', 'webm', 'mp3', 'ogg']
+
+# Domínios de terceiros com análise de acessos, anúncios e chats, que também não são usados na coleta.
+DOMINIOS_BLOQUEADOS = ['google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googleadservices.com',
+                       'googlesyndication.com', 'facebook.net', 'facebook.com', 'connect.facebook.net', 'hotjar.com',
+                       'clarity.ms', 'tiktok.com', 'linkedin.com', 'bing.com', 'criteo.com', 'taboola.com', 'rdstation.com.br',
+                       'zendesk.com', 'zdassets.com', 'livechatinc.com', 'livechat-static.com', 'tawk.to', 'jivosite.com', 'omnichat.com.br', 'blip.ai',
+                       'onetrust.com', 'cookielaw.org', 'youtube.com', 'ytimg.com', 'fonts.googleapis.com', 'fonts.gstatic.com']
+
+
+def criar_navegador(headless=True, bloquear=True, dominios=None):
+    """Cria um navegador Chrome com as opções usadas por todos os sites.
+
+    Args:
+        headless (bool, opcional): Condição para abrir o navegador sem janela, que também funciona em servidores sem
+            interface gráfica. Padrão é True.
+        bloquear (bool, opcional): Condição para bloquear imagens, fontes, vídeos e domínios de terceiros. Padrão é True.
+        dominios (list, opcional): Domínios bloqueados além dos padrões.
+
+    Returns:
+        WebDriver: Navegador pronto para uso.
+    """
+    # Definindo quais opções serão usadas pelo navegador.
+    options = Options()
+    options.add_experimental_option('excludeSwitches', ['enable-logging'])  # Opção para ignorar erros de conexão com dispositivos.
+    options.add_argument(f'--window-size={LARGURA},{ALTURA}')  # Tamanho fixo, para evitar probemas de visualização.
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-dev-shm-usage')  # Evitando falhas em servidores com pouca memória compartilhada.
+    if headless:
+        options.add_argument('--headless=new')
+    if bloquear:
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+
+    navegador = selenium.webdriver.Chrome(service=Service('chromedriver.exe'), options=options)
+    if bloquear:
+        bloquear_recursos(navegador, DOMINIOS_BLOQUEADOS + list(dominios or []))
+    return navegador
+
+
+def bloquear_recursos(navegador, dominios):
+    """Bloqueia no navegador os arquivos e domínios que não são usados na coleta.
+
+    Args:
+        navegador (WebDriver): Navegador Chrome.
+        dominios (list): Domínios bloqueados.
+    """
+    urls = [f'*.{extensao}{final}' for extensao in EXTENSOES_BLOQUEADAS for final in ('', '?*')]  # Com ou sem parâmetros.
+    urls += [f'*{dominio}/*' for dominio in dominios]
+    navegador.urls_bloqueadas = urls  # Guardadas para serem aplicadas nas outras abas, usadas pelas Abas.
+    reaplicar_bloqueios(navegador)
+
+
+def reaplicar_bloqueios(navegador):
+    """Aplica na aba em uso os bloqueios do navegador, que pelo DevTools valem apenas para a aba em que foram feitos.
+
+    Args:
+        navegador (WebDriver): Navegador Chrome.
+    """
+    urls = getattr(navegador, 'urls_bloqueadas', None)
+    if urls:
+        navegador.execute_cdp_cmd('Network.enable', {})
+        navegador.execute_cdp_cmd('Network.setBlockedURLs', {'urls': urls})
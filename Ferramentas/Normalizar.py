@@ -0,0 +1,113 @@
+"""Módulo de normalização dos dados brutos coletados, que converte colunas inteiras de texto para número de uma vez.
+
+Os sites guardam Km, Meses e Valor como o texto lido da página, como '1.500 Km', '12 meses' ou 'R$ 2.345,67/mês',
+e a conversão é feita em lotes pelo Gravador, assim um texto fora do padrão não interrompe a coleta do carro.
+Km 'ilimitado' vira infinito, e não um valor inválido.
+
+Uso:
+    python -m Ferramentas.Normalizar <dados_site.bruto.csv> [--destino dados_site.csv] [--km-por-contrato]
+"""
+import os
+import argparse
+import numpy as np
+import pandas as pd
+
+
+# Número no formato brasileiro, com ponto separando os milhares e vírgula separando os decimais, ou um número
+# simples como '1000.5', que é como os números já convertidos voltam do .bruto.csv.
+NUMERO = r'\d{1,3}(?:\.\d{3})+(?:,\d+)?|\d+(?:[.,]\d+)?'
+MILHARES = r'\d{1,3}(?:\.\d{3})+'
+PRIMEIRO = rf'({NUMERO})'
+ULTIMO = rf'({NUMERO})(?!.*\d)'
+# Preço: o número depois do último 'R$', como em 'De R$ 100 por R$ 90,00/mês' ou 'R$ 2.345,67 /mês 12x', ou o
+# último número quando o texto não tem 'R$'.
+PRECO = rf'R\$\s*({NUMERO})(?!.*R\$)|{ULTIMO}'
+ILIMITADO = r'(?i)ilimitad'
+
+
+def converter(serie, padrao=PRIMEIRO):
+    """Converte uma coluna com textos e números em números.
+
+    Args:
+        serie (pd.Series): Coluna com os valores brutos.
+        padrao (str, opcional): Expressão do número procurado no texto, como PRIMEIRO ou PRECO. Com mais de um grupo,
+            é usado o primeiro grupo encontrado. Padrão é PRIMEIRO.
+
+    Returns:
+        tuple: Coluna convertida, com NaN nos valores que não puderam ser convertidos, e máscara desses valores.
+    """
+    textos = serie.map(type).eq(str)
+    valores = pd.to_numeric(serie.where(~textos), errors='coerce').astype(float)  # Valores que já são números.
+
+    texto = serie[textos].astype(str)
+    numeros = texto.str.extract(padrao, expand=True).bfill(axis=1).iloc[:, 0]
+    brasileiros = numeros.str.contains(',', regex=False, na=False) | numeros.str.fullmatch(MILHARES).fillna(False)
+    numeros = numeros.where(~brasileiros, numeros.str.replace('.', '', regex=False).str.replace(',', '.', regex=False))
+    valores[textos] = pd.to_numeric(numeros, errors='coerce')
+
+    # Valores vazios continuam vazios, sem serem marcados como inválidos.
+    vazios = serie.isna() | texto.str.strip().eq('').reindex(serie.index, fill_value=False)
+    return valores, valores.isna() & ~vazios
+
+
+def normalizar(dados, km_por_contrato=False):
+    """Converte as colunas Km, Meses e Valor dos dados brutos.
+
+    Args:
+        dados (pd.DataFrame): Dados brutos, com Km, Meses e Valor como texto ou número.
+        km_por_contrato (bool, opcional): Se o Km do site é o total do contrato e deve ser dividido pelos meses. Padrão é False.
+
+    Returns:
+        tuple: Dados com as colunas convertidas, mantendo as linhas com valores inválidos, e os dados brutos dessas
+            linhas com a coluna Invalidos listando as colunas que não puderam ser convertidas.
+    """
+    normalizados = dados.copy()
+    invalidos = pd.DataFrame(False, index=dados.index, columns=['Km', 'Meses', 'Valor'])
+    normalizados['Km'], invalidos['Km'] = converter(dados['Km'])
+    normalizados['Meses'], invalidos['Meses'] = converter(dados['Meses'])
+    normalizados['Valor'], invalidos['Valor'] = converter(dados['Valor'], PRECO)
+
+    # Km sem limite, como 'Ilimitado', fica como infinito.
+    ilimitados = dados['Km'].astype(str).str.contains(ILIMITADO) & invalidos['Km']
+    normalizados.loc[ilimitados, 'Km'] = np.inf
+    invalidos['Km'] &= ~ilimitados
+
+    if km_por_contrato:
+        normalizados['Km'] = normalizados['Km']/normalizados['Meses'].replace(0, np.nan)
+    normalizados['Meses'] = normalizados['Meses'].round().astype('Int64')  # Meses são inteiros, como na página.
+
+    linhas = invalidos.any(axis=1)
+    brutos = dados[linhas].copy()
+    brutos['Invalidos'] = invalidos[linhas].dot(invalidos.columns + ' ').str.strip()
+    return normalizados, brutos
+
+
+def normalizar_arquivo(bruto, destino=None, km_por_contrato=False):
+    """Refaz o .csv de um site a partir dos dados brutos, sem precisar coletar de novo.
+
+    Args:
+        bruto (str): Caminho do .bruto.csv gravado pelo Gravador.
+        destino (str, opcional): Caminho do .csv gerado. Padrão é o mesmo nome sem .bruto.
+        km_por_contrato (bool, opcional): Se o Km do site é o total do contrato. Padrão é False.
+
+    Returns:
+        tuple: Quantidade de linhas e de linhas com valores inválidos.
+    """
+    destino = destino or bruto.replace('.bruto.csv', '.csv')
+    dados, invalidos = normalizar(pd.read_csv(bruto, dtype=str, keep_default_na=False).replace('', np.nan),
+                                  km_por_contrato)
+    dados.to_csv(destino, index=False)
+    if not invalidos.empty:
+        invalidos.to_csv(os.path.splitext(destino)[0] + '.invalidos.csv', index=False)
+    return len(dados), len(invalidos)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Refaz o .csv de um site a partir dos dados brutos.')
+    parser.add_argument('bruto', help='Caminho do .bruto.csv.')
+    parser.add_argument('--destino', help='Caminho do .csv gerado.')
+    parser.add_argument('--km-por-contrato', action='store_true', help='Divide o Km pelos meses, como na Porto Seguro.')
+    argumentos = parser.parse_args()
+
+    total, invalidas = normalizar_arquivo(argumentos.bruto, argumentos.destino, argumentos.km_por_contrato)
+    print(f'Foram normalizadas {total} linhas, {invalidas} com valores inválidos')
@@ -0,0 +1,117 @@
+"""Módulo de busca assíncrona de páginas, usado para acessar as páginas dos carros ao mesmo tempo."""
+import random
+import asyncio
+import aiohttp
+from time import monotonic
+from urllib.parse import urlsplit
+
+
+class Pipeline:
+    """Classe que busca e processa uma lista de páginas de forma concorrente.
+
+    Qualquer site que consiga gerar a lista de links dos carros pode usá-la. As páginas são buscadas
+    com uma única sessão, que reaproveita as conexões, respeitando um limite de páginas ao mesmo tempo
+    e de requisições por segundo em cada host, com novas tentativas e espera crescente entre elas.
+    """
+
+    def __init__(self, processar, concorrencia=10, requisicoes_por_segundo=5, tentativas=3, espera_inicial=1, timeout=30,
+                 cache=None):
+        """Inicializador da classe Pipeline.
+
+        Args:
+            processar (callable): Função que recebe o link e o conteúdo da página e retorna o resultado dela.
+            concorrencia (int, opcional): Quantidade máxima de páginas buscadas ao mesmo tempo. Padrão é 10.
+            requisicoes_por_segundo (float, opcional): Limite de requisições por segundo em cada host. Padrão é 5.
+            tentativas (int, opcional): Quantidade de tentativas por página. Padrão é 3.
+            espera_inicial (float, opcional): Espera, em segundos, antes da segunda tentativa, dobrada a cada falha. Padrão é 1.
+            timeout (float, opcional): Tempo limite, em segundos, de cada requisição. Padrão é 30.
+            cache (Cache, opcional): Cache em disco das páginas, que são revalidadas com o site depois de vencidas.
+                Padrão é None, que sempre busca as páginas.
+        """
+        self.processar = processar
+        self.concorrencia = concorrencia
+        self.intervalo = 1/requisicoes_por_segundo if requisicoes_por_segundo else 0
+        self.tentativas = tentativas
+        self.espera_inicial = espera_inicial
+        self.timeout = timeout
+        self.cache = cache
+
+
+    async def _limitar(self, host):
+        """Espera a vez do host, garantindo o intervalo mínimo entre requisições a ele."""
+        async with self.travas.setdefault(host, asyncio.Lock()):
+            espera = self.ultimo.get(host, 0) + self.intervalo - monotonic()
+            if espera > 0:
+                await asyncio.sleep(espera)
+            self.ultimo[host] = monotonic()
+
+
+    async def _buscar(self, sessao, url):
+        """Busca uma página, tentando novamente em caso de falha.
+
+        Returns:
+            str: Conteúdo da página.
+        """
+        if self.cache is not None:
+            texto = self.cache.ler(url)
+            if texto is not None:
+                return texto
+
+        for tentativa in range(self.tentativas):
+            await self._limitar(urlsplit(url).netloc)
+            try:
+                cabecalhos = self.cache.cabecalhos(url) if self.cache is not None else None
+                async with sessao.get(url, headers=cabecalhos) as resposta:
+                    if resposta.status == 304 and self.cache is not None:  # A página não mudou desde a última busca.
+                        self.cache.renovar(url)
+                        return self.cache.ler(url, vencido=True)
+                    resposta.raise_for_status()
+                    texto = await resposta.text()
+                if self.cache is not None:
+                    self.cache.gravar(url, texto, resposta.headers.get('ETag'), resposta.headers.get('Last-Modified'))
+                return texto
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Erros do cliente, como página não encontrada, não mudam com uma nova tentativa.
+                definitivo = isinstance(e, aiohttp.ClientResponseError) and e.status < 500 and e.status != 429
+                if definitivo or tentativa == self.tentativas - 1:
+                    raise
+                # Espera crescente com uma variação aleatória, para as tentativas não chegarem todas juntas.
+                await asyncio.sleep(self.espera_inicial * 2**tentativa * random.uniform(.5, 1.5))
+
+
+    async def _tarefa(self, sessao, semaforo, url):
+        """Busca e processa uma página, respeitando o limite de concorrência."""
+        async with semaforo:
+            try:
+                texto = await self._buscar(sessao, url)
+            except Exception as e:
+                print(f'Falha ao acessar {url}: {e}')
+                return None
+
+        try:
+            return self.processar(url, texto)
+        except Exception as e:  # Uma página fora do padrão não deve interromper as outras.
+            print(f'Falha ao processar {url}: {e}')
+            return None
+
+
+    async def _executar(self, urls):
+        self.travas = {}
+        self.ultimo = {}
+        semaforo = asyncio.Semaphore(self.concorrencia)
+        conector = aiohttp.TCPConnector(limit=self.concorrencia)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=conector, timeout=timeout) as sessao:
+            return await asyncio.gather(*(self._tarefa(sessao, semaforo, url) for url in urls))
+
+
+    def executar(self, urls):
+        """Busca e processa todas as páginas.
+
+        Args:
+            urls (list): Lista com o link de todas as páginas.
+
+        Returns:
+            list: Resultado de cada página, na mesma ordem dos links, com None nas que falharam.
+        """
+        return asyncio.run(self._executar(urls))
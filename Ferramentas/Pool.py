@@ -0,0 +1,258 @@
+"""Módulo do pool de navegadores, que divide os carros de todos os sites entre vários navegadores."""
+from time import time
+from queue import Empty
+from multiprocessing import Process, Queue, Pipe, Value
+from Ferramentas.Gravador import Gravador
+from Ferramentas.Checkpoint import Checkpoint
+from Ferramentas.Mudancas import Mudancas
+from Ferramentas.Metricas import Metricas
+from Ferramentas.Falhas import ListaFalhas, Disjuntor
+from Ferramentas.Vigia import Vigia
+from Ferramentas.Servidor import trocar_base
+
+
+def _trabalhador(tarefas, resultados, avisos, disjuntores, headless=True, base=None, cache=None):
+    """Processo que mantém um navegador aberto e executa as tarefas da fila até receber None.
+
+    O navegador é vigiado por um Vigia compartilhado pelos sites, que o recicla entre os carros quando ele passa do
+    limite de carros ou de memória do site do próximo carro.
+
+    Antes de cada tarefa o processo avisa qual tarefa pegou, por um Pipe próprio, que grava o aviso na hora, ao
+    contrário da Queue. Assim a tarefa de um processo que encerra com falha, como ao não conseguir abrir o Chrome,
+    é conhecida e encerrada pelo PoolNavegadores, sem que os outros processos fiquem esperando por ela.
+
+    Args:
+        tarefas (Queue): Fila de tarefas ('listar', site, None) ou ('carro', site, (carro, feitos)).
+        resultados (Queue): Fila em que são devolvidos os carros listados e as linhas coletadas.
+        avisos (Connection): Ponta do Pipe em que é avisada cada tarefa iniciada, como ('carro', site, carro).
+        disjuntores (dict): Momento em que o disjuntor de cada site foi aberto, compartilhado pelos navegadores.
+        headless (bool, opcional): Condição para abrir o navegador sem janela. Padrão é True.
+        base (str, opcional): Protocolo e domínio usados no lugar dos sites reais, como o de um Servidor de páginas gravadas.
+        cache (str, opcional): Pasta do cache em disco das páginas, compartilhado pelos navegadores.
+    """
+    vigia = Vigia(headless)
+    sites = {}  # Uma instância de cada site por navegador, todas usando o mesmo navegador.
+    try:
+        while True:
+            tarefa = tarefas.get()
+            if tarefa is None:
+                break
+
+            tipo, site, carro = tarefa
+            avisos.send((tipo, site, carro[0] if tipo == 'carro' else None))
+            if site not in sites:
+                url = trocar_base(site.url, base) if base else None
+                sites[site] = site(url=url, vigia=vigia, cache=cache)
+                sites[site].disjuntor = Disjuntor(compartilhado=disjuntores[site.__name__])
+
+            metricas = sites[site].metricas
+            if tipo == 'listar':
+                try:
+                    sites[site].vigiar()
+                    with metricas.fase('listagem'):
+                        carros = sites[site].listar_carros()
+                except Exception as e:
+                    print(f'Falha ao listar os carros de {site.__name__}: {e}')
+                    metricas.contar('falhas_listagem')
+                    carros = []
+                resultados.put(('carros', site, (carros, sites[site].cartoes)))
+                continue
+
+            carro, feitos = carro
+            inteiro = not feitos  # Se o carro será coletado desde o início.
+            linhas = []
+            completo = sites[site].coletar_tentativas(carro, feitos, linhas.append)
+            resultados.put(('linhas', site, (carro, linhas, completo, completo and inteiro, sites[site].ultima_falha)))
+    finally:
+        # Devolvendo as métricas de cada site coletado por este navegador, com o uso de recursos dele, para serem juntadas.
+        vigia.fechar()
+        for instancia in sites.values():
+            instancia.metricas.navegadores = vigia.relatorio()
+        resultados.put(('metricas', None, {site: instancia.metricas.dados() for site, instancia in sites.items()}))
+
+
+class PoolNavegadores:
+    """Classe que distribui a coleta dos carros de vários sites entre N navegadores.
+
+    Cada navegador roda em um processo próprio e é reaproveitado entre os carros. Primeiro cada site lista os
+    seus carros, depois cada carro vira uma tarefa em uma fila única, assim os navegadores livres pegam carros de
+    qualquer site e o tempo total depende da quantidade de navegadores, não do maior site.
+    """
+
+    def __init__(self, sites, trabalhadores=4, retomar=False, idade_maxima=None, headless=True, base=None, refazer=False,
+                 cache=None):
+        """Inicializador da classe PoolNavegadores.
+
+        Args:
+            sites (list): Classes de web scraping dos sites.
+            trabalhadores (int, opcional): Quantidade de navegadores abertos ao mesmo tempo. Padrão é 4.
+            retomar (bool, opcional): Condição para continuar a última coleta interrompida, pulando o que já foi coletado. Padrão é False.
+            idade_maxima (float, opcional): Idade máxima, em horas, dos preços reaproveitados de carros sem mudanças.
+                Padrão é None, que sempre coleta todos os carros.
+            headless (bool, opcional): Condição para abrir os navegadores sem janela. Padrão é True.
+            base (str, opcional): Protocolo e domínio usados no lugar dos sites reais. Padrão é None, que usa os sites reais.
+            refazer (bool, opcional): Condição para coletar apenas os carros que falharam na última coleta. Padrão é False.
+            cache (str, opcional): Pasta do cache em disco das páginas. Padrão é None, que não usa o cache.
+        """
+        self.sites = sites
+        self.trabalhadores = trabalhadores
+        self.retomar = retomar
+        self.idade_maxima = idade_maxima
+        self.headless = headless
+        self.base = base
+        self.refazer = refazer
+        self.cache = cache
+
+
+    def run(self):
+        """Roda a coleta de todos os sites, gravando as linhas no .csv de cada um na medida em que chegam."""
+        tarefas, resultados = Queue(), Queue()
+        avisos = [Pipe(duplex=False) for _ in range(self.trabalhadores)]  # Tarefa iniciada por cada navegador.
+        disjuntores = {site.__name__: Value('d', 0.) for site in self.sites}  # Um disjuntor aberto pausa o site em todos.
+        processos = [Process(target=_trabalhador, args=(tarefas, resultados, emissor, disjuntores, self.headless, self.base,
+                                                         self.cache))
+                     for _, emissor in avisos]
+        for p in processos:
+            p.start()
+
+        for site in self.sites:
+            tarefas.put(('listar', site, None))
+
+        # Contando tarefas que ainda não voltaram, para saber quando a coleta terminou.
+        pendentes = len(self.sites)
+        continuar = self.retomar or self.refazer
+        checkpoints = {site: Checkpoint(site.arquivo, continuar=continuar) for site in self.sites}
+        gravadores = {site: Gravador(site.arquivo, continuar=continuar, ao_descarregar=checkpoints[site].salvar,
+                                     km_por_contrato=site.km_por_contrato)
+                      for site in self.sites}
+        falhas = {site: ListaFalhas(site.arquivo) for site in self.sites}
+        mudancas = {site: Mudancas(site.arquivo, self.idade_maxima) for site in self.sites}
+        metricas = {site: Metricas(site.__name__) for site in self.sites}
+        devolvidas = 0  # Quantidade de navegadores que já devolveram as métricas, o que fazem ao encerrar.
+        cartoes = {}
+        em_andamento = {}  # Última tarefa iniciada por cada navegador.
+        concluidas, perdidas = set(), set()
+        while pendentes:
+            for i, (receptor, _) in enumerate(avisos):
+                while receptor.poll():
+                    em_andamento[i] = receptor.recv()
+
+            try:
+                tipo, site, conteudo = resultados.get(timeout=1)
+            except Empty:
+                if not any(p.is_alive() for p in processos):  # Todos os navegadores falharam.
+                    break
+                # A tarefa de um navegador que encerrou com falha nunca vai voltar, então é encerrada aqui.
+                for i, p in enumerate(processos):
+                    tarefa = em_andamento.get(i)
+                    if not p.is_alive() and tarefa is not None and self.chave(tarefa) not in concluidas:
+                        del em_andamento[i]
+                        perdidas.add(self.chave(tarefa))
+                        pendentes -= 1
+                        self.perder(tarefa, cartoes, falhas, metricas)
+                continue
+
+            if tipo == 'metricas':  # Um navegador que falhou encerra antes do fim da coleta.
+                devolvidas += 1
+                for site, dados in conteudo.items():
+                    metricas[site].juntar(dados)
+                continue
+
+            chave = self.chave(('listar', site, None) if tipo == 'carros' else ('carro', site, conteudo[0]))
+            if chave in perdidas:  # Resultado que chegou depois de a tarefa ser encerrada como perdida.
+                continue
+            concluidas.add(chave)
+
+            pendentes -= 1
+            if tipo == 'carros':
+                carros, cartoes[site] = conteudo
+                print(f'Foram encontrados {len(carros)} carros em {site.__name__}')
+                if self.refazer:
+                    carros = falhas[site].filtrar(carros)
+                    print(f'Refazendo {len(carros)} carros de {site.__name__} que falharam na última coleta')
+                carros = mudancas[site].priorizar(carros, cartoes[site])
+                for carro in carros:
+                    # Carros já coletados em uma execução anterior não voltam para a fila.
+                    if checkpoints[site].concluido(carro):
+                        continue
+
+                    # Carros cujo cartão não mudou desde a última coleta têm os preços reaproveitados.
+                    linhas = mudancas[site].reaproveitar(cartoes[site].get(carro))
+                    if linhas is not None:
+                        for linha in linhas:
+                            gravadores[site].adicionar(linha)
+                        checkpoints[site].concluir(carro)
+                        continue
+
+                    tarefas.put(('carro', site, (carro, checkpoints[site].feitos(carro))))
+                    pendentes += 1
+            else:
+                carro, linhas, completo, inteiro, falha = conteudo
+                for linha in linhas:
+                    checkpoints[site].marcar(carro, linha)
+                    gravadores[site].adicionar(linha)
+                if completo:
+                    checkpoints[site].concluir(carro)
+                else:
+                    falhas[site].adicionar(carro, **falha)
+                if inteiro:
+                    mudancas[site].atualizar(cartoes[site].get(carro), linhas)
+
+        # Encerrando os navegadores e juntando as métricas de cada um.
+        for p in processos:
+            tarefas.put(None)
+        limite = time() + 30
+        while devolvidas < len(processos) and time() < limite:
+            try:
+                tipo, _, conteudo = resultados.get(timeout=1)
+            except Empty:  # Navegadores que encerraram com falha não devolvem as métricas.
+                if not any(p.is_alive() for p in processos):
+                    break
+                continue
+            if tipo == 'metricas':
+                devolvidas += 1
+                for site, dados in conteudo.items():
+                    metricas[site].juntar(dados)
+        for p in processos:
+            p.join()
+
+        for site, gravador in gravadores.items():
+            print(f'Foram reaproveitados os preços de {mudancas[site].reaproveitados} carros sem mudanças em {site.__name__}')
+            metricas[site].contar('reaproveitados', mudancas[site].reaproveitados)
+            mudancas[site].salvar()
+            falhas[site].salvar()
+            with metricas[site].fase('exportacao'):
+                gravador.fechar()
+            print(f'Foram exportadas {gravador.total} linhas de {site.__name__} em {site.arquivo}')
+            metricas[site].contar('valores_invalidos', gravador.total_invalidos)
+            metricas[site].salvar(site.arquivo)
+
+
+    @staticmethod
+    def chave(tarefa):
+        """Chave de uma tarefa ('listar', site, None) ou ('carro', site, carro), usada para saber se ela já voltou."""
+        tipo, site, carro = tarefa
+        return tipo, site.__name__, None if carro is None else Checkpoint.chave(carro)
+
+
+    @staticmethod
+    def perder(tarefa, cartoes, falhas, metricas):
+        """Encerra a tarefa de um navegador que encerrou com falha, sem os carros ou as linhas dela.
+
+        A listagem perdida fica sem carros, e o carro perdido vai para a lista de falhas, para ser refeito depois.
+
+        Args:
+            tarefa (tuple): Tarefa ('listar', site, None) ou ('carro', site, carro) que estava sendo executada.
+            cartoes (dict): Cartões dos carros listados de cada site.
+            falhas (dict): Lista de falhas de cada site.
+            metricas (dict): Métricas de cada site.
+        """
+        tipo, site, carro = tarefa
+        if tipo == 'listar':
+            print(f'O navegador que listava os carros de {site.__name__} encerrou com falha')
+            metricas[site].contar('falhas_listagem')
+            cartoes[site] = {}
+            return
+        print(f'O navegador que coletava o carro {carro} de {site.__name__} encerrou com falha')
+        metricas[site].contar('falhas_navegador')
+        falhas[site].adicionar(carro, 'navegador', 'o navegador encerrou durante a coleta')
@@ -0,0 +1,93 @@
+"""Módulo do servidor local que serve páginas gravadas dos sites.
+
+Permite rodar a coleta contra cópias gravadas das páginas, sem acessar os sites reais.
+"""
+import os
+import sys
+from threading import Thread
+from urllib.parse import urlsplit, urlunsplit
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Requisicoes(SimpleHTTPRequestHandler):
+    """Tratador de requisições que serve os arquivos gravados sem imprimir cada acesso."""
+
+    def log_message(self, *args):
+        pass
+
+
+class Servidor:
+    """Servidor HTTP local que serve uma pasta com páginas gravadas.
+
+    Cada endereço é servido a partir do arquivo com o mesmo caminho na pasta, ou do index.html da pasta
+    com esse caminho, assim https://site.com/veiculos/carro é gravado em <pasta>/veiculos/carro/index.html.
+
+    Pode ser usado com with, que inicia e encerra o servidor automaticamente.
+    """
+
+    def __init__(self, pasta, porta=0):
+        """Inicializador da classe Servidor.
+
+        Args:
+            pasta (str): Pasta com as páginas gravadas.
+            porta (int, opcional): Porta do servidor, 0 escolhe uma porta livre. Padrão é 0.
+        """
+        self.servidor = ThreadingHTTPServer(('127.0.0.1', porta), partial(_Requisicoes, directory=pasta))
+        self.url = f'http://127.0.0.1:{self.servidor.server_address[1]}'
+        self.thread = Thread(target=self.servidor.serve_forever, daemon=True)
+
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+
+    def __exit__(self, *args):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+
+def gravar(url, pasta, conteudo):
+    """Grava o conteúdo de uma página no caminho em que o Servidor irá procurá-la.
+
+    Args:
+        url (str): Endereço original da página.
+        pasta (str): Pasta das páginas gravadas.
+        conteudo (str): Conteúdo da página.
+
+    Returns:
+        str: Caminho do arquivo gravado.
+    """
+    caminho = urlsplit(url).path.strip('/')
+    arquivo = os.path.join(pasta, caminho, 'index.html')
+    os.makedirs(os.path.dirname(arquivo), exist_ok=True)
+    with open(arquivo, 'w', encoding='utf-8') as f:
+        f.write(conteudo)
+    return arquivo
+
+
+def trocar_base(url, base):
+    """Troca o protocolo e o domínio de um endereço, mantendo o caminho, usado para apontar um site para o Servidor.
+
+    Exemplo:
+        trocar_base('https://livre.unidas.com.br/carros', 'http://127.0.0.1:8000') retorna 'http://127.0.0.1:8000/carros'
+
+    Args:
+        url (str | list): Endereço original, ou lista de endereços.
+        base (str): Protocolo e domínio do novo endereço.
+
+    Returns:
+        str | list: Endereço com a nova base, ou lista de endereços.
+    """
+    if isinstance(url, (list, tuple)):
+        return [trocar_base(u, base) for u in url]
+    novo, original = urlsplit(base), urlsplit(url)
+    return urlunsplit((novo.scheme, novo.netloc, novo.path.rstrip('/') + original.path, original.query, original.fragment))
+
+
+if __name__ == '__main__':
+    # Uso: python -m Ferramentas.Servidor <pasta> [porta]
+    with Servidor(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 8000) as servidor:
+        print(f'Servindo {sys.argv[1]} em {servidor.url}')
+        servidor.thread.join()
@@ -0,0 +1,173 @@
+"""Módulo de vigilância dos navegadores, que acompanha a memória e a CPU de cada um e os recicla."""
+import psutil
+from time import time
+from collections import deque
+from selenium.common.exceptions import WebDriverException
+from Ferramentas.Navegador import criar_navegador
+
+
+# Valor padrão dos limites de motivo, que usa o limite do Vigia, já que None e 0 desligam o limite.
+DO_VIGIA = object()
+
+
+class Vigia:
+    """Classe que mantém um navegador e o troca por um novo quando ele fica pesado.
+
+    O Chrome aberto por horas acumula memória até a máquina usar a memória virtual ou o chromedriver parar de
+    responder. A memória e a CPU são medidas somando o chromedriver e todos os processos do Chrome abertos por ele,
+    e o navegador é reciclado, fechado e aberto de novo, depois de uma quantidade de páginas ou acima de um limite
+    de memória. A troca é feita entre dois carros, então os sites só precisam voltar à listagem no próximo carro.
+
+    Um Vigia pode ser compartilhado por vários sites que usam o mesmo navegador, como no PoolNavegadores, cada site
+    passa a usar o novo navegador na próxima vez que consultar o Vigia.
+    """
+
+    def __init__(self, headless=True, paginas_maximas=200, memoria_maxima=2048):
+        """Inicializador da classe Vigia, que já abre o navegador.
+
+        Args:
+            headless (bool, opcional): Condição para abrir os navegadores sem janela. Padrão é True.
+            paginas_maximas (int, opcional): Quantidade de carros abertos por um navegador antes de ele ser reciclado,
+                None não recicla por páginas. Padrão é 200.
+            memoria_maxima (float, opcional): Memória, em MB, a partir da qual o navegador é reciclado, None não recicla
+                por memória. Padrão é 2048.
+        """
+        self.headless = headless
+        self.paginas_maximas = paginas_maximas
+        self.memoria_maxima = memoria_maxima
+        self.relatorios = deque(maxlen=100)  # Uso de recursos dos últimos navegadores fechados.
+        self.navegador = None
+        self.abrir()
+
+
+    def abrir(self):
+        """Abre um novo navegador e zera as medições."""
+        self.navegador = criar_navegador(self.headless)
+        self.inicio = time()
+        self.paginas = 0
+        self.pico = 0.
+        self.tempos_cpu = {}  # Tempo de CPU de cada processo, guardado para não perder o dos processos já fechados.
+
+
+    def processos(self):
+        """Processos do navegador, o chromedriver e todos os processos abertos por ele.
+
+        Returns:
+            list: Lista de psutil.Process, vazia se o navegador já foi fechado.
+        """
+        try:
+            raiz = psutil.Process(self.navegador.service.process.pid)
+            return [raiz] + raiz.children(recursive=True)
+        except (AttributeError, psutil.Error):
+            return []
+
+
+    def uso(self):
+        """Mede o uso de recursos do navegador atual.
+
+        Returns:
+            dict: Memória residente somada, em MB, tempo de CPU acumulado, em segundos, quantidade de processos,
+                páginas abertas e pico de memória.
+        """
+        memoria, processos = 0, 0
+        for processo in self.processos():
+            try:
+                with processo.oneshot():
+                    memoria += processo.memory_info().rss
+                    tempos = processo.cpu_times()
+                self.tempos_cpu[processo.pid] = tempos.user + tempos.system
+                processos += 1
+            except psutil.Error:  # Processo fechado durante a medição, como uma aba do Chrome.
+                continue
+
+        memoria /= 2**20
+        self.pico = max(self.pico, memoria)
+        return {'memoria': round(memoria, 1), 'cpu': round(sum(self.tempos_cpu.values()), 1), 'processos': processos,
+                'paginas': self.paginas, 'pico': round(self.pico, 1)}
+
+
+    def contar(self):
+        """Conta um carro aberto pelo navegador atual."""
+        self.paginas += 1
+
+
+    def motivo(self, paginas_maximas=DO_VIGIA, memoria_maxima=DO_VIGIA):
+        """Verifica se o navegador deve ser reciclado.
+
+        Args:
+            paginas_maximas (int, opcional): Limite de páginas usado no lugar do limite do Vigia, None ou 0 não
+                recicla por páginas. Padrão é o limite do Vigia.
+            memoria_maxima (float, opcional): Limite de memória, em MB, usado no lugar do limite do Vigia, None ou 0
+                não recicla por memória. Padrão é o limite do Vigia.
+
+        Returns:
+            str: 'paginas' ou 'memoria', o limite que foi passado, ou None se o navegador pode continuar.
+        """
+        if paginas_maximas is DO_VIGIA:
+            paginas_maximas = self.paginas_maximas
+        if memoria_maxima is DO_VIGIA:
+            memoria_maxima = self.memoria_maxima
+        if paginas_maximas and self.paginas >= paginas_maximas:
+            return 'paginas'
+        if memoria_maxima and self.uso()['memoria'] >= memoria_maxima:
+            return 'memoria'
+        return None
+
+
+    def ativo(self):
+        """Verifica se o navegador ainda responde."""
+        if self.navegador is None:
+            return False
+        try:
+            self.navegador.current_url
+            return True
+        except WebDriverException:
+            return False
+
+
+    def fechar(self, motivo='fim'):
+        """Fecha o navegador atual e guarda o uso de recursos dele.
+
+        Args:
+            motivo (str, opcional): Motivo do fechamento, guardado no relatório. Padrão é 'fim'.
+        """
+        if self.navegador is None:
+            return
+        relatorio = self.uso()
+        relatorio.update(motivo=motivo, duracao=round(time() - self.inicio, 1))
+        self.relatorios.append(relatorio)
+        try:
+            self.navegador.quit()
+        except WebDriverException:
+            pass
+        self.navegador = None
+
+
+    def reciclar(self, motivo):
+        """Fecha o navegador atual e abre um novo.
+
+        Args:
+            motivo (str): Motivo da reciclagem, como 'paginas', 'memoria' ou 'falha'.
+
+        Returns:
+            WebDriver: Novo navegador.
+        """
+        relatorio = self.uso()
+        print(f'Reciclando o navegador por {motivo}, após {self.paginas} carros e com {relatorio["memoria"]} MB')
+        self.fechar(motivo)
+        self.abrir()
+        return self.navegador
+
+
+    def relatorio(self):
+        """Uso de recursos de todos os navegadores, os já fechados e o atual.
+
+        Returns:
+            list: Um dicionário por navegador com memória, pico, CPU, processos, páginas, duração e motivo do fechamento.
+        """
+        relatorios = list(self.relatorios)
+        if self.navegador is not None:
+            atual = self.uso()
+            atual.update(motivo=None, duracao=round(time() - self.inicio, 1))
+            relatorios.append(atual)
+        return relatorios
@@ -0,0 +1,537 @@
+"""Módulo base dos sites, com a descrição declarativa de cada site e o motor de coleta comum a todos eles."""
+import numpy as np
+from time import sleep
+from datetime import datetime
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import Select
+from Ferramentas.Espera import Espera
+from Ferramentas.Extrator import extrair, campo, respostas
+from Ferramentas.Checkpoint import Checkpoint
+from Ferramentas.Mudancas import Mudancas
+from Ferramentas.Gravador import Gravador
+from Ferramentas.Metricas import Metricas
+from Ferramentas.Falhas import Politica, Disjuntor, ListaFalhas, classificar
+from Ferramentas.Cache import Cache
+from Ferramentas.Vigia import Vigia
+from Ferramentas.Abas import Abas
+from Ferramentas.Pool import PoolNavegadores
+from Ferramentas import Http
+
+
+class Eixo:
+    """Descrição de uma lista de seleção de opções de Km ou período na página de um carro.
+
+    Args:
+        coluna (str): Coluna preenchida pela opção, 'Km' ou 'Meses'.
+        seletor (str): XPath do <select> da lista.
+        ler (callable, opcional): Função que recebe o texto da opção e os dados já lidos do carro e retorna o valor da
+            coluna. Padrão é manter o texto, que é convertido em número pelo Gravador.
+        pular (int, opcional): Quantidade de opções iniciais ignoradas, como 'Selecione'. Padrão é 0.
+        fixo (bool, opcional): Se as opções não mudam com a opção selecionada na lista anterior. Padrão é True.
+    """
+
+    def __init__(self, coluna, seletor, ler=None, pular=0, fixo=True):
+        self.coluna = coluna
+        self.seletor = seletor
+        self.ler = ler or (lambda texto, dados: texto)
+        self.pular = pular
+        self.fixo = fixo
+
+
+class Site:
+    """Classe base dos sites, que executa a coleta da mesma forma para todos eles.
+
+    Cada site é uma subclasse que implementa listar_carros e coletar_carro e se descreve nos atributos abaixo. O
+    resto da coleta, feita por run() ou pelo PoolNavegadores, é comum a todos os sites.
+
+    Attributes:
+        arquivo, url e locadora: Arquivo .csv gerado, página com os carros e nome salvo nas linhas.
+        timeout, intervalo e tentativas: Tempos de espera e quantidade máxima de tentativas de cada carro.
+        preco, nome e descricao: XPaths dos textos lidos na página do carro.
+        eixos: Listas de seleção de Km e período, da externa para a interna, percorridas por percorrer_eixos.
+        trecho_http: Trecho dos links de carros para a coleta por HTTP, None se não houver.
+        km_por_contrato: Se o Km do site é a franquia total do contrato, que o Gravador divide pelos meses.
+        matriz: Se a tabela de preços é procurada no estado da página do carro antes de percorrer as opções.
+        trecho_precos: Trecho do endereço das requisições com a tabela de preços, None não lê as requisições.
+        validade_cache: Tempo, em segundos, em que as páginas do site guardadas no cache são usadas.
+        paginas_por_navegador e memoria_navegador: Limites de carros e de memória, em MB, de um navegador antes de
+            ele ser reciclado pelo Vigia.
+    """
+    arquivo = None
+    url = None
+    locadora = None
+    timeout = 20
+    intervalo = .25
+    tentativas = 2
+    preco = None
+    nome = None
+    descricao = None
+    eixos = ()
+    trecho_http = None
+    km_por_contrato = False
+    matriz = True
+    trecho_precos = None
+    validade_cache = 12*3600
+    paginas_por_navegador = 200
+    memoria_navegador = 2048
+
+    def __init__(self, url=None, navegador=None, retomar=False, idade_maxima=None, headless=True, http=False, refazer=False,
+                 cache=None, vigia=None, abas=1):
+        """Inicializador dos sites, que apenas prepara a coleta, iniciada por run().
+
+        Args:
+            url (str | list, opcional): Endereço da página com os carros, usado para apontar para páginas gravadas.
+            navegador (WebDriver, opcional): Navegador já aberto a ser reaproveitado. Padrão é abrir um novo.
+            retomar (bool, opcional): Condição para continuar a última coleta interrompida, pulando o que já foi coletado. Padrão é False.
+            idade_maxima (float, opcional): Idade máxima, em horas, dos preços de um carro cujo cartão na listagem não mudou
+                para eles serem reaproveitados sem abrir o carro. Padrão é None, que sempre coleta todos os carros.
+            headless (bool, opcional): Condição para abrir o navegador sem janela. Padrão é True.
+            http (bool, opcional): Condição para coletar direto por HTTP, sem abrir o navegador, nos sites que suportam. Padrão é False.
+            refazer (bool, opcional): Condição para coletar apenas os carros que falharam na última coleta, adicionando
+                as linhas ao .csv dela. Padrão é False.
+            cache (str, opcional): Pasta do cache em disco das páginas, em que as páginas de carros com a tabela de
+                preços e as páginas buscadas por HTTP são guardadas e reaproveitadas. Padrão é None, que não usa o cache.
+            vigia (Vigia, opcional): Vigia de um navegador compartilhado, que o recicla entre os carros. Padrão é um
+                Vigia próprio quando nenhum navegador é informado.
+            abas (int, opcional): Quantidade de abas de carros. Com mais de uma, as páginas dos próximos carros
+                identificados pelo link carregam em segundo plano enquanto o carro atual é lido. Padrão é 1.
+        """
+        self.url = url or self.url
+        self.retomar = retomar
+        self.idade_maxima = idade_maxima
+        self.refazer = refazer
+        self.politica = Politica(self.tentativas)  # Novas tentativas e espera entre elas.
+        self.disjuntor = Disjuntor()  # Interrompe a coleta quando a maioria das últimas tentativas falha.
+        self.ultima_falha = None  # Tipo, mensagem e tentativas da última falha de coletar_tentativas.
+        self.carro_atual = None  # Identificador do carro em coleta, que é a chave da página dele no cache.
+        self.cache = Cache(cache, ttl=self.validade_cache) if cache else None
+        self.http = http and self.suporta_http()
+        self.cartoes = {}  # Texto do cartão de cada carro na listagem, usado para detectar mudanças.
+        self.metricas = Metricas(self.__class__.__name__)  # Tempos das etapas e contadores de falhas.
+        self.vigia = None
+        self.quantidade_abas = abas
+        self.abas = None
+
+        if not self.http:
+            # Navegadores recebidos, sozinhos ou com um Vigia, continuam abertos ao fim da coleta.
+            self.navegador_proprio = navegador is None and vigia is None
+            if self.navegador_proprio:
+                vigia = Vigia(headless, self.paginas_por_navegador, self.memoria_navegador)
+            self.vigia = vigia
+            self.trocar_navegador(vigia.navegador if vigia is not None else navegador)
+
+
+    def trocar_navegador(self, navegador):
+        """Passa a usar outro navegador, como o aberto pelo Vigia ao reciclar o anterior."""
+        self.navegador = navegador
+        self.espera = Espera(self.navegador, timeout=self.timeout, intervalo=self.intervalo, metricas=self.metricas)
+        self.abas = Abas(navegador, self.quantidade_abas) if self.quantidade_abas > 1 else None
+        self.restaurar()
+
+
+    def abrir(self, link):
+        """Abre a página de um carro pelo link, na aba em que ela já foi carregada quando são usadas várias abas."""
+        if self.abas is None:
+            self.navegador.get(link)
+        elif self.abas.abrir(link):
+            self.metricas.contar('abas_carregadas')
+
+
+    def preparar(self, carros):
+        """Carrega em segundo plano as páginas dos próximos carros identificados pelo link, quando são usadas várias abas.
+
+        Args:
+            carros (list): Próximos carros a serem coletados, na ordem.
+        """
+        if self.abas is not None:
+            self.abas.preparar([carro for carro in carros if isinstance(carro, str)])
+
+
+    def restaurar(self):
+        """Desfaz o estado ligado ao navegador anterior, como avisos já fechados ou a listagem aberta.
+
+        Chamado a cada troca de navegador, os sites que guardam esse estado o apagam aqui, assim o próximo carro
+        volta à listagem e fecha os avisos no navegador novo.
+        """
+
+
+    def vigiar(self):
+        """Troca o navegador antes do próximo carro quando ele passou do limite de carros ou de memória."""
+        if self.vigia is None:
+            return
+        motivo = self.vigia.motivo(self.paginas_por_navegador, self.memoria_navegador)
+        if motivo is not None:
+            self.metricas.contar('reciclagens')
+            self.metricas.contar(f'reciclagens_{motivo}')
+            self.vigia.reciclar(motivo)
+        if self.navegador is not self.vigia.navegador:  # Também reciclado por outro site que usa o mesmo Vigia.
+            self.trocar_navegador(self.vigia.navegador)
+        self.vigia.contar()
+
+
+    def contornar(self, erro):
+        """Conta uma falha tratada dentro do site, como um aviso que não apareceu ou uma lista com outro id, pelo tipo.
+
+        Args:
+            erro (Exception): Exceção tratada, classificada como as falhas de coletar_tentativas.
+        """
+        self.metricas.contar('contornadas')
+        self.metricas.contar(f'contornadas_{classificar(erro)}')
+
+
+    @classmethod
+    def suporta_http(cls):
+        """Verifica se o site pode ser coletado por HTTP, sem o navegador."""
+        return cls.trecho_http is not None
+
+
+    @property
+    def enderecos(self):
+        """Lista com os endereços das páginas de carros do site."""
+        return self.url if isinstance(self.url, (list, tuple)) else [self.url]
+
+
+    def run(self):
+        """Realiza toda a coleta do site."""
+        print(f'Iniciando coleta em {self.locadora}' + (' por HTTP' if self.http else ''))
+        if self.http:
+            self.get_data_http()
+        else:
+            self.get_data()
+
+
+    def listar_carros(self):
+        """Lista os carros disponíveis no site e guarda o texto do cartão de cada um em self.cartoes.
+
+        Returns:
+            list: Identificadores dos carros, usados em coletar_carro.
+        """
+        raise NotImplementedError
+
+
+    def coletar_carro(self, carro, feitos=()):
+        """Realiza a coleta dos dados na pagina de um carro, os sites com eixos podem usar percorrer_eixos.
+
+        Args:
+            carro (object): Identificador do carro retornado por listar_carros.
+            feitos (set, opcional): Combinações (Km, Meses) já coletadas, que serão puladas.
+
+        Yields:
+            dict: Dados de cada combinação de Km e período, na medida em que são coletados.
+        """
+        raise NotImplementedError
+
+
+    def dados_carro(self, **dados):
+        """Cria os dados de uma linha com todas as colunas, as não informadas ficam como NaN."""
+        linha = {'Nome':np.nan, 'Data':np.nan, 'Locadora':self.locadora, 'Km':np.nan, 'Meses':np.nan, 'Valor':np.nan, 'Descricao':np.nan}
+        linha.update(dados)
+        return linha
+
+
+    def linha(self, dados_carro, valor, descricao=np.nan):
+        """Completa os dados do carro com o preço, a descrição e a data da coleta.
+
+        Args:
+            dados_carro (dict): Dados do carro com Nome, Km e Meses.
+            valor (str | float): Texto do preço, como 'R$ 2.345,67/mês', que é convertido em número pelo Gravador.
+            descricao (str, opcional): Descrição de pagamento. Padrão é NaN.
+
+        Returns:
+            dict: Cópia dos dados, pronta para ser gravada.
+        """
+        return dict(dados_carro, Valor=np.nan if valor is None else valor, Descricao=np.nan if descricao is None else descricao,
+                    Data=datetime.now().strftime('%d/%m/%Y %H:%M'))
+
+
+    def ler_matriz(self, dados_carro, feitos=()):
+        """Lê todas as combinações de Km e período de uma vez, sem interagir com a página do carro já aberta.
+
+        Os preços são procurados no estado que o site embute na página (Next.js, Angular ou JSON) e, se não
+        estiverem nele, nas respostas JSON das requisições da tabela de preços, as que contêm trecho_precos. Apenas
+        as ofertas do objeto com o nome do carro aberto são usadas, já que o estado de uma página navegada dentro do
+        site ainda pode ter a listagem, e sem elas as opções são percorridas.
+
+        Args:
+            dados_carro (dict): Dados do carro, com o nome já preenchido.
+            feitos (set, opcional): Combinações (Km, Meses) já coletadas, que serão puladas.
+
+        Returns:
+            list: Linhas das combinações ainda não coletadas, ou None se a página não expõe a tabela de preços,
+                quando as opções devem ser percorridas.
+        """
+        if not self.matriz:
+            return None
+
+        with self.metricas.fase('matriz'):
+            pagina = self.navegador.page_source
+            linhas = Http.filtrar_carro(Http.ler_carro(pagina, self.locadora), dados_carro['Nome'])
+            if linhas and self.cache is not None and isinstance(self.carro_atual, str):
+                # Guardando a página com a tabela pelo link do carro, o mesmo usado por ler_cache nas próximas coletas,
+                # já que o endereço aberto pode ter sido redirecionado ou trocado.
+                self.cache.gravar(self.carro_atual, pagina, dados={'nome': dados_carro['Nome']})
+            if not linhas and self.trecho_precos:
+                for texto in respostas(self.navegador, self.trecho_precos):
+                    linhas.extend(Http.ler_carro(texto, self.locadora))
+                linhas = Http.filtrar_carro(linhas, dados_carro['Nome'])
+        if not linhas:
+            return None
+
+        self.metricas.contar('matrizes')
+        return self.combinacoes_unicas(linhas, dados_carro['Nome'], feitos)
+
+
+    @staticmethod
+    def combinacoes_unicas(linhas, nome, feitos=()):
+        """Mantém o nome lido na página e uma linha por combinação (Km, Meses), sem as já coletadas."""
+        unicas = {}
+        for linha in linhas:
+            unicas.setdefault((linha['Km'], linha['Meses']), dict(linha, Nome=nome))
+        return [linha for combinacao, linha in unicas.items() if combinacao not in feitos]
+
+
+    def ler_cache(self, carro, feitos=()):
+        """Lê a tabela de preços do carro da página guardada no cache, sem abrir o navegador.
+
+        Args:
+            carro (object): Identificador do carro, apenas carros identificados pelo link podem estar no cache.
+            feitos (set, opcional): Combinações (Km, Meses) já coletadas, que serão puladas.
+
+        Returns:
+            list: Linhas das combinações ainda não coletadas, ou None se a página não está no cache ou está vencida.
+        """
+        if self.cache is None or not isinstance(carro, str):
+            return None
+        pagina = self.cache.ler(carro)
+        if pagina is None:
+            return None
+
+        nome = self.cache.dados(carro).get('nome')
+        linhas = Http.filtrar_carro(Http.ler_carro(pagina, self.locadora), nome)
+        if not linhas:
+            return None
+        self.metricas.contar('cache')
+        return self.combinacoes_unicas(linhas, nome, feitos)
+
+
+    def percorrer_eixos(self, dados_carro, feitos=()):
+        """Percorre todas as combinações das duas listas de seleção do site, lendo o preço de cada uma.
+
+        Se as opções da lista interna não mudam, as opções da lista externa com todas as combinações já coletadas
+        nem são selecionadas.
+
+        Args:
+            dados_carro (dict): Dados do carro, com o nome já preenchido.
+            feitos (set, opcional): Combinações (Km, Meses) já coletadas, que serão puladas.
+
+        Yields:
+            dict: Dados de cada combinação de Km e período.
+        """
+        # Lendo todos os preços de uma vez quando a página expõe a tabela, sem percorrer as listas.
+        linhas = self.ler_matriz(dados_carro, feitos)
+        if linhas is not None:
+            yield from linhas
+            return
+
+        externo, interno = self.eixos
+        lista_externa = Select(self.espera.elemento(By.XPATH, externo.seletor))
+        if interno.fixo:  # Listas que mudam com a opção externa só são lidas depois dela ser selecionada.
+            lista_interna = Select(self.espera.elemento(By.XPATH, interno.seletor))
+        opcoes = extrair(self.navegador, externas=campo(f'{externo.seletor}/option', todos=True),
+                         internas=campo(f'{interno.seletor}/option', todos=True))
+
+        for opcao_externa in opcoes['externas'][externo.pular:]:
+            dados_carro[externo.coluna] = externo.ler(opcao_externa, dados_carro)
+
+            # Pulando a opção quando todas as combinações dela já foram coletadas.
+            if interno.fixo:
+                pendentes = [opcao for opcao in opcoes['internas'][interno.pular:]
+                             if self.combinacao(dados_carro, interno, opcao) not in feitos]
+                if not pendentes:
+                    continue
+
+            # Selecioando opção da lista externa e esperando o preço ser atualizado.
+            self.espera.texto_apos(lambda: lista_externa.select_by_visible_text(opcao_externa), By.XPATH, self.preco)
+
+            # Lendo de novo a lista interna e as opções dela quando elas mudam com a opção externa.
+            if not interno.fixo:
+                atual = extrair(self.navegador, lista=campo(interno.seletor, 'elemento'),
+                                opcoes=campo(f'{interno.seletor}/option', todos=True))
+                lista_interna = Select(atual['lista'])
+                pendentes = [opcao for opcao in atual['opcoes'][interno.pular:]
+                             if self.combinacao(dados_carro, interno, opcao) not in feitos]
+
+            for opcao_interna in pendentes:
+                dados_carro[interno.coluna] = interno.ler(opcao_interna, dados_carro)
+
+                # Selecioando opção da lista interna e esperando o preço ser atualizado.
+                preco = self.espera.texto_apos(lambda: lista_interna.select_by_visible_text(opcao_interna), By.XPATH, self.preco)
+                descricao = self.espera.texto(By.XPATH, self.descricao) if self.descricao else np.nan
+                yield self.linha(dados_carro, preco, descricao)
+
+
+    @staticmethod
+    def combinacao(dados_carro, eixo, opcao):
+        """Combinação (Km, Meses) resultante de selecionar a opção do eixo."""
+        dados = dict(dados_carro, **{eixo.coluna: eixo.ler(opcao, dados_carro)})
+        return (dados['Km'], dados['Meses'])
+
+
+    def coletar_tentativas(self, carro, feitos, ao_coletar):
+        """Coleta um carro seguindo a política de tentativas do site, cada nova tentativa pula o que as anteriores já coletaram.
+
+        Cada falha é classificada e contada pelo tipo. Apenas os tipos que podem passar em uma nova tentativa são
+        repetidos, depois de uma espera crescente, e com o disjuntor aberto o carro nem é tentado.
+
+        Args:
+            carro (object): Identificador do carro.
+            feitos (set): Combinações (Km, Meses) já coletadas antes.
+            ao_coletar (callable): Função chamada com cada linha coletada.
+
+        Returns:
+            bool: True se o carro foi coletado por completo, caso contrário a falha fica em self.ultima_falha.
+        """
+        feitos = set(feitos)
+        self.ultima_falha = None
+        self.carro_atual = carro
+
+        # Carros com a página guardada no cache dentro da validade não abrem o navegador.
+        linhas = self.ler_cache(carro, feitos)
+        if linhas is not None:
+            for linha in linhas:
+                ao_coletar(linha)
+            return True
+
+        tentativa = 0
+        while True:
+            if not self.disjuntor.liberado():
+                self.ultima_falha = {'tipo': 'disjuntor', 'tentativas': tentativa}
+                self.metricas.contar('falhas_disjuntor')
+                return False
+
+            self.vigiar()
+            try:
+                with self.metricas.carro(carro):
+                    for linha in self.coletar_carro(carro, set(feitos)):
+                        feitos.add((linha['Km'], linha['Meses']))
+                        ao_coletar(linha)
+                self.disjuntor.registrar(True)
+                return True
+            except Exception as e:
+                tipo = classificar(e)
+                self.disjuntor.registrar(False)
+                self.metricas.contar(f'falhas_{tipo}')
+                self.ultima_falha = {'tipo': tipo, 'erro': repr(e)[:500], 'tentativas': tentativa + 1}
+
+                # Falhas com uma nova tentativa pela frente são contadas como tentativas.
+                # Navegador que parou de responder é trocado por um novo, que é usado na nova tentativa ou no próximo carro.
+                if tipo == 'navegador' and self.vigia is not None and not self.vigia.ativo():
+                    self.metricas.contar('reciclagens')
+                    self.metricas.contar('reciclagens_falha')
+                    self.vigia.reciclar('falha')
+
+                if not self.politica.repetir(tipo, tentativa):
+                    self.metricas.contar('falhas')
+                    return False
+                self.metricas.contar('tentativas')
+                sleep(self.politica.espera(tentativa))
+                tentativa += 1
+
+
+    def get_data(self):
+        """Realiza a coleta dos dados nas paginas dos carros."""
+        self.checkpoint = Checkpoint(self.arquivo, continuar=self.retomar or self.refazer)
+        self.gravador = Gravador(self.arquivo, continuar=self.retomar or self.refazer, ao_descarregar=self.checkpoint.salvar,
+                                 km_por_contrato=self.km_por_contrato)
+        self.mudancas = Mudancas(self.arquivo, self.idade_maxima)
+        self.falhas = ListaFalhas(self.arquivo)
+        with self.metricas.fase('listagem'):
+            carros = self.listar_carros()
+        if self.refazer:
+            carros = self.falhas.filtrar(carros)
+            print(f'Refazendo {len(carros)} carros que falharam na última coleta')
+        carros = self.mudancas.priorizar(carros, self.cartoes)
+
+        print('Coletando dados...')
+        for i, carro in enumerate(carros):
+            if self.checkpoint.concluido(carro):
+                continue
+
+            # Reaproveitando os preços de carros cujo cartão não mudou desde a última coleta.
+            linhas = self.mudancas.reaproveitar(self.cartoes.get(carro))
+            if linhas is not None:
+                for linha in linhas:
+                    self.gravador.adicionar(linha)
+                self.checkpoint.concluir(carro)
+                continue
+
+            # Carregando os próximos carros em outras abas enquanto este é coletado.
+            self.preparar([proximo for proximo in carros[i + 1:i + self.quantidade_abas]
+                           if not self.checkpoint.concluido(proximo)])
+            feitos, linhas = self.checkpoint.feitos(carro), []
+
+            def guardar(linha):
+                self.checkpoint.marcar(carro, linha)
+                self.gravador.adicionar(linha)
+                linhas.append(linha)
+
+            if self.coletar_tentativas(carro, feitos, guardar):
+                self.checkpoint.concluir(carro)
+                # Apenas uma coleta completa do carro é guardada para ser reaproveitada.
+                if not feitos:
+                    self.mudancas.atualizar(self.cartoes.get(carro), linhas)
+            else:
+                self.falhas.adicionar(carro, **self.ultima_falha)
+
+        print(f'Coleta do site {", ".join(self.enderecos)} finalizada')
+        print(f'Foram reaproveitados os preços de {self.mudancas.reaproveitados} carros sem mudanças')
+        self.metricas.contar('reaproveitados', self.mudancas.reaproveitados)
+        self.mudancas.salvar()
+        self.falhas.salvar()
+        if self.navegador_proprio:
+            self.vigia.fechar()
+        self.export_data()
+
+
+    def get_data_http(self):
+        """Realiza a coleta dos dados direto pelas páginas dos carros, sem o navegador."""
+        self.gravador = Gravador(self.arquivo, km_por_contrato=self.km_por_contrato)
+        with self.metricas.fase('http'):
+            for url in self.enderecos:
+                for linha in Http.coletar(url, self.trecho_http, self.locadora, cache=self.cache):
+                    self.gravador.adicionar(linha)
+
+        print(f'Coleta do site {", ".join(self.enderecos)} finalizada')
+        self.export_data()
+
+
+    def export_data(self):
+        """Gravando as últimas linhas coletadas no .csv e no Parquet."""
+        with self.metricas.fase('exportacao'):
+            self.gravador.fechar()
+        print(f'Foram exportadas {self.gravador.total} linhas em {self.arquivo}')
+        if self.vigia is not None:
+            self.metricas.navegadores = self.vigia.relatorio()
+        if self.gravador.total_invalidos:
+            print(f'{self.gravador.total_invalidos} linhas têm valores que não puderam ser convertidos, em {self.gravador.invalidos}')
+        self.metricas.contar('valores_invalidos', self.gravador.total_invalidos)
+        self.metricas.salvar(self.arquivo)
+
+
+def coletar(site, processos=1, base=None, **argumentos):
+    """Cria o site e realiza toda a coleta, usado como alvo dos processos.
+
+    Com mais de um processo, os carros do site são listados uma vez e divididos entre os navegadores de um
+    PoolNavegadores só deste site, que grava tudo no .csv do site.
+
+    Args:
+        site (class): Classe do site.
+        processos (int, opcional): Quantidade de navegadores que dividem os carros do site. Padrão é 1.
+        base (str, opcional): Protocolo e domínio usados no lugar do site real pelos navegadores do pool.
+        **argumentos: Argumentos da classe do site.
+    """
+    if processos > 1 and not (argumentos.get('http') and site.suporta_http()):
+        PoolNavegadores([site], processos, argumentos.get('retomar', False), argumentos.get('idade_maxima'),
+                        argumentos.get('headless', True), base, argumentos.get('refazer', False), argumentos.get('cache')).run()
+    else:
+        site(**argumentos).run()
@@ -1,39 +1,41 @@
 """Módulo de web scraping dos sites https://www.meuflua.com.br/jeep e https://www.meuflua.com.br/fiat."""
-import selenium
-import numpy as np
-import pandas as pd
-from time import sleep
-from datetime import datetime
+from urllib.parse import urljoin
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import ElementNotInteractableException
+from Ferramentas.Extrator import extrair, campo, classe
+from Ferramentas.Falhas import ERROS_PAGINA
+from Sites.Base import Site, coletar
 
 
 
-class Flua:
+class Flua(Site):
     """Classe de web scraping do site https://www.meuflua.com.br/jeep e https://www.meuflua.com.br/fiat.
 
     Realiza a coleta de dados de nome, url, Km, periodo de contrato, preço e data de coleta dos dados, 
     de todos os carros presentes no link, com esses dados é gerados arquivos .csv.
 
-    Durante a execução não minimizar ou fechar a janela do navegador que será aberta.
+    Por padrão o navegador é aberto sem janela, com headless=False ele é aberto com janela, que não deve ser fechada durante a execução.
     """
+    arquivo = 'dados_flua.csv'
+    url = ['https://www.meuflua.com.br/jeep', 'https://www.meuflua.com.br/fiat']
 
-    def __init__(self):
-        """Inicializador da classe Unidas."""
-        self.url = ['https://www.meuflua.com.br/jeep', 'https://www.meuflua.com.br/fiat']
+    locadora = 'Flua'
+    timeout, intervalo = 15, .2  # Tempos de espera usados neste site.
+    preco = '//div[@class="offer-info__price"]/h3'
+    nome = '//div[@class="offer-header no-label"]/h3'
 
-        # Definindo quais opções serão usadas pelo navegador.
-        options = Options()
-        options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        
-        self.dataframe = pd.DataFrame(columns=['Nome', 'Data', 'Locadora', 'Km', 'Meses', 'Valor', 'Descricao'])
-        self.navegador = selenium.webdriver.Chrome(service=Service('chromedriver.exe'), options=options)
+    def __init__(self, *args, **kwargs):
+        """Inicializador da classe Flua, recebe os mesmos argumentos de Site."""
+        super().__init__(*args, **kwargs)
+        self.botao_carro = '//*[contains(text(), "EU QUERO ESTE")]'
+        self.listagem = None  # Página de carros aberta no momento.
 
-        print('Iniciando coleta em Flua')
-        self.get_data()
+
+    def restaurar(self):
+        """Um navegador novo não tem nenhuma página de carros aberta."""
+        self.listagem = None
 
     def load_all(self):
         """Carrega todos os carros disponíveis na página."""
@@ -42,92 +44,144 @@ class Flua:
         try:
             bnt = self.navegador.find_elements(By.XPATH, '//*[contains(text(), "Fechar")]')[-1]
             bnt.click()
-        except:
-            pass
+        except (IndexError, ElementNotInteractableException, *ERROS_PAGINA) as e:  # Aviso que nem sempre aparece.
+            self.contornar(e)
 
         # Procurando botão de ver mais
-        bnt = self.navegador.find_elements(By.XPATH, '//*[contains(text(), "VER MAIS")]')[-1]
+        bnt = self.espera.elementos(By.XPATH, '//*[contains(text(), "VER MAIS")]')[-1]
         # Descendo até ele
         self.navegador.execute_script('window.scrollTo(0,document.body.scrollHeight)')
-        bnt.click()
-        sleep(1)
+        quantidade = len(self.navegador.find_elements(By.XPATH, self.botao_carro))
+        self.espera.clicavel(bnt).click()
+        self.espera.quantidade_mudou(By.XPATH, self.botao_carro, quantidade)
         # Descendo até o fim da pagina para carregá-la
         self.navegador.execute_script('window.scrollTo(0,document.body.scrollHeight)')
-        sleep(1)
+        self.espera.rede_ociosa()
+
 
+    def pagina_inicial(self, end):
+        """Acessa uma das páginas de carros e carrega todos eles.
 
-    def get_data(self):
-        """Realiza a coleta dos dados nas paginas dos carros."""
-        for end in self.url:
+        Args:
+            end (str): Endereço da página.
+        """
+        with self.metricas.fase('pagina'):
             self.navegador.get(end)  # Acessando os sites da lista.
-            sleep(10)
+            self.espera.elementos(By.XPATH, self.botao_carro)
 
+        with self.metricas.fase('load_all'):
             self.load_all()
+        self.listagem = end
 
-            # Procurando botões para acessar os carros.
-            carros =  self.navegador.find_elements(By.XPATH, '//*[contains(text(), "EU QUERO ESTE")]')
-            print(f'Foram encontrados {len(carros)} carros em {end}')
-
-            print('Coletando dados...')
-            for car in carros:
-                try:
-                    ActionChains(self.navegador).move_to_element(car).perform()  # Move o mouse para o carro.
-                    sleep(.5)
-                    car.click()
-                    sleep(1)
-                    # Procurando botão para voltar para a página anterior.
-                    bnt_voltar =  self.navegador.find_element(By.XPATH, '//*[contains(text(), "Voltar")]')
-
-                    dados_carro = {'Nome':np.nan, 'Data':np.nan, 'Locadora':'Flua', 'Km':np.nan, 'Meses':np.nan, 'Valor':np.nan, 'Descricao':np.nan}
-
-                    dados_carro['Nome'] = self.navegador.find_element(By.XPATH, '//div[@class="offer-header no-label"]/h3').text
-
-                    # Pegando opçoes de periodo
-                    meses = self.navegador.find_elements(By.CLASS_NAME, 'monthly-plans__item')
-                    for mes in meses:
-                        mes.click()
-                        sleep(1)
-                        dados_carro['Meses'] = int(mes.text.split('\n')[0])
 
-                        # Pegando slider de seleção de Km
-                        slider = self.navegador.find_element(By.XPATH, '//input[@type="range"]')
-                        kms = self.navegador.find_element(By.CLASS_NAME, 'hub-input-range')
+    def listar_carros(self):
+        """Lista os carros disponíveis nos sites.
 
-                        # Colocando slider na primeira posição.
-                        for i in range(5):
-                            slider.send_keys(Keys.LEFT)
+        Os cartões com link são identificados por ele e abertos direto em coletar_carro, sem voltar à listagem.
 
-                        for km in kms.text.split('\n'):
-                            dados_carro['Km'] = int(km.replace(' Km', ''))
+        Returns:
+            list: Lista com o link de cada carro ou uma tupla com o endereço da página e a posição do carro nela.
+        """
+        cartao = './ancestor::*[contains(@class, "card")][1]'
+        link = '(./ancestor-or-self::a | ./ancestor::*[contains(@class, "card")][1]//a)[@href and not(starts-with(@href, "#"))]/@href'
+        lista = []
+        for end in self.enderecos:
+            self.pagina_inicial(end)
 
-                            # Formatando preço para se tornar um numero to tipo float.
-                            preco = self.navegador.find_element(By.XPATH, '//div[@class="offer-info__price"]/h3').text
-                            numeros = float(preco.replace('R$', '').replace('.', '').replace(',', '.'))
-                            dados_carro['Valor'] = numeros
-
-                            # Salvando data da coleta e todos os outros dados.
-                            dados_carro['Data'] = datetime.now().strftime('%d/%m/%Y %H:%M')
-                            self.dataframe.loc[len(self.dataframe)] = dados_carro
-
-                            # Deslizando slider para a proxima posição.
-                            slider.send_keys(Keys.RIGHT)
-                            sleep(1)
-                except:
-                    pass
-
-                # Voltando para a pagina dos carros.
-                bnt_voltar.click()
-                sleep(1)
-
-            print(f'Coleta do site {end} finalizada')
-        self.navegador.close()
-        self.export_data()
+            # Lendo de uma vez o texto e o link do cartão de cada botão de acesso aos carros, None se não forem encontrados.
+            carros = extrair(self.navegador, cartoes=campo(self.botao_carro, cartao, link, todos=True))['cartoes']
+            print(f'Foram encontrados {len(carros)} carros em {end}')
+            for i, carro in enumerate(carros):
+                identificador = urljoin(end, carro[link]) if carro[link] else (end, i)
+                lista.append(identificador)
+                self.cartoes[identificador] = carro[cartao]
+        return lista
+
+
+    def coletar_carro(self, carro, feitos=()):
+        """Realiza a coleta dos dados na pagina de um carro.
+
+        Args:
+            carro (str | tuple): Link do carro ou endereço da página e posição do carro nela.
+            feitos (set, opcional): Combinações (Km, Meses) já coletadas, que serão puladas.
+
+        Yields:
+            dict: Dados de cada combinação de Km e período, na medida em que são coletados.
+        """
+        if isinstance(carro, str):
+            # Acessando o carro direto pelo link, sem passar pela listagem.
+            with self.metricas.fase('pagina'):
+                self.abrir(carro)
+            if self.abas is None:
+                self.listagem = None  # A página de carros foi trocada pela do carro.
+            yield from self.ler_carro(feitos)
+            return
+
+        if self.abas is not None:
+            self.abas.voltar()  # A listagem fica na primeira aba, e os carros com link nas outras.
+        end, posicao = carro
+        if self.listagem != end:
+            self.pagina_inicial(end)
 
+        try:
+            car = self.navegador.find_elements(By.XPATH, self.botao_carro)[posicao]
+            ActionChains(self.navegador).move_to_element(car).perform()  # Move o mouse para o carro.
+            self.espera.clicavel(car).click()
+            # Esperando o botão para voltar para a página anterior.
+            self.espera.elemento(By.XPATH, '//*[contains(text(), "Voltar")]')
+            yield from self.ler_carro(feitos)
+        finally:
+            # Voltando para a pagina dos carros.
+            try:
+                self.navegador.find_element(By.XPATH, '//*[contains(text(), "Voltar")]').click()
+                self.espera.elementos(By.XPATH, self.botao_carro)
+            except ERROS_PAGINA as e:
+                self.contornar(e)
+                self.listagem = None  # A página de carros será carregada novamente no próximo carro.
+
+
+    def ler_carro(self, feitos=()):
+        """Lê os preços da página de um carro já aberta.
+
+        Args:
+            feitos (set, opcional): Combinações (Km, Meses) já coletadas, que serão puladas.
+
+        Yields:
+            dict: Dados de cada combinação de Km e período, na medida em que são coletados.
+        """
+        # Esperando o nome e as opções de periodo, que são lidos de uma vez.
+        self.espera.elemento(By.XPATH, self.nome)
+        self.espera.elemento(By.CLASS_NAME, 'monthly-plans__item')
+        pagina = extrair(self.navegador, nome=campo(self.nome), meses=campo(classe('monthly-plans__item'), 'elemento', 'texto', todos=True))
+        dados_carro = self.dados_carro(Nome=pagina['nome'])
+
+        # Lendo todos os preços de uma vez quando a página expõe a tabela, sem deslizar o slider.
+        linhas = self.ler_matriz(dados_carro, feitos)
+        if linhas is not None:
+            yield from linhas
+            return
+
+        for mes in pagina['meses']:
+            self.espera.texto_apos(mes['elemento'].click, By.XPATH, self.preco)
+            dados_carro['Meses'] = mes['texto'].split('\n')[0]
+
+            # Pegando slider de seleção de Km e as opções dele.
+            opcoes = extrair(self.navegador, slider=campo('//input[@type="range"]', 'elemento'), kms=campo(classe('hub-input-range')))
+            slider = opcoes['slider']
+
+            # Colocando slider na primeira posição, com todas as teclas enviadas de uma vez.
+            preco = self.espera.texto_apos(lambda: slider.send_keys(Keys.LEFT*5), By.XPATH, self.preco)
+
+            for km in opcoes['kms'].split('\n'):
+                dados_carro['Km'] = km
+
+                # O slider precisa passar por todas as posições, então as já coletadas apenas não são lidas.
+                if (dados_carro['Km'], dados_carro['Meses']) not in feitos:
+                    yield self.linha(dados_carro, preco)
+
+                # Deslizando slider para a proxima posição, o preço dela é o texto lido após a espera.
+                preco = self.espera.texto_apos(lambda: slider.send_keys(Keys.RIGHT), By.XPATH, self.preco)
 
-    def export_data(self):
-        """Exportando dados em um arquivo csv."""
-        print('Exportando dados')
-        self.dataframe.to_csv('dados_flua.csv', index=False)
 
 if __name__ == "__main__":
-    Flua()
\ No newline at end of file
+    coletar(Flua)
\ No newline at end of file
@@ -1,56 +1,65 @@
 """Módulo de web scraping do site https://www.movidazerokm.com.br/assinatura/busca."""
-import selenium
-import numpy as np
-import pandas as pd
-from time import sleep
-from datetime import datetime
+import re
+from urllib.parse import urljoin
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import TimeoutException, NoSuchFrameException, ElementClickInterceptedException
+from Ferramentas.Extrator import extrair, campo
+from Ferramentas.Falhas import ERROS_PAGINA
+from Sites.Base import Site, coletar
 
 
-class Movida:
+class Movida(Site):
     """Classe de web scraping do site https://www.movidazerokm.com.br/assinatura/busca.
 
     Realiza a coleta de dados de nome, url, Km, periodo de contrato, descrição de pagamento, preço e data de coleta dos dados, 
     de todos os carros presentes no link, com esses dados é gerados arquivos .csv.
 
-    Durante a execução não minimizar ou fechar a janela do navegador que será aberta.
+    Por padrão o navegador é aberto sem janela, com headless=False ele é aberto com janela, que não deve ser fechada durante a execução.
     
     O movidazerokm.com.br é um site problematico para fazer web scraping, ele gera diversas falhas durante a execução
     e mesmo tentando contornar essas falhas haverá erros.
     """
+    arquivo = 'dados_movida.csv'
+    url = 'https://www.movidazerokm.com.br/assinatura/busca'
+    locadora = 'Movida Zero Km'
+    timeout, intervalo = 30, .5  # Tempos de espera usados neste site, que é mais lento.
+    tentativas = 3  # O site falha com frequência, então cada carro tem uma tentativa a mais.
+    paginas_por_navegador = 100  # A listagem é carregada de novo a cada carro, o que pesa mais no navegador.
+    preco = '//h1[@class="price-label"]'
+    nome = '//p[@class="subtitle-car-detail"]'
+    descricao = '//h5[@class="price-observation"]'
 
-    def __init__(self):
-        """Inicializador da classe Unidas."""
-        self.url = 'https://www.movidazerokm.com.br/assinatura/busca'
+    def __init__(self, *args, **kwargs):
+        """Inicializador da classe Movida, recebe os mesmos argumentos de Site."""
+        super().__init__(*args, **kwargs)
+        self.lista = '/html/body/app-root/div/div/app-search-results/div/div/div[2]/div/div'
+        self.cookies_fechados = False
 
-        # Definindo quais opções serão usadas pelo navegador.
-        options = Options()
-        options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        
-        self.dataframe = pd.DataFrame(columns=['Nome', 'Data', 'Locadora', 'Km', 'Meses', 'Valor', 'Descricao'])
-        self.navegador = selenium.webdriver.Chrome(service=Service('chromedriver.exe'), options=options)
-        self.navegador.maximize_window()  # Maximizando a janela do navegador, para evitar probemas de visualização.
 
-        print('Iniciando coleta em Movida')
-        self.get_data()
+    def restaurar(self):
+        """O aviso de cookies volta a aparecer em um navegador novo."""
+        self.cookies_fechados = False
+
 
     def pagina_inicial(self):
         """Acessa a página que contem todos os carros."""
-        self.navegador.get(self.url)
-        sleep(5)
+        with self.metricas.fase('pagina'):
+            self.navegador.get(self.url)
+            self.espera.elementos(By.XPATH, self.lista)
 
 
     def get_carros(self):
-        """Pegando o link de todos os carros disponíveis na página.
+        """Pegando o texto e o link de todos os carros disponíveis na página.
 
         Returns:
-            list: Lista com o link de todos os carros.
+            list: Lista com o texto e o link, se houver, do cartão de todos os carros.
         """
-        carros =  self.navegador.find_elements(By.XPATH, '/html/body/app-root/div/div/app-search-results/div/div/div[2]/div/div')
+        link = '(./ancestor-or-self::a | .//a)[@href and not(starts-with(@href, "#"))]/@href'
+        carros = extrair(self.navegador, carros=campo(self.lista, 'texto', link, todos=True))['carros']
+        for carro in carros:
+            carro['link'] = urljoin(self.url, carro.pop(link)) if carro[link] else None
         print(f'Foram encontrados {len(carros)} em {self.url}')
         return carros
 
@@ -61,19 +70,19 @@ class Movida:
         Returns:
             list: Lista com todas as opções de períodos.
         """
-        try:
-            opcoes_meses = self.navegador.find_element(By.XPATH, '//mat-select[@id="mat-select-0"]')
-            ActionChains(self.navegador).move_to_element(opcoes_meses).perform()
-            opcoes_meses.click()
-        except:
-            sleep(2)
-            ActionChains(self.navegador).send_keys(Keys.ESCAPE).perform()
-            opcoes_meses = self.navegador.find_element(By.XPATH, '//mat-select[@id="mat-select-4"]')
-            ActionChains(self.navegador).move_to_element(opcoes_meses).perform()
-            opcoes_meses.click()
-        meses = self.navegador.find_elements(By.XPATH, '//*[@role="option"]')
-        sleep(.5)
-        return meses
+        with self.metricas.fase('opcoes'):
+            try:
+                opcoes_meses = self.navegador.find_element(By.XPATH, '//mat-select[@id="mat-select-0"]')
+                ActionChains(self.navegador).move_to_element(opcoes_meses).perform()
+                self.espera.clicavel(opcoes_meses).click()
+            except (*ERROS_PAGINA, ElementClickInterceptedException) as e:  # Lista com outro id ou coberta por outra lista aberta.
+                self.contornar(e)
+                self.espera.rede_ociosa()
+                ActionChains(self.navegador).send_keys(Keys.ESCAPE).perform()
+                opcoes_meses = self.espera.elemento(By.XPATH, '//mat-select[@id="mat-select-4"]')
+                ActionChains(self.navegador).move_to_element(opcoes_meses).perform()
+                self.espera.clicavel(opcoes_meses).click()
+            return self.opcoes()
 
 
     def load_kms(self):
@@ -82,144 +91,149 @@ class Movida:
         Returns:
             list: Lista com todas as opções de Km.
         """
-        try:
-            opcoes_km = self.navegador.find_element(By.XPATH, '//mat-select[@id="mat-select-1"]')
-            ActionChains(self.navegador).move_to_element(opcoes_km).perform()
-            opcoes_km.click()
-        except:
-            sleep(2)
-            ActionChains(self.navegador).send_keys(Keys.ESCAPE).perform()
-            opcoes_km = self.navegador.find_element(By.XPATH, '//mat-select[@id="mat-select-5"]')
-            ActionChains(self.navegador).move_to_element(opcoes_km).perform()
-            opcoes_km.click()
-        kms = self.navegador.find_elements(By.XPATH, '//*[@role="option"]')
-        sleep(.5)
-        return kms
+        with self.metricas.fase('opcoes'):
+            try:
+                opcoes_km = self.navegador.find_element(By.XPATH, '//mat-select[@id="mat-select-1"]')
+                ActionChains(self.navegador).move_to_element(opcoes_km).perform()
+                self.espera.clicavel(opcoes_km).click()
+            except (*ERROS_PAGINA, ElementClickInterceptedException) as e:  # Lista com outro id ou coberta por outra lista aberta.
+                self.contornar(e)
+                self.espera.rede_ociosa()
+                ActionChains(self.navegador).send_keys(Keys.ESCAPE).perform()
+                opcoes_km = self.espera.elemento(By.XPATH, '//mat-select[@id="mat-select-5"]')
+                ActionChains(self.navegador).move_to_element(opcoes_km).perform()
+                self.espera.clicavel(opcoes_km).click()
+            return self.opcoes()
+
+
+    def opcoes(self):
+        """Espera as opções da lista aberta e lê o elemento e o texto de todas elas de uma vez.
+
+        Returns:
+            list: Lista com o elemento e o texto de cada opção.
+        """
+        self.espera.elemento(By.XPATH, '//*[@role="option"]')
+        return extrair(self.navegador, opcoes=campo('//*[@role="option"]', 'elemento', 'texto', todos=True))['opcoes']
 
     def fechar_chat(self):
-        """Fecha o chat do site se estiver aberto."""
+        """Fecha o chat do site se estiver aberto, o que só acontece quando o chat não é bloqueado pelo navegador."""
         try:
             self.navegador.switch_to.frame('chat-widget')  # Acessando frame em que o chat está.
             chat = self.navegador.find_element(By.XPATH, '//button[@aria-label="Minimizar janela"]')
             chat.click()
             self.navegador.switch_to.default_content()  # Voltando para o frame principal.
-        except:
+        except (NoSuchFrameException, *ERROS_PAGINA) as e:
+            self.contornar(e)
             self.navegador.switch_to.default_content()  # Voltando para o frame principal.
-            pass
 
 
-    def get_data(self):
-        """Realiza a coleta dos dados nas paginas dos carros."""
-        self.pagina_inicial()
-        sleep(10)
+    def fechar_cookies(self):
+        """Fecha a mensagem de cookies, que só aparece no primeiro acesso de cada navegador."""
+        if not self.cookies_fechados:
+            # A mensagem pode não aparecer quando o script dela é bloqueado pelo navegador.
+            try:
+                self.espera.clicavel(By.XPATH, '//a[@aria-label="allow cookies"]', timeout=5).click()
+            except TimeoutException as e:
+                self.contornar(e)
+            self.cookies_fechados = True
 
+
+    def clicar_carro(self, i):
+        """Abre um carro clicando no cartão dele na página inicial, para os cartões sem link.
+
+        Args:
+            i (int): Posição do carro na página com todos os carros.
+        """
+        # Voltando para a página inicial.
+        self.pagina_inicial()
         self.fechar_chat()
+        self.fechar_cookies()
+
+        # Descendo na página principal para acessar o proximo carro. Se a página não carregar completamente, a
+        # espera esgotada chega a coletar_tentativas, que tenta de novo voltando à página inicial.
+        self.navegador.execute_script(f'window.scrollBy(0, {125*i})')
+        car = self.espera.elemento(By.ID, f'vehicleCard{i}')
 
-        # Fechando mensagem de cookies.
-        self.navegador.find_element(By.XPATH, '//a[@aria-label="allow cookies"]').click()
+        ActionChains(self.navegador).move_to_element(car).perform()  # Movendo mouse para o carro.
+        self.espera.clicavel(car).click()
+
+
+    def listar_carros(self):
+        """Lista os carros disponíveis no site.
+
+        Os cartões com link são identificados por ele e abertos direto em coletar_carro, sem voltar à listagem,
+        os demais são identificados pela posição na página.
+
+        Returns:
+            list: Lista com o link ou a posição de cada carro na página, usada para acessá-lo em coletar_carro.
+        """
+        self.pagina_inicial()
+        self.espera.rede_ociosa()
+
+        self.fechar_chat()
+        self.fechar_cookies()
 
         carros = self.get_carros()
+        indice = [carro['link'] or i for i, carro in enumerate(carros)]
+        self.cartoes = {identificador: carro['texto'] for identificador, carro in zip(indice, carros)}
+        return indice
+
+
+    def coletar_carro(self, carro, feitos=()):
+        """Realiza a coleta dos dados na pagina de um carro.
+
+        Args:
+            carro (str | int): Link do carro ou posição dele na página com todos os carros.
+            feitos (set, opcional): Combinações (Km, Meses) já coletadas, que serão puladas.
+
+        Yields:
+            dict: Dados de cada combinação de Km e período, na medida em que são coletados.
+        """
+        dados_carro = self.dados_carro()
+        if isinstance(carro, str):
+            # Acessando o carro direto pelo link, sem carregar a listagem de novo.
+            with self.metricas.fase('pagina'):
+                self.abrir(carro)
+            self.fechar_chat()
+            self.fechar_cookies()
+        else:
+            self.clicar_carro(carro)
+
+        dados_carro['Nome'] = self.espera.elemento(By.XPATH, self.nome).text
+
+        # Lendo todos os preços de uma vez quando a página expõe a tabela, sem abrir as listas de opções.
+        linhas = self.ler_matriz(dados_carro, feitos)
+        if linhas is not None:
+            yield from linhas
+            return
+
+        # Descendo na página para evitar problemas de não conseguir acessar o objetivo por estar fora da tela ou com algo na frente.
+        self.navegador.execute_script('window.scrollBy(0, 200)')
+
+        meses = self.load_meses()  # Abrindo lista de opções de meses.
+
+        for mes in meses:
+            dados_carro['Meses'] = mes['texto']
+            self.espera.texto_apos(mes['elemento'].click, By.XPATH, self.preco)    # Selecionando opção de periodo.
+            kms = self.load_kms()  # Abrindo lista de opções de Km e salvandoa-as.
+
+            for km in kms:
+                dados_carro['Km'] = km['texto']
+                if (dados_carro['Km'], dados_carro['Meses']) in feitos:  # Pulando combinação já coletada, a lista continua aberta.
+                    continue
+                valor = self.espera.texto_apos(km['elemento'].click, By.XPATH, self.preco)  # Selecionando opção de km.
+
+                # Segunda tentativa de coletar o preço caso a primeira não tenha um número.
+                if not re.search(r'\d', valor or ''):
+                    valor = self.espera.elemento(By.XPATH, self.preco).text
+
+                # Coletando descrição de pagamento se ela existir, caso contrário o valor será NaN.
+                yield self.linha(dados_carro, valor, self.espera.texto(By.XPATH, self.descricao))
+                self.load_kms()  # Abrindo lista de opções de Km.
+
+            kms[0]['elemento'].click()
+            self.load_meses()  # Abrindo lista de opções de períodos.
 
-        print('Coletando dados...')
-        i = 0
-        tentativa = 0
-        while i < len(carros):
-            try:
-                dados_carro = {'Nome':np.nan, 'Data':np.nan, 'Locadora':'Movida Zero Km', 'Km':np.nan, 'Meses':np.nan, 'Valor':np.nan, 'Descricao':np.nan}
-                self.fechar_chat()
-                try:
-                    # Descendo na página principal para acessar o proximo carro.
-                    self.navegador.execute_script(f'window.scrollBy(0, {125*i})')
-                    sleep(2)
-                    car = self.navegador.find_element(By.ID, f'vehicleCard{i}')
-                except:  # Exceção para quando a pagina não carregar completamente.
-                    self.navegador.refresh()
-                    sleep(15)
-                    self.navegador.execute_script(f'window.scrollBy(0, {130*i})')
-                    sleep(2)
-                    car = self.navegador.find_element(By.ID, f'vehicleCard{i}')
-
-                ActionChains(self.navegador).move_to_element(car).perform()  # Movendo mouse para o carro.
-                sleep(1)
-                car.click()
-                sleep(8)
-
-                dados_carro['Nome'] = self.navegador.find_element(By.XPATH, '//p[@class="subtitle-car-detail"]').text
-
-                # Descendo na página para evitar problemas de não conseguir acessar o objetivo por estar fora da tela ou com algo na frente.
-                self.navegador.execute_script('window.scrollBy(0, 200)')
-                sleep(1)
-
-                meses = self.load_meses()  # Abrindo lista de opções de meses.
-
-                for mes in meses:
-                    dados_carro['Meses'] = int(mes.text.replace('meses', ''))
-                    mes.click()    # Selecionando opção de km.
-                    sleep(1)
-                    try:
-                        kms = self.load_kms()  # Abrindo lista de opções de Km e salvandoa-as.
-                    except:
-                        self.navegador.refresh()
-                        sleep(8)
-                        kms = self.load_kms()
-
-                    for km in kms:
-                        dados_carro['Km'] = int(km.text.replace(' Km', '').replace('.', ''))
-                        km.click()  # Selecionando opção de km.
-                        sleep(2)
-
-                        # Tentando coletar os dados.
-                        try:
-                            # Formatando preço para se tornar um numero to tipo float.
-                            valor = self.navegador.find_element(By.XPATH, '//h1[@class="price-label"]').text
-                            numeros = float(valor.replace('R$ ', '').replace('.', '').replace(',', '.'))
-                        except:
-                            # Segunda tentativa de coletar o preço caso a primeira falhe.
-                            sleep(6)
-                            valor = self.navegador.find_element(By.XPATH, '//h1[@class="price-label"]').text
-                            numeros = float(valor.replace('R$ ', '').replace('.', '').replace(',', '.'))
-                        try:
-                            # Coletando descrição de pagamento se ela existir.
-                            desc = self.navegador.find_element(By.XPATH, '//h5[@class="price-observation"]').text
-                        except:
-                            # Caso não consiga coletar, o valor será NaN.
-                            desc = np.nan
-
-                        # Salvando dados que ainda não foram salvos.
-                        dados_carro['Valor'] = numeros
-                        dados_carro['Descricao'] = desc
-                        dados_carro['Data'] = datetime.now().strftime('%d/%m/%Y %H:%M')
-
-                        # Guardando no dataframe.
-                        self.dataframe.loc[len(self.dataframe)] = dados_carro
-                        self.load_kms()  # Abrindo lista de opções de Km.
-
-                    kms[0].click()
-                    try:
-                        self.load_meses()  # Abrindo lista de opções de períodos.
-                    except:
-                        self.navegador.refresh()
-                        sleep(8)
-                        self.load_meses()
-            except:
-                if tentativa == i:
-                    pass
-                else:
-                    tentativa = i
-                    i -= 1
-            # Voltando para a página inicial.
-            self.pagina_inicial()
-            i += 1
-
-        print(f'Coleta do site {self.url} finalizada')
-        self.navegador.close()
-        self.export_data()
-
-
-    def export_data(self):
-        """Exportando dados em um arquivo csv."""
-        print('Exportando dados')
-        self.dataframe.to_csv('dados_movida.csv', index=False)
 
 if __name__ == '__main__':
-    Movida()
\ No newline at end of file
+    coletar(Movida)
\ No newline at end of file
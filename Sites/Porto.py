@@ -1,45 +1,35 @@
 """Módulo de web scraping do site https://www.portosegurocarrofacil.com.br/veiculos."""
-import selenium
-import numpy as np
-import pandas as pd
-from time import sleep
-from datetime import datetime
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
+from Ferramentas.Extrator import extrair, campo
+from Sites.Base import Site, Eixo, coletar
 
 
-class Porto:
+class Porto(Site):
     """Classe de web scraping do site https://www.portosegurocarrofacil.com.br/veiculos.
 
     Realiza a coleta de dados de nome, url, Km, periodo de contrato, preço e data de coleta dos dados, 
     de todos os carros presentes no link, com esses dados é gerados arquivos .csv.
 
-    Durante a execução não minimizar ou fechar a janela do navegador que será aberta.
+    Por padrão o navegador é aberto sem janela, com headless=False ele é aberto com janela, que não deve ser fechada durante a execução.
     """
-
-    def __init__(self):
-        """Inicializador da classe Porto."""
-        self.url = 'https://www.portosegurocarrofacil.com.br/veiculos'
-
-        # Definindo quais opções serão usadas pelo navegador.
-        options = Options()
-        options.add_experimental_option('excludeSwitches', ['enable-logging'])  # Opção para ignorar erros de conexão com dispositivos.
-
-        self.dataframe = pd.DataFrame(columns=['Nome', 'Data', 'Locadora', 'Km', 'Meses', 'Valor', 'Descricao'])
-        self.navegador = selenium.webdriver.Chrome(service=Service('chromedriver.exe'), options=options)
-
-        print('Iniciando coleta em Porto Seguro')
-        self.navegador.get(self.url)
-        sleep(10)
-        self.get_data()
+    arquivo = 'dados_porto.csv'
+    url = 'https://www.portosegurocarrofacil.com.br/veiculos'
+    locadora = 'Porto Seguro'
+    timeout, intervalo = 15, .2  # Tempos de espera usados neste site.
+    preco = '//p[@class="styles__Price-sc-42cvqa-6 bNzvrM"]'
+    nome = '/html/body/div[1]/main/div/section[1]/div/div[3]/div[2]/div[2]/p'
+    # As opções de Km mudam com o periodo, e o Km do site é a franquia total do contrato, dividido pelos meses no Gravador.
+    eixos = (Eixo('Meses', '//*[@name="periods"]', pular=1),
+             Eixo('Km', '//*[@name="bundles"]', pular=1, fixo=False))
+    trecho_http = '/veiculos/'
+    km_por_contrato = True
+    validade_cache = 24*3600  # As páginas dos carros mudam pouco ao longo do dia.
 
 
     def load_all(self):
         """Carrega todos os carros disponíveis na página, neste site apenas descer até o fim já é suficiente."""
         self.navegador.execute_script('window.scrollTo(0,document.body.scrollHeight)')
-        sleep(5)
+        self.espera.rede_ociosa()
 
 
     def get_links(self):
@@ -48,74 +38,53 @@ class Porto:
         Returns:
             list: Lista com o link de todos os carros.
         """
-        self.load_all()
+        with self.metricas.fase('load_all'):
+            self.load_all()
 
-        # Procurando todos os links.
-        enderecos = self.navegador.find_elements(By.XPATH, '//*[@href]')
+        # Lendo o link e o texto de todos os links de uma vez.
+        enderecos = extrair(self.navegador, links=campo('//*[@href]', 'href', 'texto', todos=True))['links']
 
         carros = []
         for end in enderecos:
-            link = end.get_attribute('href')  # Pegando o link dos objetos encontrados.
+            link = end['href']
 
             # Separando somente os que são links de carros.
-            if '/veiculos/' in link and link not in carros and link is not None:
+            if link is not None and '/veiculos/' in link and link not in carros:
                 carros.append(link)
+                self.cartoes[link] = end['texto']  # Guardando o texto do cartão para detectar mudanças.
 
         print(f'Foram encontrados {len(carros)} carros em {self.url}')
         return carros
 
-    def get_data(self):
-        """Realiza a coleta dos dados nas paginas dos carros."""
-        carros = self.get_links()
-
-        print('Coletando dados...')
-        for carro in carros:
-            dados_carro = {'Nome':np.nan, 'Data':np.nan, 'Locadora':'Porto Seguro', 'Km':np.nan, 'Meses':np.nan, 'Valor':np.nan, 'Descricao':np.nan}
-            self.navegador.get(carro)  # Acessando carro.
-            sleep(2)
-            dados_carro['Nome'] = self.navegador.find_element(By.XPATH, '/html/body/div[1]/main/div/section[1]/div/div[3]/div[2]/div[2]/p').text
-
-            # Lendo opções de periodo, elas são do tipo lista de seleção 
-            # então já estão sendo salvas nesse formato, pois o Selenium da suporte para isso.
-            meses = Select(self.navegador.find_element(By.XPATH, f'//*[@name="periods"]'))
 
-            for mes in meses.options[1:]:
-                meses.select_by_visible_text(mes.text)  # Selecioando opção da lista de periodos.
-                sleep(.5)
-                dados_carro['Meses'] = int(mes.text.replace(' meses', ''))
+    def listar_carros(self):
+        """Lista os carros disponíveis no site.
 
-                # Lendo opções de periodo, elas são do tipo lista de seleção 
-                # então já estão sendo salvas nesse formato, pois o Selenium da suporte para isso
-                kms = Select(self.navegador.find_element(By.XPATH, f'//*[@name="bundles"]'))
-
-                for km in kms.options[1:]:
-                    kms.select_by_visible_text(km.text)  # Selecioando opção da lista de Km.
-                    sleep(.5)
-
-                    # Formatando preço para se tornar um numero to tipo float.
-                    preco = self.navegador.find_element(By.XPATH, '//p[@class="styles__Price-sc-42cvqa-6 bNzvrM"]').text
-                    numeros = preco.split(' ')[-1]
-                    valor = float(numeros.replace('.', '').replace(',', '.'))
+        Returns:
+            list: Lista com o link de todos os carros.
+        """
+        with self.metricas.fase('pagina'):
+            self.navegador.get(self.url)
+            self.espera.elementos(By.XPATH, '//*[contains(@href, "/veiculos/")]')
+        return self.get_links()
 
-                    # Salvando data da coleta e todos os outros dados.
-                    km_site = km.text.split(' ')[0]
-                    km_real = int(km_site)/dados_carro['Meses']
-                    dados_carro['Km'] = km_real
 
-                    dados_carro['Valor'] = valor
-                    dados_carro['Data'] = datetime.now().strftime('%d/%m/%Y %H:%M')
+    def coletar_carro(self, carro, feitos=()):
+        """Realiza a coleta dos dados na pagina de um carro.
 
-                    self.dataframe.loc[len(self.dataframe)] = dados_carro
+        Args:
+            carro (str): Link do carro.
+            feitos (set, opcional): Combinações (Km, Meses) já coletadas, que serão puladas.
 
-        print(f'Coleta do site {self.url} finalizada')
-        self.navegador.close()
-        self.export_data()
+        Yields:
+            dict: Dados de cada combinação de Km e período, na medida em que são coletados.
+        """
+        with self.metricas.fase('pagina'):
+            self.abrir(carro)  # Acessando carro.
+            nome = self.espera.elemento(By.XPATH, self.nome).text
 
+        yield from self.percorrer_eixos(self.dados_carro(Nome=nome), feitos)
 
-    def export_data(self):
-        """Exportando dados em um arquivo csv."""
-        print('Exportando dados')
-        self.dataframe.to_csv('dados_porto.csv', index=False)
 
 if __name__ == '__main__':
-    porto = Porto()
\ No newline at end of file
+    coletar(Porto)
@@ -1,44 +1,62 @@
 """Módulo de web scraping do site https://livre.unidas.com.br/carros."""
-import selenium
-import numpy as np
-import pandas as pd
-from time import sleep
-from datetime import datetime
+from urllib.parse import urljoin
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import TimeoutException
+from Ferramentas.Extrator import extrair, campo, classe
+from Ferramentas.Falhas import ERROS_PAGINA
+from Sites.Base import Site, Eixo, coletar
 
 
-class Unidas:
+class Unidas(Site):
     """Classe de web scraping do site https://livre.unidas.com.br/carros.
 
-    Realiza a coleta de dados de nome, url, Km, periodo de contrato, descrição de pagamento, preço e data de coleta dos dados, 
+    Realiza a coleta de dados de nome, url, Km, periodo de contrato, descrição de pagamento, preço e data de coleta dos dados,
     de todos os carros presentes no link, com esses dados é gerados arquivos .csv.
 
-    Durante a execução não minimizar ou fechar a janela do navegador que será aberta.
+    Por padrão o navegador é aberto sem janela, com headless=False ele é aberto com janela, que não deve ser fechada durante a execução.
     """
+    arquivo = 'dados_unidas.csv'
+    url = 'https://livre.unidas.com.br/carros'
+    locadora = 'Unidas'
+    timeout, intervalo = 20, .25  # Tempos de espera usados neste site.
+    preco = '(//p[@class="overview-purchase__card-p price"]/span)[last()]'
+    nome = classe('page-title')
+    descricao = '//p[@class="font-size-0dot875 text-success mt-3 mb-5 ng-star-inserted"]'
+    # Listas de seleção de Km e periodo, as opções de periodo são as mesmas para todos os Km.
+    eixos = (Eixo('Km', '//*[@id="franchise"]'), Eixo('Meses', '//*[@id="period"]'))
+    trecho_http = '/carros/'
+
+    def __init__(self, *args, **kwargs):
+        """Inicializador da classe Unidas, recebe os mesmos argumentos de Site."""
+        super().__init__(*args, **kwargs)
+        self.cookies_fechados = False
+
+
+    def restaurar(self):
+        """O aviso de cookies volta a aparecer em um navegador novo."""
+        self.cookies_fechados = False
+
+
+    def pagina_inicial(self):
+        """Acessa a página que contem todos os carros e carrega todos eles."""
+        with self.metricas.fase('pagina'):
+            self.navegador.get(self.url)
+            self.espera.elementos(By.CLASS_NAME, 'bottom')
+
+        self.fechar_cookies()
+        with self.metricas.fase('load_all'):
+            self.load_all()
 
-    def __init__(self):
-        """Inicializador da classe Unidas."""
-        self.url = 'https://livre.unidas.com.br/carros'
-
-        # Definindo quais opções serão usadas pelo navegador.
-        options = Options()
-        options.add_experimental_option('excludeSwitches', ['enable-logging'])  # Opção para ignorar erros de conexão com dispositivos.
-
-        self.dataframe = pd.DataFrame(columns=['Nome', 'Data', 'Locadora', 'Km', 'Meses', 'Valor', 'Descricao'])
-        self.navegador = selenium.webdriver.Chrome(service=Service('chromedriver.exe'), options=options)
 
-        print('Iniciando coleta em Unidas')
-        self.navegador.get(self.url)
-        self.navegador.maximize_window()
-        sleep(10)
-        bnt = self.navegador.find_elements(By.XPATH, '//*[contains(text(), "OK")]')[0]
-        bnt.click()
-        self.load_all()
-        self.get_data()
+    def fechar_cookies(self):
+        """Fecha a mensagem de cookies, que só aparece no primeiro acesso de cada navegador."""
+        if not self.cookies_fechados:
+            try:
+                self.espera.clicavel(By.XPATH, '//*[contains(text(), "OK")]', timeout=2).click()
+            except TimeoutException as e:
+                self.contornar(e)
+            self.cookies_fechados = True
 
 
     def load_all(self):
@@ -51,11 +69,14 @@ class Unidas:
                 ActionChains(self.navegador).move_to_element(bnt).perform()
                 # Descendo um pouco mais para a mensagem de cookies não ficar na frente.
                 self.navegador.execute_script('window.scrollBy(0, 200)')
-                sleep(1)
+                quantidade = len(self.navegador.find_elements(By.CLASS_NAME, 'bottom'))
                 # Clicando no botão.
-                bnt.click()
-                sleep(2)
-            except:
+                self.espera.clicavel(bnt).click()
+                # Esperando novos carros aparecerem, se não aparecerem todos já foram carregados.
+                if not self.espera.quantidade_mudou(By.CLASS_NAME, 'bottom', quantidade):
+                    break
+            except (IndexError, *ERROS_PAGINA) as e:  # Sem o botão de ver mais, todos os carros já foram carregados.
+                self.contornar(e)
                 break
 
 
@@ -63,90 +84,66 @@ class Unidas:
         """Pegando o link de todos os carros disponíveis na página.
 
         Returns:
-            list: Lista com o link de todos os carros.
+            tuple: Lista com o elemento, o texto e o link, se houver, do cartão de todos os carros e a quantidade de carros.
         """
-
-        # Procurando todos os links.
-        enderecos = self.navegador.find_elements(By.CLASS_NAME, 'bottom')
-
-        carros = []
+        # Lendo o elemento, o texto e o link de todos os cartões de uma vez.
+        link = '(./ancestor-or-self::a | .//a)[contains(@href, "/carros/")]/@href'
+        enderecos = extrair(self.navegador, cartoes=campo(classe('bottom'), 'elemento', 'texto', link, todos=True))['cartoes']
         for end in enderecos:
-            # link = end.get_attribute('href')  # Pegando o link dos objetos encontrados.
-            # print(link)
-
-            # Separando somente os que são links de carros.
-            if '/mês' in end.text and end not in carros and end is not None:
-                carros.append(end)
+            end['link'] = urljoin(self.url, end.pop(link)) if end[link] else None
 
+        # Separando somente os que são cartões de carros.
+        carros = [end for end in enderecos if '/mês' in end['texto']]
         return carros, len(carros)
 
 
-    def get_data(self):
-        """Realiza a coleta dos dados nas paginas dos carros."""
+    def listar_carros(self):
+        """Lista os carros disponíveis no site.
+
+        A listagem é carregada apenas uma vez, e os carros são identificados pelo link da página deles, que é
+        aberta direto em coletar_carro. Os cartões sem link são identificados pela posição na página.
+
+        Returns:
+            list: Lista com o link ou a posição de cada carro, usada para acessá-lo em coletar_carro.
+        """
+        self.pagina_inicial()
         carros, tamanho = self.get_links()
+        indice = [carro['link'] or i for i, carro in enumerate(carros)]
+        self.cartoes = {identificador: carro['texto'] for identificador, carro in zip(indice, carros)}
+        print(f'Foram encontrados {tamanho} carros em {self.url}')
+        return indice
 
-        print('Coletando dados...')
 
-        for carro in range(tamanho):
-            try:
-                dados_carro = {'Nome':np.nan, 'Data':np.nan, 'Locadora':'Unidas', 'Km':np.nan, 'Meses':np.nan, 'Valor':np.nan, 'Descricao':np.nan}
-                # self.navegador.get(carro)  # Acessando carro.
-                ActionChains(self.navegador).move_to_element(carros[carro]).perform()
-                sleep(2)
-                carros[carro].click()
-                sleep(3)
-                try:
-                    self.navegador.find_element(By.XPATH, '//*[@title="Close"]').click()
-                except:
-                    pass
-                dados_carro['Nome'] = self.navegador.find_element(By.CLASS_NAME, 'page-title').text
-
-                # Lendo opções de Km e periodo, elas são do tipo lista de seleção 
-                # então já estão sendo salvas nesse formato, pois o Selenium da suporte para isso.
-                kms = Select(self.navegador.find_element(By.XPATH, f'//*[@id="franchise"]'))
-                meses = Select(self.navegador.find_element(By.XPATH, f'//*[@id="period"]'))
-
-                for km in kms.options:
-                    dados_carro['Km'] = int(km.text.replace(' Km', ''))
-                    kms.select_by_visible_text(km.text)  # Selecioando opção da lista de Km.
-                    sleep(2)
-
-                    for mes in meses.options:
-                        meses.select_by_visible_text(mes.text)  # Selecioando opção da lista de periodos.
-                        sleep(2)
-                        dados_carro['Meses'] = int(mes.text.replace('Meses', ''))
-
-                        preco = self.navegador.find_elements(By.XPATH, '//p[@class="overview-purchase__card-p price"]/span')[-1]
-
-                        # Formatando preço para se tornar um numero to tipo float.
-                        texto_separado = preco.text.split(' ')
-                        numero = texto_separado[-1].split('/')[0]
-                        dados_carro['Valor'] = float(numero.replace('.', '').replace(',', '.'))
-
-                        descricao = self.navegador.find_element(By.XPATH, '//p[@class="font-size-0dot875 text-success mt-3 mb-5 ng-star-inserted"]')
-                        dados_carro['Descricao'] = descricao.text
-
-                        # Salvando data da coleta.
-                        dados_carro['Data'] = datetime.now().strftime('%d/%m/%Y %H:%M')
-                        self.dataframe.loc[len(self.dataframe)] = dados_carro
-                self.navegador.get(self.url)
-                sleep(3)
-
-            except Exception as e:
-                self.navegador.get(self.url)
-                sleep(3)
+    def coletar_carro(self, carro, feitos=()):
+        """Realiza a coleta dos dados na pagina de um carro.
 
-            self.load_all()
+        Args:
+            carro (str | int): Link do carro ou posição dele na página com todos os carros.
+            feitos (set, opcional): Combinações (Km, Meses) já coletadas, que serão puladas.
+
+        Yields:
+            dict: Dados de cada combinação de Km e período, na medida em que são coletados.
+        """
+        if isinstance(carro, str):
+            # Acessando o carro direto pelo link, sem carregar a listagem de novo.
+            with self.metricas.fase('pagina'):
+                self.abrir(carro)
+                self.fechar_cookies()
+        else:
+            # Carros sem link só podem ser acessados voltando para a página inicial e clicando neles.
+            self.pagina_inicial()
             carros, tamanho = self.get_links()
-        print(f'Coleta do site {self.url} finalizada')
-        self.navegador.close()
-        self.export_data()
+            ActionChains(self.navegador).move_to_element(carros[carro]['elemento']).perform()
+            self.espera.clicavel(carros[carro]['elemento']).click()
+
+        dados_carro = self.dados_carro(Nome=self.espera.elemento(By.XPATH, self.nome).text)
+        try:
+            self.espera.clicavel(By.XPATH, '//*[@title="Close"]', timeout=2).click()
+        except TimeoutException as e:  # Aviso que nem sempre aparece.
+            self.contornar(e)
 
+        yield from self.percorrer_eixos(dados_carro, feitos)
 
-    def export_data(self):
-        """Exportando dados em um arquivo csv."""
-        print('Exportando dados')
-        self.dataframe.to_csv('dados_unidas.csv', index=False)
 
 if __name__ == '__main__':
-    Unidas()
\ No newline at end of file
+    coletar(Unidas)
@@ -0,0 +1 @@
+"""Configuração do pytest, que roda os testes a partir da raiz do projeto para importar Ferramentas e Sites."""
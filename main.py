@@ -8,12 +8,21 @@ Módulo principal de WebScraping dos sites:
 - https://www.meuflua.com.br/fiat
 """
 import os
-import pandas as pd
+import shutil
+from threading import Thread, Event
 from Sites.Flua import Flua
 from Sites.Porto import Porto
 from Sites.Unidas import Unidas
 from Sites.Movida import Movida
 from multiprocessing import Process
+from Ferramentas.Pool import PoolNavegadores
+from Ferramentas.Historico import Historico
+from Ferramentas.Juntar import Juntador
+from Ferramentas.Gravador import pasta_arrow
+from Ferramentas.Comparar import comparar_arquivo
+from Ferramentas import Metricas
+from Ferramentas.Servidor import trocar_base
+from Sites.Base import coletar
 
 
 class WebScraping:
@@ -23,10 +32,13 @@ class WebScraping:
     preço e data de coleta dos dados, de todos os carros presentes no link, com esses dados são gerados arquivos .csv de cada site 
     ou um .csv contendo todos eles.
 
-    Durante a execução não minimizar ou fechar as janelas do navegador que serão abertas
+    Por padrão os navegadores são abertos sem janela, com headless=False eles são abertos com janelas, que não devem ser
+    fechadas durante a execução.
     """
 
-    def __init__(self, unidas, porto, movida, flua, juntar_dados=True, multi_process=True):
+    def __init__(self, unidas, porto, movida, flua, juntar_dados=True, multi_process=True, http=False, trabalhadores=None,
+                 retomar=False, idade_maxima=None, historico='historico', headless=True,
+                 base=None, processos=1, refazer=False, cache=None, abas=1):
         """Inicializador da classe Web Scraping
 
         Args:
@@ -36,63 +48,172 @@ class WebScraping:
             flua (bool): Condição para realizar web scraping nos sites https://www.meuflua.com.br/jeep e  https://www.meuflua.com.br/fiat.
             juntar_dados (bool, opcional): Condição para criação de um unico .csv que contenha todos os dados coletados. Padrão é True.
             multi_process (bool, opcional): Condição para utilizar multiprocessamento no web scraping. Padrão é True.
+            http (bool, opcional): Condição para coletar direto por HTTP, sem navegador, nos sites que suportam. Padrão é False.
+            trabalhadores (int, opcional): Quantidade de navegadores que dividem entre si os carros de todos os sites.
+                Padrão é None, que usa um navegador por site.
+            retomar (bool, opcional): Condição para continuar a última coleta interrompida, pulando os carros e as combinações
+                de Km e período já coletadas. Padrão é False.
+            idade_maxima (float, opcional): Idade máxima, em horas, dos preços de um carro para eles serem reaproveitados
+                quando o cartão do carro na listagem não mudou. Padrão é None, que sempre coleta todos os carros.
+            historico (str, opcional): Pasta do histórico de preços, ao qual os dados juntados são adicionados.
+                Padrão é 'historico', None não guarda o histórico.
+            headless (bool, opcional): Condição para abrir os navegadores sem janela, com imagens, fontes e domínios de
+                terceiros bloqueados. Padrão é True.
+            base (str, opcional): Protocolo e domínio usados no lugar dos sites reais, como o de um Servidor com páginas
+                gravadas, por exemplo 'http://127.0.0.1:8000'. Padrão é None, que usa os sites reais.
+            processos (int | dict, opcional): Quantidade de navegadores que dividem os carros de cada site quando não é
+                usado o pool de todos os sites, ou um dicionário com a quantidade por site, como {'unidas': 4}. Padrão é 1.
+            refazer (bool, opcional): Condição para coletar apenas os carros guardados em dados_<site>.falhas.json
+                por terem falhado na última coleta, adicionando as linhas aos dados dela. Padrão é False.
+            cache (str, opcional): Pasta do cache em disco das páginas, que são reaproveitadas dentro da validade de cada
+                site, como 'cache'. Padrão é None, que não usa o cache.
+            abas (int, opcional): Quantidade de abas de carros de cada navegador, as páginas dos próximos carros carregam
+                em segundo plano enquanto o carro atual é lido. Não é usada pelo pool. Padrão é 1, sem outras abas.
         """
         self.sites = []
-        self.dados= []
         if unidas:
             self.sites.append(Unidas)
-            self.dados.append('dados_unidas.csv')
         if porto:
             self.sites.append(Porto)
-            self.dados.append('dados_porto.csv')
         if movida:
             self.sites.append(Movida)
-            self.dados.append('dados_movida.csv')
         if flua:
             self.sites.append(Flua)
-            self.dados.append('dados_flua.csv')
+        self.dados = [site.arquivo for site in self.sites]
 
         self.mutli_process = multi_process
         self.juntar = juntar_dados
+        self.http = http
+        self.trabalhadores = trabalhadores
+        self.retomar = retomar
+        self.idade_maxima = idade_maxima
+        self.historico = historico
+        self.headless = headless
+        self.base = base
+        self.processos = processos
+        self.refazer = refazer
+        self.cache = cache
+        self.abas = abas
 
 
     def run(self):
         """Roda o web scraping para os sites selecionados."""
+        # Com o pool, os sites coletados pelo navegador dividem os mesmos navegadores,
+        # os coletados por HTTP continuam sendo rodados separadamente.
+        pool = [site for site in self.sites if not self.usa_http(site)] if self.trabalhadores else []
+        sites = [site for site in self.sites if site not in pool]
+
+        # Apagando as métricas da execução anterior, para o resumo não mostrar sites que falharam antes de salvá-las.
+        for arquivo in self.dados:
+            if os.path.exists(Metricas.caminho(arquivo)):
+                os.remove(Metricas.caminho(arquivo))
+
+        # Juntando os lotes gravados pelos sites enquanto a coleta continua. Os lotes de uma coleta anterior são
+        # apagados antes, a não ser que ela seja continuada, para não serem juntados com os desta.
+        juntador, parar = None, Event()
+        if self.juntar:
+            for site in self.sites:
+                if not (self.retomar or self.refazer) or self.usa_http(site):  # A coleta por HTTP sempre recomeça.
+                    shutil.rmtree(pasta_arrow(site.arquivo), ignore_errors=True)
+            juntador = self.juntador()
+            acompanhamento = Thread(target=juntador.acompanhar, args=(parar,), daemon=True)
+            acompanhamento.start()
+
         if self.mutli_process:
             processos = []
-            for site in self.sites:
-                p = Process(target=site)  # Criando processo.
+            for site in sites:
+                p = Process(target=coletar, args=(site,), kwargs=self.argumentos(site))  # Criando processo.
                 p.start()  # Iniciando processo.
                 processos.append(p)  # Salvando processo para realizar multiprocessamento.
 
+            if pool:
+                PoolNavegadores(pool, self.trabalhadores, self.retomar, self.idade_maxima, self.headless, self.base,
+                                self.refazer, self.cache).run()
+
             # Rodando todos os processos em conjunto.
             for p in processos:
                 p.join()
         else:
             # Rodando web scraping de cada site sem multiprocessamento.
-            for site in self.sites:
-                site()
+            for site in sites:
+                coletar(site, **self.argumentos(site))
+
+            if pool:
+                PoolNavegadores(pool, self.trabalhadores, self.retomar, self.idade_maxima, self.headless, self.base,
+                                self.refazer, self.cache).run()
 
         if self.juntar:
-            self.juntar_dados()
+            parar.set()
+            acompanhamento.join()
+            self.juntar_dados(juntador)
+        self.resumo()
+
+
+    def resumo(self):
+        """Mostra o tempo de cada etapa e os contadores de falhas de cada site, e guarda a execução em metricas.jsonl."""
+        tabela = Metricas.relatorio(self.dados)
+        if not tabela.empty:
+            print(tabela.to_string(index=False))
+
+
+    def argumentos(self, site):
+        """Argumentos usados para iniciar a coleta de um site.
+
+        Args:
+            site (class): Classe de web scraping do site.
 
+        Returns:
+            dict: Argumentos da classe do site.
+        """
+        argumentos = {'url': trocar_base(site.url, self.base)} if self.base else {}
+        argumentos['cache'] = self.cache
+        if self.usa_http(site):
+            return dict(argumentos, http=True)
+
+        argumentos = dict(argumentos, retomar=self.retomar, idade_maxima=self.idade_maxima, headless=self.headless,
+                          refazer=self.refazer, abas=self.abas)
+        processos = self.processos.get(site.__name__.lower(), 1) if isinstance(self.processos, dict) else self.processos
+        if processos > 1:
+            # Os navegadores do pool recebem a base e trocam o endereço do site eles mesmos.
+            argumentos.pop('url', None)
+            return dict(argumentos, processos=processos, base=self.base)
+        return argumentos
+
+
+    def usa_http(self, site):
+        """Verifica se o site será coletado por HTTP, apenas os sites com essa coleta recebem a opção.
+
+        Args:
+            site (class): Classe de web scraping do site.
+
+        Returns:
+            bool: True se o site será coletado por HTTP.
+        """
+        return self.http and site.suporta_http()
 
-    def juntar_dados(self):
+
+    def juntador(self):
+        """Cria o Juntador dos lotes dos sites em dados.csv, que também adiciona as linhas ao histórico."""
+        historico = Historico(self.historico) if self.historico else None
+        return Juntador(self.dados, 'dados.csv', historico)
+
+
+    def juntar_dados(self, juntador=None):
+        """Junta os dados dos sites em dados.csv, adiciona as linhas ao histórico e compara os preços em comparacao.csv.
+
+        Args:
+            juntador (Juntador, opcional): Juntador que já recebeu os lotes gravados durante a coleta. Padrão é um novo
+                Juntador, que lê todos os lotes de uma vez.
+        """
         print('Juntando dados...')
 
-        dados = pd.DataFrame()
-        for arquivo in self.dados:
-            # Tentando ler arquivo com dados dos site e apagando ele após a leitura.
-            try:
-                csv = pd.read_csv(arquivo)
-                os.remove(arquivo)
-            except:  # Exceção para caso não seja possivel ler o arquivo, neste caso ele será apenas ignorado.
-                continue
-            dados = pd.concat([dados, csv])  # Juntando dados.
-
-        # Exportando dados em um unico .csv.
-        dados.to_csv('dados.csv', index=False)
-        print('Dados juntados com sucesso!')
+        juntador = juntador or self.juntador()
+        total, _ = juntador.fechar()
+        print(f'Dados juntados com sucesso! Foram juntadas {total} linhas')
+
+        if total:
+            comparados = comparar_arquivo('dados.csv', 'comparacao.csv')
+            print(f'Foram comparadas {comparados} combinações de carro, Km e período entre as locadoras em comparacao.csv')
 
 
 
@@ -0,0 +1,41 @@
+"""Testes da publicação das coletas terminadas pelo Agendador."""
+import pandas as pd
+import pytest
+from Ferramentas.Agendador import Agendador, ultima_completa
+from Ferramentas.Gravador import COLUNAS
+from Sites.Unidas import Unidas
+from Sites.Porto import Porto
+
+
+def gravar(arquivo, locadora, quantidade):
+    linhas = [{'Nome': f'Carro {i}', 'Data': '17/10/2026 10:00', 'Locadora': locadora, 'Km': 1000, 'Meses': 12,
+               'Valor': 100. + i, 'Descricao': None} for i in range(quantidade)]
+    pd.DataFrame(linhas, columns=COLUNAS).to_csv(arquivo, index=False)
+
+
+@pytest.fixture
+def agendador(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return Agendador({'unidas': 1, 'porto': 1}, porta=None, historico=None)
+
+
+def test_publicar_usa_a_ultima_coleta_terminada(agendador):
+    gravar(Porto.arquivo, 'Porto Seguro', 3)
+    agendador.publicar(Porto)
+
+    # Nova coleta da Porto em andamento, com o .csv recriado apenas com o cabeçalho.
+    gravar(Porto.arquivo, 'Porto Seguro', 0)
+    gravar(Unidas.arquivo, 'Unidas', 2)
+    agendador.publicar(Unidas)
+
+    dados = pd.read_csv('dados.csv')
+    assert dados['Locadora'].value_counts().to_dict() == {'Porto Seguro': 3, 'Unidas': 2}
+    assert len(pd.read_csv(ultima_completa(Porto.arquivo))) == 3
+
+
+def test_publicar_ignora_sites_sem_coleta_terminada(agendador):
+    gravar(Porto.arquivo, 'Porto Seguro', 1)  # Primeira coleta da Porto ainda em andamento.
+    gravar(Unidas.arquivo, 'Unidas', 2)
+    agendador.publicar(Unidas)
+
+    assert pd.read_csv('dados.csv')['Locadora'].tolist() == ['Unidas', 'Unidas']
@@ -0,0 +1,21 @@
+"""Testes da medição de um site pelo benchmark em um processo separado."""
+import os
+from Ferramentas.Benchmark import medir
+
+
+class Encerra:
+    """Site falso cujo processo encerra no meio da coleta, como ao ser encerrado por falta de memória."""
+    arquivo = 'dados_encerra.csv'
+    url = 'https://site.com/carros'
+
+    def __init__(self, **argumentos):
+        pass
+
+    def run(self):
+        os._exit(9)
+
+
+def test_processo_encerrado_sem_resultado():
+    resultado = medir(Encerra, 'http://127.0.0.1:1')
+    assert resultado['Site'] == 'Encerra' and resultado['Linhas'] == 0
+    assert resultado['Erro'] == 'o processo encerrou sem resultado, com o código 9'
@@ -0,0 +1,124 @@
+"""Testes do cache em disco das páginas: validade, revalidação, descarte das entradas antigas e chave dos carros."""
+import os
+import pytest
+from Ferramentas import Http
+from Ferramentas.Cache import Cache
+from Sites.Porto import Porto
+
+
+PAGINAS = os.path.join(os.path.dirname(__file__), 'paginas')
+
+
+class Relogio:
+    """Relógio falso, avançado pelos testes no lugar de esperar."""
+
+    def __init__(self):
+        self.agora = 1000.
+
+    def __call__(self):
+        return self.agora
+
+
+class Resposta:
+    def __init__(self, status_code, text='', headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+class Sessao:
+    """Sessão falsa que guarda os cabeçalhos enviados e devolve sempre a mesma resposta."""
+
+    def __init__(self, resposta):
+        self.resposta = resposta
+        self.cabecalhos = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.cabecalhos.append(headers or {})
+        return self.resposta
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr('Ferramentas.Cache.time', relogio)
+    return relogio
+
+
+def test_entrada_vence_apos_o_ttl(tmp_path, relogio):
+    cache = Cache(str(tmp_path), ttl=60)
+    cache.gravar('https://site.com/carros/a/', 'página')
+
+    assert cache.ler('HTTPS://site.com/carros/a#topo') == 'página'  # Endereço normalizado.
+    relogio.agora += 61
+    assert cache.ler('https://site.com/carros/a') is None
+    assert cache.ler('https://site.com/carros/a', ttl=120) == 'página'
+    assert cache.ler('https://site.com/carros/a', vencido=True) == 'página'
+
+
+def test_revalidacao_com_304(tmp_path, relogio):
+    cache = Cache(str(tmp_path), ttl=60)
+    modificado = 'Sat, 17 Oct 2026 10:00:00 GMT'
+    cache.gravar('https://site.com/carros/a', 'página', etag='"v1"', modificado=modificado)
+    relogio.agora += 61
+
+    sessao = Sessao(Resposta(304))
+    assert Http.buscar('https://site.com/carros/a', sessao, cache) == 'página'
+    assert sessao.cabecalhos == [{'If-None-Match': '"v1"', 'If-Modified-Since': modificado}]
+    assert cache.ler('https://site.com/carros/a') == 'página'  # A validade foi renovada pela resposta 304.
+
+
+def test_pagina_alterada_substitui_a_entrada(tmp_path, relogio):
+    cache = Cache(str(tmp_path), ttl=60)
+    cache.gravar('https://site.com/carros/a', 'antiga', modificado='Sat, 17 Oct 2026 10:00:00 GMT')
+    relogio.agora += 61
+
+    sessao = Sessao(Resposta(200, 'nova', {'Last-Modified': 'Sat, 17 Oct 2026 11:00:00 GMT'}))
+    assert Http.buscar('https://site.com/carros/a', sessao, cache) == 'nova'
+    assert cache.ler('https://site.com/carros/a') == 'nova'
+    assert cache.cabecalhos('https://site.com/carros/a') == {'If-Modified-Since': 'Sat, 17 Oct 2026 11:00:00 GMT'}
+
+
+def test_descarta_as_entradas_acessadas_ha_mais_tempo(tmp_path, relogio):
+    conteudo = {nome: os.urandom(2000).hex() for nome in 'abc'}  # Textos que quase não comprimem.
+    cache = Cache(str(tmp_path), ttl=3600)
+    cache.gravar('https://site.com/a', conteudo['a'])
+    cache.tamanho_maximo = int(os.path.getsize(os.path.join(str(tmp_path), cache.chave('https://site.com/a') + '.gz'))*2.5)
+
+    relogio.agora += 1
+    cache.gravar('https://site.com/b', conteudo['b'])
+    relogio.agora += 1
+    assert cache.ler('https://site.com/a') == conteudo['a']  # A passa a ser a entrada acessada mais recentemente.
+    relogio.agora += 1
+    cache.gravar('https://site.com/c', conteudo['c'])
+
+    assert cache.ler('https://site.com/b') is None
+    assert cache.ler('https://site.com/a') == conteudo['a'] and cache.ler('https://site.com/c') == conteudo['c']
+    assert not os.path.exists(os.path.join(str(tmp_path), cache.chave('https://site.com/b') + '.gz'))
+
+
+class Navegador:
+    """Navegador falso com a página de um carro aberta em um endereço diferente do link da listagem."""
+
+    def __init__(self, pagina, url):
+        self.page_source = pagina
+        self.current_url = url
+
+
+def test_pagina_do_carro_guardada_pelo_link(tmp_path):
+    with open(os.path.join(PAGINAS, 'porto', 'veiculos', 'jeep-compass-longitude', 'index.html'), encoding='utf-8') as f:
+        pagina = f.read()
+    link = 'https://www.portosegurocarrofacil.com.br/veiculos/jeep-compass-longitude'
+    site = Porto(navegador=Navegador(pagina, link + '/?utm_source=listagem'), cache=str(tmp_path))
+    site.carro_atual = link
+
+    nome = 'Jeep Compass Longitude 1.3 T270 Flex Aut.'
+    linhas = site.ler_matriz(site.dados_carro(Nome=nome))
+    assert linhas
+
+    combinacoes = lambda linhas: [(linha['Nome'], linha['Km'], linha['Meses'], linha['Valor']) for linha in linhas]
+    assert combinacoes(site.ler_cache(link)) == combinacoes(linhas)
+    assert site.metricas.contadores['cache'] == 1
@@ -0,0 +1,78 @@
+"""Testes da comparação dos preços do mesmo carro entre as locadoras."""
+import pandas as pd
+from Ferramentas.Comparar import Comparador, palavras, separar
+
+
+def agrupar(nomes, limiar=.5):
+    """Grupo de cada nome, com a locadora informada junto com ele."""
+    tabela = pd.DataFrame(nomes, columns=['Nome', 'Locadora'])
+    return dict(zip(tabela['Nome'], Comparador(limiar).agrupar(tabela)))
+
+
+def test_palavras_normalizadas():
+    assert palavras('Jeep Compass Longitude 1.3 T270 Flex Aut.') == ['jeep', 'compass', 'longitude', '1.3', 't', '270', 'aut']
+    assert palavras('COMPASS LONGITUDE 1,3 TURBO AUTOMÁTICO') == ['compass', 'longitude', '1.3', 't', 'aut']
+    assert palavras('Novo Renault Kwid Zen 1.0 ou similar') == ['renault', 'kwid', 'zen', '1.0']
+
+
+def test_separar_marca_modelo_e_versao():
+    assert separar('VW Polo Highline 1.0 TSI') == ('volkswagen', 'polo', frozenset({'highline', '1.0', 'tsi'}))
+    assert separar('2.0 Corolla XEi') == (None, 'corolla', frozenset({'2.0', 'xei'}))
+    assert separar('1.0') == (None, None, frozenset({'1.0'}))
+
+
+def test_mesmo_carro_em_locadoras_diferentes():
+    grupos = agrupar([('Jeep Compass Longitude 1.3 T270 Flex Aut.', 'Porto Seguro'),
+                      ('COMPASS LONGITUDE T270 1.3 TURBO AUTOMÁTICO', 'Unidas'),
+                      ('Jeep Renegade Longitude 1.3 T270', 'Movida')])
+    assert grupos['Jeep Compass Longitude 1.3 T270 Flex Aut.'] == grupos['COMPASS LONGITUDE T270 1.3 TURBO AUTOMÁTICO']
+    assert grupos['Jeep Renegade Longitude 1.3 T270'] == 'Jeep Renegade Longitude 1.3 T270'
+
+
+def test_mesma_marca_com_outro_modelo_ou_acabamento():
+    grupos = agrupar([('Jeep Compass Longitude 1.3 T270', 'Porto Seguro'),
+                      ('Jeep Compass Limited 1.3 T270', 'Unidas'),
+                      ('Jeep Commander Longitude 1.3 T270', 'Movida')])
+    assert len(set(grupos.values())) == 3
+
+
+def test_mesma_locadora_nao_e_agrupada():
+    grupos = agrupar([('Jeep Compass Longitude 1.3 T270', 'Unidas'), ('Jeep Compass Longitude 1.3 T270 Aut', 'Unidas')])
+    assert len(set(grupos.values())) == 2
+
+
+def test_marcas_diferentes_nao_sao_agrupadas():
+    grupos = agrupar([('Chevrolet Onix LT 1.0', 'Unidas'), ('Hyundai Onix LT 1.0', 'Movida')])
+    assert len(set(grupos.values())) == 2
+
+
+def test_limiar_de_semelhanca():
+    nomes = [('Fiat Pulse Drive 1.3', 'Movida'), ('Fiat Pulse Drive 1.0 Turbo Aut', 'Unidas'), ('Fiat Mobi Like', 'Flua')]
+    assert len(set(agrupar(nomes, limiar=.2).values())) == 2
+    assert len(set(agrupar(nomes, limiar=.5).values())) == 3
+
+
+def test_tabela_de_comparacao():
+    compass, compass_unidas = 'Jeep Compass Longitude 1.3 T270 Flex Aut.', 'COMPASS LONGITUDE T270 1.3 TURBO AUTOMÁTICO'
+    dados = pd.DataFrame({
+        'Nome': [compass, compass, compass_unidas, compass_unidas, 'Jeep Compass Limited 1.3 T270'],
+        'Locadora': ['Porto Seguro', 'Porto Seguro', 'Unidas', 'Unidas', 'Unidas'],
+        'Km': [1000.4, 2000, 1000, 2000, 1000],  # Km da Porto dividido pelos meses, arredondado na comparação.
+        'Meses': [12, 12, 12, 12, 12],
+        'Valor': [3500, 3900, 3400, 4100, 4200],
+    })
+
+    tabela = Comparador().comparar(dados)
+
+    assert tabela.to_dict('records') == [
+        {'Modelo': compass, 'Km': 1000, 'Meses': 12, 'Porto Seguro': 3500, 'Unidas': 3400, 'Menor valor': 3400,
+         'Mais barata': 'Unidas', 'Diferenca (%)': 2.9},
+        {'Modelo': compass, 'Km': 2000, 'Meses': 12, 'Porto Seguro': 3900, 'Unidas': 4100, 'Menor valor': 3900,
+         'Mais barata': 'Porto Seguro', 'Diferenca (%)': 5.1},
+    ]
+
+
+def test_tabela_sem_carros_em_comum():
+    dados = pd.DataFrame({'Nome': ['Fiat Mobi Like', 'Jeep Compass Longitude'], 'Locadora': ['Flua', 'Unidas'],
+                          'Km': [1000, 1000], 'Meses': [12, 12], 'Valor': [1500, 3500]})
+    assert Comparador().comparar(dados).empty
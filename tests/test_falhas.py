@@ -0,0 +1,112 @@
+"""Testes da classificação das falhas, da política de novas tentativas e do disjuntor."""
+from multiprocessing import Value
+import pytest
+import requests
+from selenium.common.exceptions import (StaleElementReferenceException, TimeoutException, NoSuchElementException,
+                                        ElementClickInterceptedException, WebDriverException)
+from Ferramentas.Falhas import Politica, Disjuntor, classificar
+
+
+class Relogio:
+    """Relógio falso, avançado pelos testes no lugar de esperar."""
+
+    def __init__(self):
+        self.agora = 1000.
+
+    def __call__(self):
+        return self.agora
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr('Ferramentas.Falhas.time', relogio)
+    return relogio
+
+
+def erro_http(status):
+    resposta = requests.Response()
+    resposta.status_code = status
+    return requests.HTTPError(f'{status} Client Error', response=resposta)
+
+
+@pytest.mark.parametrize('erro, tipo', [
+    (StaleElementReferenceException(), 'obsoleto'),
+    (TimeoutException(), 'tempo'),
+    (NoSuchElementException(), 'seletor'),
+    (IndexError('list index out of range'), 'seletor'),
+    (ElementClickInterceptedException(), 'interacao'),
+    (erro_http(429), 'bloqueio'),
+    (erro_http(500), 'outro'),
+    (WebDriverException('net::ERR_HTTP_RESPONSE_CODE_FAILURE 403 Forbidden'), 'bloqueio'),
+    (WebDriverException('chrome not reachable'), 'navegador'),
+    (requests.ConnectionError(), 'navegador'),
+    (ValueError('texto inesperado'), 'outro'),
+])
+def test_classificar(erro, tipo):
+    assert classificar(erro) == tipo
+
+
+def test_politica_repete_apenas_os_tipos_repetiveis():
+    politica = Politica(tentativas=3)
+    assert politica.repetir('tempo', 0) and politica.repetir('tempo', 1)
+    assert not politica.repetir('tempo', 2)  # Terceira tentativa, a última.
+    assert not politica.repetir('seletor', 0) and not politica.repetir('bloqueio', 0)
+
+
+def test_politica_espera_crescente_ate_o_maximo(monkeypatch):
+    monkeypatch.setattr('Ferramentas.Falhas.random.uniform', lambda inicio, fim: fim)  # Sempre a maior espera.
+    politica = Politica(inicial=1., maximo=10., fator=3.)
+    assert [politica.espera(tentativa) for tentativa in range(4)] == [1., 3., 9., 10.]
+
+    monkeypatch.setattr('Ferramentas.Falhas.random.uniform', lambda inicio, fim: inicio)
+    assert politica.espera(3) == 0.
+
+
+def test_disjuntor_abre_com_a_maioria_das_ultimas_falhas(relogio):
+    disjuntor = Disjuntor(limite=.6, janela=5, minimo=5, pausa=60)
+    for sucesso in (True, False, False, False):
+        disjuntor.registrar(sucesso)
+    assert disjuntor.liberado()  # Menos tentativas que o mínimo.
+
+    disjuntor.registrar(True)  # 3 falhas nas últimas 5, exatamente o limite.
+    assert not disjuntor.liberado()
+
+
+def test_disjuntor_considera_apenas_a_janela(relogio):
+    disjuntor = Disjuntor(limite=.6, janela=5, minimo=5, pausa=60)
+    for sucesso in (False, False, False, True, True, True, True, False, False):
+        disjuntor.registrar(sucesso)
+    assert disjuntor.liberado()  # Apenas 2 das últimas 5 falharam.
+
+
+def test_disjuntor_libera_uma_tentativa_apos_a_pausa(relogio):
+    disjuntor = Disjuntor(limite=.5, janela=4, minimo=2, pausa=60)
+    disjuntor.registrar(False)
+    disjuntor.registrar(False)
+    assert not disjuntor.liberado()
+
+    relogio.agora += 59
+    assert not disjuntor.liberado()
+    relogio.agora += 1
+    assert disjuntor.liberado()
+
+    disjuntor.registrar(False)  # A tentativa liberada falhou e a pausa recomeça.
+    assert not disjuntor.liberado()
+    relogio.agora += 60
+    disjuntor.registrar(True)  # A tentativa liberada funcionou e o disjuntor fecha com a janela vazia.
+    assert disjuntor.liberado()
+    disjuntor.registrar(False)
+    assert disjuntor.liberado()
+
+
+def test_disjuntor_compartilhado_pausa_todos_os_navegadores(relogio):
+    aberto_em = Value('d', 0.)
+    primeiro, segundo = (Disjuntor(minimo=2, pausa=60, compartilhado=aberto_em) for _ in range(2))
+    primeiro.registrar(False)
+    primeiro.registrar(False)
+
+    assert not segundo.liberado()
+    relogio.agora += 60
+    segundo.registrar(True)
+    assert primeiro.liberado() and aberto_em.value == 0.
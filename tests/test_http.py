@@ -0,0 +1,68 @@
+"""Testes da coleta por HTTP contra as páginas gravadas em tests/paginas, servidas pelo Servidor local."""
+import os
+import json
+from Ferramentas import Http
+from Ferramentas.Servidor import Servidor
+
+
+PAGINAS = os.path.join(os.path.dirname(__file__), 'paginas')
+
+
+def test_coletar_porto_next():
+    with Servidor(os.path.join(PAGINAS, 'porto')) as servidor:
+        linhas = Http.coletar(servidor.url + '/veiculos', '/veiculos/', 'Porto Seguro')
+
+    combinacoes = {(linha['Nome'], linha['Meses'], linha['Km'], linha['Valor']) for linha in linhas}
+    assert combinacoes == {
+        ('Jeep Compass Longitude 1.3 T270 Flex Aut.', 12, '12.000 Km', 'R$ 3.549,00'),
+        ('Jeep Compass Longitude 1.3 T270 Flex Aut.', 24, '24.000 Km', 'R$ 3.149,00'),
+        ('Fiat Pulse Drive 1.3 Flex', 12, '12.000 Km', 'R$ 2.599,00'),
+        ('Fiat Pulse Drive 1.3 Flex', 36, '36.000 Km', 'R$ 2.299,00'),
+    }
+    assert all(linha['Locadora'] == 'Porto Seguro' for linha in linhas)
+    descricoes = [linha['Descricao'] for linha in linhas if isinstance(linha['Descricao'], str)]
+    assert descricoes == ['Pagamento mensal no cartão']
+
+
+def test_coletar_unidas_angular():
+    with Servidor(os.path.join(PAGINAS, 'unidas')) as servidor:
+        linhas = Http.coletar(servidor.url + '/carros', '/carros/', 'Unidas')
+
+    assert [(linha['Nome'], linha['Meses'], linha['Valor']) for linha in sorted(linhas, key=lambda l: l['Meses'])] == [
+        ('Jeep Renegade Sport 1.3 T270 Turbo Flex Aut.', '12 meses', 'R$ 2.989,00'),
+        ('Jeep Renegade Sport 1.3 T270 Turbo Flex Aut.', '24 meses', 'R$ 2.689,00'),
+    ]
+
+
+def test_nome_do_objeto_das_ofertas():
+    estado = {'titulo': 'Locadora', 'carros': [
+        {'nome': 'Jeep Compass', 'planos': [{'meses': 12, 'km': 1000, 'valor': 3000}]},
+        {'nome': 'Fiat Mobi', 'planos': [{'nome': 'Plano básico', 'meses': 12, 'km': 1500, 'valor': 1500}]},
+    ]}
+    linhas = Http.ler_carro(json.dumps(estado), 'Teste')
+    assert {(linha['Nome'], linha['Valor']) for linha in linhas} == {('Jeep Compass', 3000), ('Fiat Mobi', 1500)}
+
+
+def test_oferta_com_nome_proprio():
+    linhas = Http.ler_carro(json.dumps([{'name': 'Fiat Mobi', 'months': 12, 'km': 1500, 'price': 1500}]), 'Teste')
+    assert linhas[0]['Nome'] == 'Fiat Mobi'
+
+
+def test_pagina_sem_estado():
+    assert Http.ler_carro('<html><body>Sem ofertas</body></html>', 'Teste') == []
+
+
+def test_filtrar_carro_descarta_outros_carros():
+    estado = {'resultados': [
+        {'nome': 'Fiat Mobi Like 1.0', 'planos': [{'meses': 12, 'km': 1000, 'valor': 1500}]},
+        {'nome': 'Jeep Compass Longitude 1.3 T270', 'planos': [{'meses': 12, 'km': 1000, 'valor': 3500}]},
+        {'nome': 'Jeep Compass Limited 1.3 T270', 'planos': [{'meses': 12, 'km': 1000, 'valor': 3900}]},
+    ]}
+    linhas = Http.filtrar_carro(Http.ler_carro(json.dumps(estado), 'Teste'), 'Compass Longitude T270')
+    assert [linha['Valor'] for linha in linhas] == [3500]
+
+
+def test_filtrar_carro_sem_o_carro_aberto():
+    estado = {'nome': 'Fiat Mobi Like 1.0', 'planos': [{'meses': 12, 'km': 1000, 'valor': 1500}]}
+    assert Http.filtrar_carro(Http.ler_carro(json.dumps(estado), 'Teste'), 'Jeep Compass') == []
+    assert Http.filtrar_carro(Http.ler_carro(json.dumps([{'meses': 12, 'km': 1, 'valor': 2}]), 'Teste'), 'Jeep Compass') == []
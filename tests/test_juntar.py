@@ -0,0 +1,99 @@
+"""Testes da gravação em lotes pelo Gravador e da junção deles pelo Juntador."""
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from Ferramentas.Gravador import Gravador, pasta_arrow
+from Ferramentas.Juntar import Juntador
+from Ferramentas.Historico import Historico
+
+
+def linha(i, locadora='Unidas'):
+    return {'Nome': f'Carro {i}', 'Data': '17/10/2026 10:00', 'Locadora': locadora, 'Km': '1.000 Km',
+            'Meses': '12 meses', 'Valor': f'R$ {100 + i},50/mês', 'Descricao': np.nan}
+
+
+@pytest.fixture
+def pasta(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_gravador_juntador(pasta):
+    with Gravador('dados_a.csv', lote=10) as gravador:
+        for i in range(25):
+            gravador.adicionar(linha(i))
+        gravador.adicionar(dict(linha(25), Data='sem data'))  # Descartada pelo Juntador.
+    with Gravador('dados_b.csv', lote=10) as gravador:
+        gravador.adicionar(linha(0, 'Movida'))
+
+    total, ignorados = Juntador(['dados_a.csv', 'dados_b.csv', 'dados_c.csv'], 'dados.csv', Historico('historico')).fechar()
+
+    assert total == 26
+    assert ignorados == {'dados_c.csv': 'pasta dos lotes em Arrow não encontrada'}
+    dados = pd.read_csv('dados.csv')
+    assert len(dados) == 26 and dados['Data'].eq('17/10/2026 10:00').all()
+    assert dados.loc[0, ['Km', 'Meses', 'Valor']].tolist() == [1000, 12, 100.5]
+    assert len(Historico('historico').consultar()) == 26
+    assert not (pasta / 'dados.csv.tmp').exists()
+
+
+def test_juntador_durante_a_coleta(pasta):
+    juntador = Juntador(['dados_a.csv'], 'dados.csv')
+    with Gravador('dados_a.csv', lote=5) as gravador:
+        for i in range(12):
+            gravador.adicionar(linha(i))
+        assert juntador.receber() == 10  # Apenas os lotes completos já foram gravados.
+    assert juntador.fechar() == (12, {})
+
+
+def test_refazer_mantem_os_dados_anteriores(pasta):
+    with Gravador('dados_a.csv', lote=10) as gravador:
+        for i in range(15):
+            gravador.adicionar(linha(i))
+    Juntador(['dados_a.csv'], 'dados.csv', Historico('historico')).fechar()
+
+    # Nova coleta continuando os dados do site, como no refazer.
+    with Gravador('dados_a.csv', lote=10, continuar=True) as gravador:
+        gravador.adicionar(linha(15))
+    total, _ = Juntador(['dados_a.csv'], 'dados.csv', Historico('historico')).fechar()
+
+    assert total == 16 and len(pd.read_csv('dados.csv')) == 16
+    assert len(Historico('historico').consultar()) == 16  # Os lotes anteriores não são repetidos.
+    assert sorted(p.name for p in (pasta / pasta_arrow('dados_a.csv')).glob('parte-*')) == \
+        ['parte-00000.arrow', 'parte-00001.arrow', 'parte-00002.arrow']
+
+
+def test_juntador_ignora_lotes_invalidos(pasta):
+    with Gravador('dados_a.csv', lote=10) as gravador:
+        for i in range(10):
+            gravador.adicionar(linha(i))
+    lotes = pasta / pasta_arrow('dados_a.csv')
+    (lotes / 'parte-00001.arrow').write_bytes(b'lote gravado pela metade')
+    antigo = pa.table({'Nome': ['Carro'], 'Data': ['17/10/2026 10:00'], 'Locadora': ['Unidas']})
+    with pa.OSFile(str(lotes / 'parte-00002.arrow'), 'wb') as saida, pa.ipc.new_file(saida, antigo.schema) as escritor:
+        escritor.write_table(antigo)
+
+    total, ignorados = Juntador(['dados_a.csv'], 'dados.csv', Historico('historico')).fechar()
+
+    assert total == 10 and len(pd.read_csv('dados.csv')) == 10
+    corrompido, esquema_antigo = (os.path.join(pasta_arrow('dados_a.csv'), f'parte-0000{i}.arrow') for i in (1, 2))
+    assert sorted(ignorados) == [corrompido, esquema_antigo]
+    assert ignorados[corrompido].startswith('não foi possível ler o lote')
+    assert ignorados[esquema_antigo].startswith('colunas diferentes das esperadas')
+    assert not (pasta / 'dados.csv.tmp').exists()
+
+
+def test_gravador_um_parquet_por_coleta(pasta):
+    with Gravador('dados_a.csv', lote=10, grupo_parquet=25) as gravador:
+        for i in range(57):
+            gravador.adicionar(linha(i))
+        assert not list((pasta / 'dados_a.parquet').glob('parte-*'))  # Só recebe o nome final ao fechar.
+    with Gravador('dados_a.csv', lote=10, continuar=True) as gravador:
+        gravador.adicionar(linha(57))
+
+    assert sorted(p.name for p in (pasta / 'dados_a.parquet').iterdir()) == ['parte-00000.parquet', 'parte-00001.parquet']
+    assert pq.ParquetFile(str(pasta / 'dados_a.parquet' / 'parte-00000.parquet')).num_row_groups == 2
+    assert len(pd.read_parquet('dados_a.parquet')) == 58
@@ -0,0 +1,50 @@
+"""Testes da conversão em lote dos valores brutos coletados."""
+import numpy as np
+import pandas as pd
+from Ferramentas.Normalizar import converter, normalizar, PRECO
+
+
+def brutos(**colunas):
+    dados = {'Nome': 'Jeep Compass', 'Data': '17/10/2026 10:00', 'Locadora': 'Unidas', 'Km': '1.000 Km',
+             'Meses': '12 meses', 'Valor': 'R$ 2.345,67/mês', 'Descricao': np.nan}
+    dados.update(colunas)
+    linhas = max((len(valor) for valor in dados.values() if isinstance(valor, list)), default=1)
+    return pd.DataFrame(dados, index=range(linhas))
+
+
+def test_converter_precos():
+    serie = pd.Series(['R$ 2.345,67/mês', 'R$ 2.345,67 /mês 12x', 'De R$ 3.100 por R$ 2.990,00/mês', '12x de 300,50',
+                       '1000.0', 1500.5])
+    valores, invalidos = converter(serie, PRECO)
+    assert valores.tolist() == [2345.67, 2345.67, 2990.0, 300.5, 1000.0, 1500.5]
+    assert not invalidos.any()
+
+
+def test_converter_milhares_e_decimais():
+    valores, _ = converter(pd.Series(['1.500 Km', '12 meses', '2,5', '1.000.000', '1000.5']))
+    assert valores.tolist() == [1500.0, 12.0, 2.5, 1000000.0, 1000.5]
+
+
+def test_converter_vazios_e_invalidos():
+    valores, invalidos = converter(pd.Series([None, '', '  ', 'consulte']))
+    assert valores.isna().all()
+    assert invalidos.tolist() == [False, False, False, True]
+
+
+def test_normalizar_km_ilimitado():
+    dados, invalidos = normalizar(brutos(Km=['Ilimitado', 'KM ILIMITADO', 'sob consulta']))
+    assert dados['Km'].iloc[:2].tolist() == [np.inf, np.inf]
+    assert invalidos['Invalidos'].tolist() == ['Km']
+
+
+def test_normalizar_marca_colunas_invalidas():
+    dados, invalidos = normalizar(brutos(Valor=['consulte', 'R$ 1.000,00'], Meses=['x', '24']))
+    assert len(dados) == 2 and np.isnan(dados['Valor'].iloc[0])
+    assert invalidos['Invalidos'].tolist() == ['Meses Valor']
+    assert invalidos['Valor'].tolist() == ['consulte']  # Os textos originais são mantidos.
+
+
+def test_normalizar_km_por_contrato():
+    dados, _ = normalizar(brutos(Km='24.000 Km', Meses='24 meses'), km_por_contrato=True)
+    assert dados['Km'].iloc[0] == 1000
+    assert dados['Meses'].iloc[0] == 24 and str(dados['Meses'].dtype) == 'Int64'
@@ -0,0 +1,24 @@
+"""Testes dos limites de reciclagem do Vigia, sem abrir o Chrome."""
+import pytest
+from Ferramentas.Vigia import Vigia
+
+
+@pytest.fixture
+def vigia(monkeypatch):
+    monkeypatch.setattr('Ferramentas.Vigia.criar_navegador', lambda headless: None)
+    monkeypatch.setattr(Vigia, 'uso', lambda self: {'memoria': 3000.})
+    vigia = Vigia(paginas_maximas=2, memoria_maxima=2048)
+    vigia.paginas = 2
+    return vigia
+
+
+def test_limites_do_vigia(vigia):
+    assert vigia.motivo() == 'paginas'
+    assert vigia.motivo(paginas_maximas=10) == 'memoria'
+    assert vigia.motivo(paginas_maximas=10, memoria_maxima=4096) is None
+
+
+@pytest.mark.parametrize('desligado', [None, 0])
+def test_limite_desligado_pelo_site(vigia, desligado):
+    assert vigia.motivo(paginas_maximas=desligado) == 'memoria'
+    assert vigia.motivo(paginas_maximas=desligado, memoria_maxima=desligado) is None